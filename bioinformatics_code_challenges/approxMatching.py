@@ -1,25 +1,7 @@
 #!/usr/bin/env python3
 
-
-def hamming_distance_strings(str1: str, str2: str) -> int:
-    """
-    Calculate hamming distance between two strings of equal length
-
-    Args:
-        str1 (str): First string
-        str2 (str): Second string
-
-    Returns:
-        int: Hamming distance between the strings
-    """
-    if len(str1) != len(str2):
-        return -1
-
-    ham_dist = 0
-    for i in range(len(str1)):
-        if str1[i] != str2[i]:
-            ham_dist += 1
-    return ham_dist
+from bioc import instrument
+from hammingDistance import hamming_distance_strings
 
 
 def ApproxPatternMatching(pattern: str, genome: str, d: int) -> list:
@@ -37,11 +19,15 @@ def ApproxPatternMatching(pattern: str, genome: str, d: int) -> list:
     positions = []
 
     # Scan through genome
-    for i in range(len(genome) - len(pattern) + 1):
-        sliding_window = genome[i : i + len(pattern)]
-        # Check if hamming distance between pattern and window is <= d
-        if hamming_distance_strings(pattern, sliding_window) <= d:
-            positions.append(i)
+    with instrument.stage("approx_scan"):
+        for i in range(len(genome) - len(pattern) + 1):
+            sliding_window = genome[i : i + len(pattern)]
+            # Check if hamming distance between pattern and window is <= d
+            if hamming_distance_strings(pattern, sliding_window) <= d:
+                positions.append(i)
+    instrument.count("bases", len(genome))
+    instrument.count("windows", max(len(genome) - len(pattern) + 1, 0))
+    instrument.count("matches", len(positions))
 
     # return " ".join(str(pos) for pos in positions)
     return positions
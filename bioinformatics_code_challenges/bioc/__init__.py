@@ -0,0 +1,8 @@
+"""
+Command-line entry point for the bioinformatics code challenges.
+
+The algorithms stay in their own modules (computeSkew, clumpCount,
+approxMatching, ...); bioc.cli wires them into a single `bioc` command.
+"""
+
+__version__ = "0.1.0"
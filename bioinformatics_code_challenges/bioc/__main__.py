@@ -0,0 +1,3 @@
+from bioc.cli import main
+
+main()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+
+"""
+bioc: one command line for the code challenge algorithms.
+
+    bioc skew datasets/min_skew_dataset_30277_10.txt
+    bioc clumps -k 9 -L 500 -t 3 datasets/Vibrio_cholerae.txt
+    bioc approx -p ATTCTGGA -d 3 --threads 8 genome.fa
+    bioc approx -p ATTCTGGA -d 2 --edit reads.fa
+    cat reads.fa | bioc gc --json
+
+Inputs are plain sequence files (whitespace-separated sequences), FASTA
+files or stdin ("-", the default), and every command runs once per
+sequence record. With --mmap, files are memory-mapped (bioc.genome) rather
+than read, one record per FASTA record or per plain file. Algorithm modules are only imported by the subcommand
+that needs them, so `bioc --help` and small runs start quickly.
+"""
+
+import argparse
+import json
+import sys
+
+from bioc import instrument
+
+
+def read_records(source: str, mmap: bool = False) -> list:
+    """
+    Read sequence records from a file or stdin
+
+    Args:
+        source (str): file path, or "-" for stdin
+        mmap (bool): map the file and return Genome records instead of
+            strings (stdin is always read)
+
+    Returns:
+        list: (name, sequence) tuples; sequences are upper-cased. Plain text
+            gives one record per whitespace-separated sequence, named seq1,
+            seq2, ...
+    """
+    if mmap and source != "-":
+        from bioc.genome import Genome
+
+        with instrument.stage("index"), Genome(source) as genome:
+            index = genome.index
+        return [(entry.name, Genome(source, entry.name, index=index)) for entry in index]
+
+    with instrument.stage("read"):
+        if source == "-":
+            text = sys.stdin.read()
+        else:
+            with open(source, "r") as file:
+                text = file.read()
+
+        if text.lstrip().startswith(">"):
+            records = []
+            for block in text.lstrip()[1:].split("\n>"):
+                header, _, body = block.partition("\n")
+                name = header.split()[0] if header.strip() else f"seq{len(records) + 1}"
+                records.append((name, "".join(body.split()).upper()))
+        else:
+            records = [(f"seq{i + 1}", seq.upper()) for i, seq in enumerate(text.split())]
+
+    instrument.count("bytes_read", len(text))
+    return records
+
+
+# Per-record commands. Each takes one sequence and the parsed arguments and
+# imports its algorithm module on first use. With --mmap the sequence is a
+# Genome: commands whose loops slice it base by base copy it to a str first
+# (str() of a str is the same object), while skew, gc and sharded approx
+# stream through the mapping.
+
+
+def run_skew(seq: str, args) -> list:
+    from computeSkew import compute_skew
+
+    skew = compute_skew(seq)
+    extreme = min(skew) if args.extreme == "min" else max(skew)
+    return [i for i, value in enumerate(skew) if value == extreme]
+
+
+def run_clumps(seq: str, args) -> list:
+    from clumpCount import ClumpKmers
+
+    return sorted(ClumpKmers(str(seq), args.k, args.L, args.t))
+
+
+def run_freq(seq: str, args) -> list:
+    seq = str(seq)
+    if args.reverse_complement:
+        from frequentWordsReverComplementMismatch import (
+            frequent_words_with_mismatches_and_rc,
+        )
+
+        return frequent_words_with_mismatches_and_rc(seq, args.k, args.d)
+    if args.d:
+        from frequentWordMismatch import frequentWordsWithMismatches
+
+        return sorted(frequentWordsWithMismatches(seq, args.k, args.d))
+
+    from frequencyTable import FrequencyTable
+
+    return sorted(FrequencyTable(seq, args.k))
+
+
+def run_approx(seq: str, args):
+    pattern = args.pattern.upper()
+    if args.edit:
+        from editMatching import EditMatchEnds, EditPatternMatching
+
+        if args.count:
+            return len(EditMatchEnds(pattern, seq, args.d))
+        return EditPatternMatching(pattern, seq, args.d)
+    if args.shard:
+        from shardedMatching import (
+            ShardedApproxPatternCount,
+            ShardedApproxPatternMatching,
+        )
+
+        if args.count:
+            return ShardedApproxPatternCount(pattern, seq, args.d, workers=args.threads)
+        return ShardedApproxPatternMatching(pattern, seq, args.d, workers=args.threads)
+
+    from approxMatching import ApproxPatternMatching
+
+    positions = ApproxPatternMatching(pattern, str(seq), args.d)
+    return len(positions) if args.count else positions
+
+
+def run_orf(seq: str, args) -> list:
+    from orfFinder import find_orfs
+
+    return find_orfs(str(seq), args.min_length)
+
+
+def run_gc(seq: str, args) -> float:
+    from gcContent import gc_content
+
+    return round(gc_content(seq), 6)
+
+
+# Commands over all records at once
+
+
+def run_motif(seqs: list, args) -> list:
+    from motifEnumeration import MotifEnumeration
+
+    return sorted(MotifEnumeration(seqs, args.k, args.d))
+
+
+def format_result(result) -> str:
+    """Plain-text form of a command result (space-separated, as the challenges expect)"""
+    if isinstance(result, list):
+        if result and isinstance(result[0], dict):
+            return "\n".join(
+                f"{orf['frame']}\t{orf['start_position']}\t{orf['length']}\t{orf['sequence']}"
+                for orf in result
+            )
+        if result and isinstance(result[0], tuple):
+            return "\n".join("\t".join(str(value) for value in item) for item in result)
+        return " ".join(str(item) for item in result)
+    return str(result)
+
+
+def emit(name: str, result, args, several: bool) -> None:
+    """Write one record's result to stdout"""
+    if args.json:
+        print(json.dumps({"command": args.command, "name": name, "result": result}))
+    elif several:
+        print(f">{name}\n{format_result(result)}")
+    else:
+        print(format_result(result))
+
+
+def run(args) -> None:
+    """Read the inputs and run the selected command on them"""
+    records = [record for source in args.inputs for record in read_records(source, args.mmap)]
+    if not records:
+        raise ValueError("No sequences found in the input")
+
+    if args.command == "motif":
+        emit("motif", run_motif([seq for _, seq in records], args), args, False)
+        return
+
+    several = len(records) > 1
+    # a single approx search is split across processes instead of the records
+    args.shard = args.command == "approx" and not several and args.threads > 1 and not args.edit
+    seqs = [seq for _, seq in records]
+    if several and args.threads > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        from functools import partial
+
+        with ProcessPoolExecutor(max_workers=args.threads) as executor:
+            results = executor.map(partial(args.run, args=args), seqs)
+            for (name, _), result in zip(records, results):
+                emit(name, result, args, several)
+        return
+
+    for name, seq in records:
+        emit(name, args.run(seq, args), args, several)
+
+
+def instrumented(args) -> None:
+    """Run with stage timing, cProfile and/or trace output as requested"""
+    if args.stats or args.trace:
+        instrument.enable()
+    try:
+        if args.profile or args.profile_out:
+            with instrument.profiling(args.profile_out):
+                run(args)
+        else:
+            run(args)
+    finally:
+        if args.trace:
+            instrument.write_chrome_trace(args.trace)
+            print(f"Trace written to {args.trace}", file=sys.stderr)
+        if args.stats:
+            print(instrument.report(), file=sys.stderr)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "inputs",
+        nargs="*",
+        default=["-"],
+        help="Sequence or FASTA files (default: stdin)",
+    )
+    common.add_argument(
+        "--threads",
+        type=int,
+        default=1,
+        help="Worker processes: records are spread over them, a single approx search is sharded",
+    )
+    common.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the run and print the top functions by cumulative time to stderr",
+    )
+    common.add_argument(
+        "--profile-out",
+        metavar="PATH",
+        help="Profile the run and write pstats data to PATH instead of printing it",
+    )
+    common.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print time per stage and work counters (bases, k-mers, neighbors...) to stderr",
+    )
+    common.add_argument(
+        "--trace", metavar="PATH", help="Write stage timings as a Chrome trace JSON file"
+    )
+    common.add_argument("--json", action="store_true", help="One JSON object per record")
+    common.add_argument(
+        "--mmap",
+        action="store_true",
+        help="Memory-map input files instead of reading them (for genomes larger than memory)",
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="bioc", description="Bioinformatics code challenge algorithms"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    skew = subparsers.add_parser("skew", parents=[common], help="Positions of minimum/maximum GC skew")
+    skew.add_argument("--extreme", choices=["min", "max"], default="min")
+    skew.set_defaults(run=run_skew)
+
+    clumps = subparsers.add_parser("clumps", parents=[common], help="k-mers forming (L, t)-clumps")
+    clumps.add_argument("-k", type=int, required=True, help="k-mer length")
+    clumps.add_argument("-L", type=int, required=True, help="Window length")
+    clumps.add_argument("-t", type=int, required=True, help="Minimum occurrences in a window")
+    clumps.set_defaults(run=run_clumps)
+
+    freq = subparsers.add_parser("freq", parents=[common], help="Most frequent k-mers")
+    freq.add_argument("-k", type=int, required=True, help="k-mer length")
+    freq.add_argument("-d", type=int, default=0, help="Mismatches allowed")
+    freq.add_argument(
+        "--reverse-complement",
+        action="store_true",
+        help="Count reverse complements too (with -d mismatches)",
+    )
+    freq.set_defaults(run=run_freq)
+
+    approx = subparsers.add_parser("approx", parents=[common], help="Approximate pattern matching")
+    approx.add_argument("-p", "--pattern", required=True, help="Pattern to search for")
+    approx.add_argument("-d", type=int, default=0, help="Mismatches allowed")
+    approx.add_argument("--count", action="store_true", help="Only report the number of matches")
+    approx.add_argument(
+        "--edit",
+        action="store_true",
+        help="Allow insertions and deletions too (edit distance); prints start, end and distance",
+    )
+    approx.set_defaults(run=run_approx)
+
+    motif = subparsers.add_parser("motif", parents=[common], help="(k, d)-motifs shared by all sequences")
+    motif.add_argument("-k", type=int, required=True, help="Motif length")
+    motif.add_argument("-d", type=int, default=0, help="Mismatches allowed")
+
+    orf = subparsers.add_parser("orf", parents=[common], help="Open reading frames (forward frames)")
+    orf.add_argument("--min-length", type=int, default=0, help="Minimum ORF length in bases")
+    orf.set_defaults(run=run_orf)
+
+    gc = subparsers.add_parser("gc", parents=[common], help="GC content")
+    gc.set_defaults(run=run_gc)
+
+    return parser
+
+
+def main(argv: list = None) -> None:
+    args = build_parser().parse_args(argv)
+    try:
+        if args.profile or args.profile_out or args.stats or args.trace:
+            instrumented(args)
+        else:
+            run(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
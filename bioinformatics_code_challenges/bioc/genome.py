@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+
+"""
+Memory-mapped genome sequences.
+
+Genome opens a plain sequence file or a FASTA file without reading it into
+a Python string. A small line index, with the same columns as a samtools
+.fai file, maps base positions to byte offsets:
+
+    byte(i) = offset + (i // line_bases) * line_width + i % line_bases
+
+so genome[i:j] reads only the bytes of that range from the mapping.
+Lower-case bases are upper-cased as they are read, chunk by chunk, never
+for the whole file at once.
+
+A Genome can be passed to the challenge functions in place of a str: it
+supports len(), indexing, slicing, iteration, upper()/strip() (no-ops,
+slices are already folded) and count() of single bases.
+
+    genome = Genome("datasets/Vibrio_cholerae.txt")
+    ClumpKmers(genome, 9, 500, 3)
+    for start, bases in genome.chunks(1 << 22, overlap=8):
+        ...  # uint8 arrays, upper-cased
+
+Slicing a Genome costs more per call than slicing a str, so tight k-mer
+loops over small genomes may be faster on str(genome) (one copy).
+"""
+
+import mmap
+import os
+from collections import namedtuple
+
+import numpy as np
+
+# one line of a .fai index: bases in the record, byte offset of its first base,
+# bases per line and bytes per line (including the line break)
+FaiEntry = namedtuple("FaiEntry", ["name", "length", "offset", "line_bases", "line_width"])
+
+# byte -> upper-case byte; anything that is not a lower-case letter is kept
+_UPPER = np.arange(256, dtype=np.uint8)
+_UPPER[ord("a") : ord("z") + 1] -= 32
+_UPPER_BYTES = _UPPER.tobytes()
+_NEWLINE = ord("\n")
+_CARRIAGE_RETURN = ord("\r")
+_HEADER = ord(">")
+
+
+class _Record:
+    """Accumulates one record's line statistics while the file is scanned"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.length = 0
+        self.offset = None
+        self.line_bases = None
+        self.line_width = None
+        self.previous = None  # length of the last line seen, unchecked until a line follows it
+        self.blank = False  # a blank line was seen; only more blank lines may follow
+        self.ragged = False
+
+    def add_lines(self, starts: np.ndarray, lengths: np.ndarray, widths: np.ndarray) -> None:
+        keep = lengths > 0
+        if not keep.all():
+            filled = np.flatnonzero(keep)
+            if len(filled) and (self.blank or not keep[: filled[-1]].all()):
+                self.ragged = True
+            self.blank = True
+            starts, lengths, widths = starts[keep], lengths[keep], widths[keep]
+        elif self.blank:
+            self.ragged = True
+        if not len(lengths):
+            return
+
+        if self.line_bases is None:
+            self.offset = int(starts[0])
+            self.line_bases = int(lengths[0])
+            self.line_width = int(widths[0])
+        # every line except the record's last must be full
+        full = lengths[:-1] if self.previous is None else np.append(self.previous, lengths[:-1])
+        if (full != self.line_bases).any() or (widths[:-1] != self.line_width).any():
+            self.ragged = True
+        self.previous = int(lengths[-1])
+        self.length += int(lengths.sum())
+
+    def entry(self) -> FaiEntry:
+        if self.ragged:
+            raise ValueError(
+                f"{self.name}: sequence lines have different lengths, the file can't be indexed "
+                "(rewrap it, e.g. with seqkit seq -w 60)"
+            )
+        if self.line_bases is None:
+            return FaiEntry(self.name, 0, 0, 0, 0)
+        return FaiEntry(self.name, self.length, self.offset, self.line_bases, self.line_width)
+
+
+def build_index(data: np.ndarray, default_name: str = "seq", chunk_size: int = 1 << 26) -> list:
+    """
+    Build the .fai-style index of a plain or FASTA file, scanning it in chunks
+
+    Args:
+        data (np.ndarray): uint8 view of the whole file
+        default_name (str): record name used for a plain (headerless) file
+        chunk_size (int): bytes scanned per step
+
+    Returns:
+        list: FaiEntry per record, in file order
+    """
+    entries = []
+    record = None
+    line_start = 0
+    n = len(data)
+
+    def process(starts: np.ndarray, ends: np.ndarray) -> None:
+        nonlocal record
+        if not len(starts):
+            return
+        widths = ends - starts + 1  # including the '\n'
+        lengths = ends - starts
+        non_empty = lengths > 0
+        if non_empty.any():
+            last = np.where(non_empty, ends - 1, 0)
+            lengths = lengths - (non_empty & (data[last] == _CARRIAGE_RETURN))
+        is_header = non_empty & (data[np.minimum(starts, n - 1)] == _HEADER)
+
+        previous = 0
+        for header in np.flatnonzero(is_header).tolist() + [len(starts)]:
+            if header > previous:
+                if record is None:
+                    record = _Record(default_name)
+                record.add_lines(starts[previous:header], lengths[previous:header], widths[previous:header])
+            if header == len(starts):
+                break
+            if record is not None:
+                entries.append(record.entry())
+            text = bytes(data[starts[header] + 1 : ends[header]]).decode("ascii", "replace").split()
+            record = _Record(text[0] if text else f"seq{len(entries) + 1}")
+            previous = header + 1
+
+    for chunk_start in range(0, n, chunk_size):
+        block = data[chunk_start : chunk_start + chunk_size]
+        newlines = np.flatnonzero(block == _NEWLINE) + chunk_start
+        if not len(newlines):
+            continue
+        starts = np.empty(len(newlines), dtype=np.int64)
+        starts[0] = line_start
+        starts[1:] = newlines[:-1] + 1
+        process(starts, newlines)
+        line_start = int(newlines[-1]) + 1
+
+    if line_start < n:
+        # last line, without a trailing newline
+        process(np.array([line_start]), np.array([n]))
+    if record is not None:
+        entries.append(record.entry())
+    return entries
+
+
+def read_fai(path: str) -> list:
+    with open(path, "r") as file:
+        return [
+            FaiEntry(name, int(length), int(offset), int(line_bases), int(line_width))
+            for name, length, offset, line_bases, line_width in (line.split("\t")[:5] for line in file)
+        ]
+
+
+def write_fai(entries: list, path: str) -> None:
+    with open(path, "w") as file:
+        for entry in entries:
+            file.write("\t".join(str(value) for value in entry) + "\n")
+
+
+class Genome:
+    """
+    One sequence record of a memory-mapped plain or FASTA file.
+
+    Args:
+        path (str): sequence file (plain or FASTA; FASTA lines must be of
+            equal length within a record, as for samtools faidx)
+        record (str): record name (default: the first record)
+        use_fai (bool): reuse path + ".fai" when it is newer than the file
+        index (list): FaiEntry list of this file, e.g. another Genome's
+            .index, so opening each record doesn't rescan the file
+    """
+
+    def __init__(self, path: str, record: str = None, use_fai: bool = True, index: list = None):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.data = np.frombuffer(self._mm, dtype=np.uint8)
+        else:
+            self._mm = b""
+            self.data = np.zeros(0, dtype=np.uint8)
+
+        fai_path = path + ".fai"
+        if index is not None:
+            self.index = list(index)
+        elif use_fai and os.path.isfile(fai_path) and os.path.getmtime(fai_path) >= os.path.getmtime(path):
+            self.index = read_fai(fai_path)
+        else:
+            name = os.path.splitext(os.path.basename(path))[0]
+            self.index = build_index(self.data, default_name=name)
+        if not self.index:
+            self.index = [FaiEntry(os.path.basename(path), 0, 0, 0, 0)]
+
+        if record is None:
+            self.entry = self.index[0]
+        else:
+            matches = [entry for entry in self.index if entry.name == record]
+            if not matches:
+                raise KeyError(f"No record named {record} in {path}")
+            self.entry = matches[0]
+        self.name = self.entry.name
+        self._length = self.entry.length
+        self._offset = self.entry.offset
+        self._line_bases = self.entry.line_bases or 1
+        self._line_width = self.entry.line_width or 1
+        # the whole record sits on one line: slices map to a single byte range
+        self._single_line = self._length <= self._line_bases
+
+    @property
+    def names(self) -> list:
+        return [entry.name for entry in self.index]
+
+    def save_index(self) -> str:
+        """Write the index next to the file as <path>.fai and return its path"""
+        write_fai(self.index, self.path + ".fai")
+        return self.path + ".fai"
+
+    def close(self) -> None:
+        self.data = None
+        if isinstance(self._mm, mmap.mmap):
+            try:
+                self._mm.close()
+            except BufferError:
+                # views handed out by view()/chunks() are still alive; the
+                # mapping is released with the last of them
+                pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __reduce__(self):
+        # process pools get the path and this record's entry and reopen the mapping
+        return Genome, (self.path, self.name, False, [self.entry])
+
+    def __repr__(self):
+        return f"Genome({self.path!r}, record={self.name!r}, length={self._length})"
+
+    def _byte(self, i: int) -> int:
+        line, column = divmod(i, self._line_bases)
+        return self._offset + line * self._line_width + column
+
+    def _raw(self, start: int, stop: int) -> bytes:
+        """Bytes of bases start:stop, line breaks removed, not yet upper-cased"""
+        if start >= stop:
+            return b""
+        if self._single_line:
+            return self._mm[self._offset + start : self._offset + stop]
+        raw = self._mm[self._byte(start) : self._byte(stop - 1) + 1]
+        if stop - start <= self._line_bases - start % self._line_bases:
+            return raw
+        return raw.translate(None, b"\r\n")
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                return self[start:stop][::step] if step > 0 else self[stop + 1 : start + 1][::step]
+            return self._raw(start, stop).translate(_UPPER_BYTES).decode("ascii")
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("Genome index out of range")
+        return chr(_UPPER[self._mm[self._byte(key)]])
+
+    def __iter__(self):
+        for start in range(0, self._length, 1 << 20):
+            yield from self[start : start + (1 << 20)]
+
+    def __reversed__(self):
+        for stop in range(self._length, 0, -(1 << 20)):
+            yield from reversed(self[max(stop - (1 << 20), 0) : stop])
+
+    def __str__(self) -> str:
+        return self[:]
+
+    def __bytes__(self) -> bytes:
+        return self._raw(0, self._length).translate(_UPPER_BYTES)
+
+    def upper(self) -> "Genome":
+        """Slices are upper-cased as they are read, so the genome is its own upper-case form"""
+        return self
+
+    def strip(self) -> "Genome":
+        """Line breaks are never part of the sequence, so there is nothing to strip"""
+        return self
+
+    def count(self, base: str) -> int:
+        """
+        Count occurrences of a single base (case-insensitive), chunk by chunk
+
+        Args:
+            base (str): one character; longer patterns are counted on str(self)
+
+        Returns:
+            int: number of occurrences
+        """
+        if len(base) != 1:
+            return str(self).count(base)
+        code = ord(base.upper())
+        return sum(int(np.count_nonzero(bases == code)) for _, bases in self.chunks())
+
+    def view(self, start: int = 0, stop: int = None) -> np.ndarray:
+        """
+        Zero-copy uint8 view of bases start:stop, as stored (not upper-cased)
+
+        Only possible when the range lies on one line of the file (always
+        the case for unwrapped files); use chunks() for wrapped FASTA.
+        """
+        stop = self._length if stop is None else min(stop, self._length)
+        if start >= stop:
+            return self.data[:0]
+        first, last = self._byte(start), self._byte(stop - 1)
+        if last - first != stop - 1 - start:
+            raise ValueError("Range spans several lines of a wrapped file, use chunks() instead")
+        return self.data[first : last + 1]
+
+    def chunks(self, chunk_size: int = 1 << 22, overlap: int = 0):
+        """
+        Yield upper-cased uint8 arrays of consecutive bases
+
+        Only one chunk is folded (and, for wrapped files, compacted) at a time.
+
+        Args:
+            chunk_size (int): bases per chunk, excluding the overlap
+            overlap (int): bases repeated from the start of the next chunk,
+                e.g. k - 1 so every k-mer lies inside one chunk
+
+        Yields:
+            tuple: (start position, np.ndarray of bases start:start + chunk_size + overlap)
+        """
+        for start in range(0, self._length, chunk_size):
+            stop = min(start + chunk_size + overlap, self._length)
+            try:
+                bases = self.view(start, stop)
+            except ValueError:
+                bases = np.frombuffer(self._raw(start, stop), dtype=np.uint8)
+            yield start, _UPPER[bases]
+            if stop == self._length:
+                break
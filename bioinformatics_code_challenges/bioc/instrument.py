@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+
+"""
+Stage timers and counters for the challenge algorithms.
+
+Algorithms wrap their phases in `stage()` and report work done with
+`count()`:
+
+    with instrument.stage("count_kmers"):
+        ...
+    instrument.count("kmers", n - k + 1)
+
+Both are no-ops until instrumentation is switched on, either with
+enable() (bioc --stats / --trace) or through the environment:
+
+    BIOC_INSTRUMENT=1              collect and print a summary at exit
+    BIOC_TRACE=run.trace.json      also write a Chrome trace at exit
+                                   (open in chrome://tracing or Perfetto)
+    BIOC_PROFILE=run.pstats        run the whole process under cProfile and
+                                   write pstats data at exit (independent of
+                                   the two above; don't combine with
+                                   bioc --profile, one profiler at a time)
+
+When off, stage() returns a shared do-nothing context manager and count()
+returns after one flag check, so instrumented code keeps its speed. Counters
+are bumped once per call with totals, never per base or k-mer. Only the
+calling process is recorded; work done in process pools shows up as the
+parent's stage around it.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+_enabled = False
+_origin = time.perf_counter_ns()
+_lock = threading.Lock()
+# completed stages: (name, start_ns, duration_ns, thread id)
+_events = []
+_counters = Counter()
+
+
+class _NullStage:
+    """Context manager used while instrumentation is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        with _lock:
+            _events.append((self.name, self.start, end - self.start, threading.get_ident()))
+        return False
+
+
+def enable(on: bool = True) -> None:
+    """Switch stage timing and counters on (or off)"""
+    global _enabled
+    _enabled = on
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """Drop recorded stages and counters"""
+    with _lock:
+        _events.clear()
+        _counters.clear()
+
+
+def stage(name: str):
+    """
+    Time a block of code as a named stage
+
+    Args:
+        name (str): stage name, e.g. "read" or "count_kmers"
+
+    Returns:
+        context manager recording the stage (a no-op while disabled)
+    """
+    if not _enabled:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    """
+    Add n to a named counter (bases, kmers, neighbors, cache_hits, ...)
+
+    Args:
+        name (str): counter name
+        n (int): amount to add
+    """
+    if _enabled:
+        _counters[name] += n
+
+
+def counters() -> dict:
+    return dict(_counters)
+
+
+def stage_totals() -> dict:
+    """
+    Summed time per stage
+
+    Returns:
+        dict: stage name -> (calls, total seconds)
+    """
+    totals = defaultdict(lambda: [0, 0])
+    for name, _, duration, _ in _events:
+        totals[name][0] += 1
+        totals[name][1] += duration
+    return {name: (calls, ns / 1e9) for name, (calls, ns) in totals.items()}
+
+
+def report() -> str:
+    """Human-readable summary of stage times and counters"""
+    lines = [f"{'stage':<24}{'calls':>8}{'seconds':>12}"]
+    for name, (calls, seconds) in sorted(stage_totals().items(), key=lambda item: -item[1][1]):
+        lines.append(f"{name:<24}{calls:>8}{seconds:>12.4f}")
+    if _counters:
+        lines.append("")
+        lines.append(f"{'counter':<24}{'value':>20}")
+        for name, value in sorted(_counters.items()):
+            lines.append(f"{name:<24}{value:>20,}")
+    return "\n".join(lines)
+
+
+def write_chrome_trace(path: str) -> None:
+    """
+    Write recorded stages and final counter values in Chrome trace format
+
+    Args:
+        path (str): output JSON file
+    """
+    pid = os.getpid()
+    events = [
+        {
+            "name": name,
+            "ph": "X",
+            "ts": (start - _origin) / 1000,
+            "dur": duration / 1000,
+            "pid": pid,
+            "tid": tid,
+        }
+        for name, start, duration, tid in _events
+    ]
+    end = max((start + duration for _, start, duration, _ in _events), default=_origin)
+    events.extend(
+        {"name": name, "ph": "C", "ts": (end - _origin) / 1000, "pid": pid, "args": {name: value}}
+        for name, value in _counters.items()
+    )
+    with open(path, "w") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+@contextmanager
+def profiling(path: str = None, limit: int = 25):
+    """
+    Run a block under cProfile
+
+    Args:
+        path (str): write pstats data here (load with pstats.Stats(path));
+            None prints the top functions by cumulative time to stderr
+        limit (int): number of functions printed
+    """
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path is None:
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(limit)
+        else:
+            profiler.dump_stats(path)
+            print(f"Profile written to {path}", file=sys.stderr)
+
+
+def _report_at_exit(trace_path: str) -> None:
+    if trace_path:
+        write_chrome_trace(trace_path)
+        print(f"Trace written to {trace_path}", file=sys.stderr)
+    print(report(), file=sys.stderr)
+
+
+def _profile_until_exit(path: str) -> None:
+    """Profile the process from now on and write pstats data to path at exit"""
+    import cProfile
+
+    profiler = cProfile.Profile()
+
+    def dump() -> None:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"Profile written to {path}", file=sys.stderr)
+
+    profiler.enable()
+    atexit.register(dump)
+
+
+if os.environ.get("BIOC_INSTRUMENT", "0") not in ("", "0") or os.environ.get("BIOC_TRACE"):
+    enable()
+    atexit.register(_report_at_exit, os.environ.get("BIOC_TRACE"))
+if os.environ.get("BIOC_PROFILE"):
+    _profile_until_exit(os.environ["BIOC_PROFILE"])
@@ -1,69 +1,185 @@
 #!/usr/bin/env python3
 
-from collections import defaultdict
+from collections import defaultdict, deque
 
-def DistinctClumpCount(file_path: str, k: int, L: int, t: int) -> int:
+from bioc import instrument
+from bioc.genome import Genome
+
+
+def ClumpIntervals(genome: str, k: int, L: int, t: int) -> list:
+    """
+    Finds every (L, t)-clump in a genome together with where it occurs, in a
+    single sliding pass.
+
+    Each k-mer keeps a ring buffer of its t most recent positions. When the
+    oldest and newest of those fit in one window of length L the k-mer forms
+    a clump there; overlapping clumps of the same k-mer are merged into one
+    interval. A k-mer with no occurrence left in the current window is
+    dropped, so memory stays proportional to L rather than to the genome.
+
+    Args:
+        genome (str | Genome): The input DNA sequence.
+        k (int): Length of k-mers.
+        L (int): Length of the window to search within.
+        t (int): Minimum number of occurrences for a k-mer to form a clump.
+
+    Returns:
+        list: (k-mer, start, end, positions) tuples sorted by start, where
+            genome[start:end] spans the clump and positions lists the k-mer
+            occurrences inside it.
+    """
+    n = len(genome)
+    if n < L or L < k:
+        return []
+
+    recent = {}  # k-mer -> deque of its last t positions
+    open_clumps = {}  # k-mer -> [start, end, positions] still able to grow
+    intervals = []
+
+    def close(kmer):
+        start, end, positions = open_clumps.pop(kmer)
+        intervals.append((kmer, start, end, positions))
+
+    with instrument.stage("clump_intervals"):
+        for i in range(n - k + 1):
+            # Drop the k-mer leaving the window if this was its last occurrence
+            outgoing = i - (L - k + 1)
+            if outgoing >= 0:
+                outgoing_kmer = genome[outgoing : outgoing + k]
+                if recent[outgoing_kmer][-1] == outgoing:
+                    del recent[outgoing_kmer]
+                    if outgoing_kmer in open_clumps:
+                        close(outgoing_kmer)
+
+            kmer = genome[i : i + k]
+            positions = recent.get(kmer)
+            if positions is None:
+                positions = recent[kmer] = deque(maxlen=t)
+            positions.append(i)
+
+            # The last t occurrences fit in one window: the k-mer forms a clump
+            if len(positions) == t and i + k - positions[0] <= L:
+                clump = open_clumps.get(kmer)
+                if clump is not None and positions[0] <= clump[2][-1]:
+                    # Shares occurrences with the open clump, extend it with
+                    # every occurrence it doesn't hold yet (not only i: some
+                    # never completed a t-window of their own)
+                    clump[1] = i + k
+                    clump[2].extend(p for p in positions if p > clump[2][-1])
+                else:
+                    if clump is not None:
+                        close(kmer)
+                    open_clumps[kmer] = [positions[0], i + k, list(positions)]
+    instrument.count("bases", n)
+    instrument.count("kmers", n - k + 1)
+
+    for kmer in list(open_clumps):
+        close(kmer)
+
+    intervals.sort(key=lambda interval: (interval[1], interval[0]))
+    return intervals
+
+
+def ClumpKmers(genome: str, k: int, L: int, t: int) -> set:
+    """
+    Finds the distinct k-mers forming (L, t)-clumps in a genome sequence.
+
+    Args:
+        genome (str | Genome): The input DNA sequence.
+        k (int): Length of k-mers.
+        L (int): Length of the window to search within.
+        t (int): Minimum number of occurrences for a k-mer to form a clump.
+
+    Returns:
+        set: Distinct k-mers forming clumps.
+    """
+    n = len(genome)
+    if n < L or L < k:
+        return set()
+
+    with instrument.stage("clump_window"):
+        clump_kmers = set()
+        freq = defaultdict(int)
+
+        # Initialize the first window
+        for i in range(L - k + 1):
+            kmer = genome[i:i + k]
+            freq[kmer] += 1
+
+        # Add k-mers forming clumps in the first window
+        for kmer, count in freq.items():
+            if count >= t:
+                clump_kmers.add(kmer)
+
+        # Slide the window across the genome
+        for i in range(1, n - L + 1):
+            # Remove the k-mer going out of the window
+            outgoing_kmer = genome[i - 1:i - 1 + k]
+            freq[outgoing_kmer] -= 1
+            if freq[outgoing_kmer] == 0:
+                del freq[outgoing_kmer]  # Clean up to save space
+
+            # Add the k-mer coming into the window
+            incoming_kmer = genome[i + L - k:i + L]
+            freq[incoming_kmer] += 1
+
+            # Check if the new k-mer forms a clump
+            if freq[incoming_kmer] >= t:
+                clump_kmers.add(incoming_kmer)
+    instrument.count("bases", n)
+    instrument.count("kmers", n - k + 1)
+
+    return clump_kmers
+
+
+def DistinctClumpCount(
+    file_path, k: int, L: int, t: int, intervals: bool = False
+) -> int:
     """
     Finds the number of distinct k-mers forming (L, t)-clumps in a genome.
 
     Args:
-        file_path (str): Path to the file containing the genome sequence.
+        file_path (str | Genome): Path to a plain or FASTA genome file, or an
+            open Genome. The record is copied once into an upper-cased str
+            (one byte per base) before the k-mer scan.
         k (int): Length of k-mers.
         L (int): Length of the window to search within.
         t (int): Minimum number of occurrences for a k-mer to form a clump.
+        intervals (bool): Also return the clump intervals found by
+            ClumpIntervals, from the same read of the genome.
 
     Returns:
-        int: Number of distinct k-mers forming clumps.
+        int: Number of distinct k-mers forming clumps, or a
+            (count, intervals) tuple when intervals is True.
     """
     try:
-        # Read the genome from the file
-        with open(file_path, "r") as file:
-            genome = file.read().strip().upper()
+        # The k-mer loops slice the sequence at every base, which is far
+        # cheaper on a str than through the mapping: copy the record once
+        with instrument.stage("read"):
+            if isinstance(file_path, Genome):
+                genome = str(file_path)
+            else:
+                with Genome(file_path) as mapped:
+                    genome = str(mapped)
     except FileNotFoundError:
         print(f"Error: File not found at {file_path}")
-        return 0
+        return (0, []) if intervals else 0
     except Exception as e:
         print(f"Error reading file: {e}")
-        return 0
+        return (0, []) if intervals else 0
 
-    n = len(genome)
-    clump_kmers = set()
-    freq = defaultdict(int)
-
-    # Initialize the first window
-    for i in range(L - k + 1):
-        kmer = genome[i:i + k]
-        freq[kmer] += 1
-
-    # Add k-mers forming clumps in the first window
-    for kmer, count in freq.items():
-        if count >= t:
-            clump_kmers.add(kmer)
-
-    # Slide the window across the genome
-    for i in range(1, n - L + 1):
-        # Remove the k-mer going out of the window
-        outgoing_kmer = genome[i - 1:i - 1 + k]
-        freq[outgoing_kmer] -= 1
-        if freq[outgoing_kmer] == 0:
-            del freq[outgoing_kmer]  # Clean up to save space
-
-        # Add the k-mer coming into the window
-        incoming_kmer = genome[i + L - k:i + L]
-        freq[incoming_kmer] += 1
-
-        # Check if the new k-mer forms a clump
-        if freq[incoming_kmer] >= t:
-            clump_kmers.add(incoming_kmer)
-
-    # Return the number of distinct clump-forming k-mers
-    return len(clump_kmers)
-
-
-file_path = "E_coli.txt"
-k = 9
-L = 500
-t = 3
-
-result = DistinctClumpCount(file_path, k, L, t)
-print(result)
\ No newline at end of file
+    if intervals:
+        clumps = ClumpIntervals(genome, k, L, t)
+        return len({interval[0] for interval in clumps}), clumps
+
+    return len(ClumpKmers(genome, k, L, t))
+
+
+if __name__ == "__main__":
+    file_path = "E_coli.txt"
+    k = 9
+    L = 500
+    t = 3
+
+    result = DistinctClumpCount(file_path, k, L, t)
+    print(result)
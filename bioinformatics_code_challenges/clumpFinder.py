@@ -2,13 +2,15 @@
 
 from collections import defaultdict
 
+from bioc.genome import Genome
 
-def ClumpFinding(genome: str, k: int, L: int, t: int) -> list:
+
+def ClumpFinding(genome, k: int, L: int, t: int) -> list:
     """
     Finds all distinct k-mers forming (L, t)-clumps in a genome.
 
     Args:
-        genome (str): The input DNA sequence.
+        genome (str | Genome): Path to the genome file, or an open Genome.
         k (int): Length of k-mers.
         L (int): Length of the window to search within.
         t (int): Minimum number of occurrences for a k-mer to form a clump.
@@ -16,8 +18,13 @@ def ClumpFinding(genome: str, k: int, L: int, t: int) -> list:
     Returns:
         list: List of distinct k-mers forming clumps.
     """
-    with open(genome, "r") as file:
-        genome= file.read().strip()
+    # the loops below slice at every base, which is much cheaper on a str
+    # than through the mapping, so the record is copied once
+    if isinstance(genome, Genome):
+        genome = str(genome)
+    else:
+        with Genome(genome) as mapped:
+            genome = str(mapped)
     # genome = genome.upper().strip()
     n = len(genome)
     # kmer_positions = defaultdict(list)
@@ -48,13 +55,14 @@ def ClumpFinding(genome: str, k: int, L: int, t: int) -> list:
 # # L = 100
 # # t = 4
 
-genome = "datasets/Salmonella_full_genome.txt"
-k = 9
-L = 500
-t = 3
+if __name__ == "__main__":
+    genome = "datasets/Salmonella_full_genome.txt"
+    k = 9
+    L = 500
+    t = 3
 
-result = ClumpFinding(genome, k, L, t)
-print("Clump k-mers:", " ".join(result))
+    result = ClumpFinding(genome, k, L, t)
+    print("Clump k-mers:", " ".join(result))
 
 
 
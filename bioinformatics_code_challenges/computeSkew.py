@@ -1,4 +1,6 @@
-#!/usr/bin/env py
+#!/usr/bin/env python3
+
+from bioc import instrument
 
 
 def compute_skew(genome: str) -> int:
@@ -14,18 +16,20 @@ def compute_skew(genome: str) -> int:
     # set skew initial start position
     skew = [0]
 
-    for nucleotide in genome:
-        # get previous skew position
-        prev_skew = skew[-1]
+    with instrument.stage("skew"):
+        for nucleotide in genome:
+            # get previous skew position
+            prev_skew = skew[-1]
 
-        # check for C and G
-        if nucleotide == "C":
-            skew.append(prev_skew - 1)
-        elif nucleotide == "G":
-            skew.append(prev_skew + 1)
-        else:
-            skew.append(prev_skew)
+            # check for C and G
+            if nucleotide == "C":
+                skew.append(prev_skew - 1)
+            elif nucleotide == "G":
+                skew.append(prev_skew + 1)
+            else:
+                skew.append(prev_skew)
 
+    instrument.count("bases", len(genome))
     return skew
 
 
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+
+"""
+Approximate pattern matching under edit distance (substitutions, insertions
+and deletions), for reads with indels where ApproxPatternMatching's Hamming
+distance misses occurrences.
+
+Occurrence ends are found with Myers' bit-vector algorithm: one column of
+the edit distance table is kept as bit vectors over the pattern, so each
+text base costs a handful of word operations, O(n * ceil(m / w)) in all.
+The bit vectors are Python ints, which grow to as many machine words as the
+pattern needs. The start of each occurrence is then recovered with a small
+dynamic program over the at most m + d bases before its end.
+
+    EditPatternMatching("ATTCTGGA", read, 2)
+    # [(start, end, distance), ...] with read[start:end] the occurrence
+"""
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from bioc import instrument
+
+
+def pattern_masks(pattern: str) -> dict:
+    """
+    Match masks of a pattern: bit i of masks[c] is set when pattern[i] == c
+
+    Args:
+        pattern (str): Pattern to search for
+
+    Returns:
+        dict: base -> int bit mask
+    """
+    masks = {}
+    for i, base in enumerate(pattern.upper()):
+        masks[base] = masks.get(base, 0) | (1 << i)
+    return masks
+
+
+def EditMatchEnds(pattern: str, text: str, d: int, masks: dict = None) -> list:
+    """
+    End positions of all occurrences of a pattern in a text within edit distance d
+
+    Args:
+        pattern (str): Pattern to search for
+        text (str): Sequence to search in
+        d (int): Maximum edit distance
+        masks (dict): pattern_masks(pattern), when searching many texts
+
+    Returns:
+        list: (end, distance) tuples, where end is exclusive and distance is
+            the smallest edit distance of the pattern to a substring of text
+            ending there
+    """
+    m = len(pattern)
+    if m == 0:
+        return [(end, 0) for end in range(len(text) + 1)]
+    if masks is None:
+        masks = pattern_masks(pattern)
+
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    # vertical deltas of the current column: +1 (Pv) or -1 (Mv) per pattern row
+    pv, mv = full, 0
+    score = m
+    ends = []
+
+    with instrument.stage("edit_scan"):
+        for j, base in enumerate(text.upper()):
+            eq = masks.get(base, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & full)
+            mh = pv & xh
+            if ph & high:
+                score += 1
+            elif mh & high:
+                score -= 1
+            # row 0 is all zeros (an occurrence may start anywhere), so no
+            # horizontal delta is shifted in at the top
+            ph = (ph << 1) & full
+            mh = (mh << 1) & full
+            pv = mh | (~(xv | ph) & full)
+            mv = ph & xv
+            if score <= d:
+                ends.append((j + 1, score))
+    instrument.count("bases", len(text))
+    instrument.count("matches", len(ends))
+    return ends
+
+
+def best_start(pattern: str, text: str, end: int, d: int) -> tuple:
+    """
+    Start of the best occurrence of a pattern ending at end
+
+    Aligns the reversed pattern against the text read backwards from end,
+    over at most len(pattern) + d bases.
+
+    Args:
+        pattern (str): Pattern to search for
+        text (str): Sequence to search in
+        end (int): Exclusive end of the occurrence
+        d (int): Maximum edit distance
+
+    Returns:
+        tuple: (start, distance); among starts with the same distance the
+            leftmost (longest occurrence) is returned
+    """
+    pattern = pattern.upper()
+    window = text[max(end - len(pattern) - d, 0) : end].upper()[::-1]
+    # row[j]: distance of the pattern suffix seen so far to window[:j]
+    row = list(range(len(window) + 1))
+    for i, base in enumerate(reversed(pattern), 1):
+        previous, row[0] = row[0], i
+        for j, text_base in enumerate(window, 1):
+            previous, row[j] = row[j], min(
+                row[j] + 1,  # pattern base deleted
+                row[j - 1] + 1,  # text base inserted
+                previous + (base != text_base),  # match or substitution
+            )
+    distance = min(row)
+    length = max(j for j, value in enumerate(row) if value == distance)
+    return end - length, distance
+
+
+def EditPatternMatching(pattern: str, text: str, d: int, masks: dict = None) -> list:
+    """
+    Find all occurrences of a pattern in a text within edit distance d
+
+    Every end position within distance d is reported, as ApproxPatternMatching
+    reports every start position within d mismatches, so one occurrence
+    usually shows up at a few neighbouring ends.
+
+    Args:
+        pattern (str): Pattern to search for
+        text (str): Sequence to search in
+        d (int): Maximum edit distance (substitutions, insertions, deletions)
+        masks (dict): pattern_masks(pattern), when searching many texts
+
+    Returns:
+        list: (start, end, distance) tuples sorted by end, with
+            text[start:end] the occurrence
+    """
+    ends = EditMatchEnds(pattern, text, d, masks)
+    with instrument.stage("edit_starts"):
+        return [(best_start(pattern, text, end, d)[0], end, distance) for end, distance in ends]
+
+
+def EditPatternCount(pattern: str, text: str, d: int) -> int:
+    """
+    Count end positions of occurrences within edit distance d (no start recovery)
+
+    Args:
+        pattern (str): Pattern to search for
+        text (str): Sequence to search in
+        d (int): Maximum edit distance
+
+    Returns:
+        int: Number of end positions within distance d
+    """
+    return len(EditMatchEnds(pattern, text, d))
+
+
+def EditMatchingBatch(pattern: str, reads: list, d: int, workers: int = 1, starts: bool = True) -> list:
+    """
+    Search one pattern in many reads
+
+    The pattern masks are built once and shared by every read. With several
+    workers the reads are spread over a process pool.
+
+    Args:
+        pattern (str): Pattern to search for
+        reads (list): Sequences to search in
+        d (int): Maximum edit distance
+        workers (int): Worker processes (1: search in this process)
+        starts (bool): Recover start positions; False returns (end, distance)
+            tuples as EditMatchEnds, which is cheaper
+
+    Returns:
+        list: one list of occurrences per read, in input order
+    """
+    search = partial(
+        EditPatternMatching if starts else EditMatchEnds,
+        pattern,
+        d=d,
+        masks=pattern_masks(pattern),
+    )
+    with instrument.stage("edit_batch"):
+        if workers <= 1 or len(reads) < 2:
+            results = [search(read) for read in reads]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunksize = max(1, len(reads) // (4 * workers))
+                results = list(executor.map(search, reads, chunksize=chunksize))
+    instrument.count("reads", len(reads))
+    return results
+
+
+def _benchmark_cases() -> list:
+    """(name, pattern, text, d) cases from the ApproximatePatternMatching datasets"""
+    cases = []
+    for path in sorted(glob.glob("datasets/ApproximatePatternMatching/inputs/input_*.txt")):
+        with open(path, "r") as file:
+            lines = file.read().split()
+        cases.append((os.path.basename(path), lines[0], lines[1], int(lines[2])))
+
+    with open("datasets/ApproxMatching_dataset.txt", "r") as file:
+        lines = file.read().split()
+    cases.append(("ApproxMatching_dataset", lines[0], lines[1], int(lines[2])))
+
+    # patterns longer than a machine word, on a whole genome
+    with open("datasets/Vibrio_cholerae.txt", "r") as file:
+        genome = file.read().strip().upper()
+    for m, d in ((16, 2), (64, 6), (150, 10)):
+        cases.append((f"Vibrio m={m}", genome[100_000 : 100_000 + m], genome, d))
+    return cases
+
+
+if __name__ == "__main__":
+    import time
+
+    from approxMatching import ApproxPatternMatching
+
+    print(f"{'case':<26}{'n':>9}{'m':>5}{'d':>4}{'hamming s':>11}{'edit ends s':>13}{'edit s':>9}"
+          f"{'hamming':>9}{'edit':>7}")
+    for name, pattern, text, d in _benchmark_cases():
+        repeat = max(1, 20_000 // len(text))
+        timings = []
+        for search in (
+            lambda: ApproxPatternMatching(pattern, text, d),
+            lambda: EditMatchEnds(pattern, text, d),
+            lambda: EditPatternMatching(pattern, text, d),
+        ):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                result = search()
+            timings.append(((time.perf_counter() - start) / repeat, len(result)))
+
+        (hamming, hits), (ends, _), (edit, edit_hits) = timings
+        print(f"{name:<26}{len(text):>9}{len(pattern):>5}{d:>4}{hamming:>11.5f}{ends:>13.5f}"
+              f"{edit:>9.5f}{hits:>9}{edit_hits:>7}")
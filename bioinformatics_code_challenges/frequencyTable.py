@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+from bioc import instrument
+from bioc.genome import Genome
 from patternCount import PatternCount
 
 
@@ -20,13 +22,16 @@ def FrequencyTable(text: str, k: int) -> int:
     text_length = len(text)
 
     # loop through the string
-    for i in range(text_length - k):
-        pattern = text[i : i + k]
-        # store pattern and its count
-        if pattern in freq:
-            freq[pattern] += 1
-        else:
-            freq[pattern] = 1
+    with instrument.stage("count_kmers"):
+        for i in range(text_length - k + 1):
+            pattern = text[i : i + k]
+            # store pattern and its count
+            if pattern in freq:
+                freq[pattern] += 1
+            else:
+                freq[pattern] = 1
+    instrument.count("bases", text_length)
+    instrument.count("kmers", max(text_length - k + 1, 0))
 
     # find pattern with maximum frequency
     max_count = max(freq.values())
@@ -38,9 +43,8 @@ def FrequencyTable(text: str, k: int) -> int:
 
 
 if __name__ == "__main__":
-    with open("datasets/Salmonella_full_genome.txt", "r") as file:
-        text = file.read().strip()
-        k = 9
+    text = str(Genome("datasets/Salmonella_full_genome.txt"))
+    k = 9
     print(FrequencyTable(text, k))
     # print(FrequencyTable("AAAGTCTTTCTGCCGGG", 3))
     # print(FrequencyTable("ACGTTGCATGTCGCATGATGCATGAGAGCT", 4))
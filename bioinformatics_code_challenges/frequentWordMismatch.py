@@ -1,54 +1,12 @@
 #!/usr/bin/env python3
 
+from approxMatching import ApproxPatternMatching
+from bioc import instrument
+from bioc.genome import Genome
+from hammingDistance import hamming_distance_strings
 from reverseComplement import ReverseComplement
 
 
-def hamming_distance_strings(str1: str, str2: str) -> int:
-    """
-    Calculate hamming distance between two strings of equal length
-
-    Args:
-        str1 (str): First string
-        str2 (str): Second string
-
-    Returns:
-        int: Hamming distance between the strings
-    """
-    if len(str1) != len(str2):
-        return -1
-
-    ham_dist = 0
-    for i in range(len(str1)):
-        if str1[i] != str2[i]:
-            ham_dist += 1
-    return ham_dist
-
-
-def ApproxPatternMatching(pattern: str, genome: str, d: int) -> list:
-    """
-    Find all approximate occurrences of a pattern in a genome with at most d mismatches
-
-    Args:
-        pattern (str): Pattern to search for
-        genome (str): Path to genome file to search in
-        d (int): Maximum number of mismatches allowed
-
-    Returns:
-        list: List of starting positions where pattern appears with at most d mismatches
-    """
-    positions = []
-
-    # Scan through genome
-    for i in range(len(genome) - len(pattern) + 1):
-        sliding_window = genome[i : i + len(pattern)]
-        # Check if hamming distance between pattern and window is <= d
-        if hamming_distance_strings(pattern, sliding_window) <= d:
-            positions.append(i)
-
-    # return " ".join(str(pos) for pos in positions)
-    return positions
-
-
 def neighborhood(pattern: str, d: int) -> str:
     """
     Find all neighbors of a pattern with at most d mismatches
@@ -91,15 +49,21 @@ def frequentWordsWithMismatches(genome: str, k: int, d: int) -> list:
         list: List of frequent words with mismatches
     """
     frequent_words = {}
-
-    for i in range(len(genome) - k + 1):
-        pattern = genome[i : i + k]
-        neighbors = list(neighborhood(pattern, d))
-        for neighbor in neighbors:
-            if neighbor in frequent_words:
-                frequent_words[neighbor] += 1
-            else:
-                frequent_words[neighbor] = 1
+    generated = 0
+
+    with instrument.stage("neighbors_and_count"):
+        for i in range(len(genome) - k + 1):
+            pattern = genome[i : i + k]
+            neighbors = list(neighborhood(pattern, d))
+            generated += len(neighbors)
+            for neighbor in neighbors:
+                if neighbor in frequent_words:
+                    frequent_words[neighbor] += 1
+                else:
+                    frequent_words[neighbor] = 1
+    instrument.count("bases", len(genome))
+    instrument.count("kmers", max(len(genome) - k + 1, 0))
+    instrument.count("neighbors", generated)
   
     # find the most frequent word mismatches
     max_count = max(frequent_words.values())
@@ -110,10 +74,7 @@ def frequentWordsWithMismatches(genome: str, k: int, d: int) -> list:
 
 
 if __name__ == "__main__":
-    with open("datasets/Salmonella_full_genome.txt", "r") as file:
-
-        genome = file.readline().strip()
-        # k, d = map(int, file.readline().split())
-        k, d = (9, 1)
-        print(f"k: {k}\nd: {d}")
+    genome = str(Genome("datasets/Salmonella_full_genome.txt"))
+    k, d = (9, 1)
+    print(f"k: {k}\nd: {d}")
     print(frequentWordsWithMismatches(genome, k, d))
@@ -1,3 +1,8 @@
+from bioc import instrument
+from bioc.genome import Genome
+from hammingDistance import hamming_distance_strings as hamming_distance
+
+
 def reverse_complement(pattern: str) -> str:
     """
     Find the reverse complement of a DNA string
@@ -12,22 +17,6 @@ def reverse_complement(pattern: str) -> str:
     return "".join(complement[base] for base in reversed(pattern))
 
 
-def hamming_distance(str1: str, str2: str) -> int:
-    """
-    Calculate hamming distance between two strings of equal length
-
-    Args:
-        str1 (str): First string
-        str2 (str): Second string
-
-    Returns:
-        int: Hamming distance between the strings
-    """
-    if len(str1) != len(str2):
-        return -1
-    return sum(1 for i in range(len(str1)) if str1[i] != str2[i])
-
-
 def neighborhood(pattern: str, d: int) -> set:
     """
     Find all neighbors of a pattern with at most d mismatches
@@ -90,19 +79,28 @@ def frequent_words_with_mismatches_and_rc(text: str, k: int, d: int) -> list:
     """
     patterns = {}
     n = len(text)
+    generated = 0
 
     # Generate all possible k-mers from the text and their neighborhoods
-    for i in range(n - k + 1):
-        pattern = text[i : i + k]
-        neighborhood_patterns = neighborhood(pattern, d)
-
-        # For each neighbor, count occurrences of both it and its reverse complement
-        for neighbor in neighborhood_patterns:
-            if neighbor not in patterns:
-                rc = reverse_complement(neighbor)
-                count = count_approximate_occurrences(text, neighbor, d)
-                count_rc = count_approximate_occurrences(text, rc, d)
-                patterns[neighbor] = count + count_rc
+    with instrument.stage("neighbors_and_count"):
+        for i in range(n - k + 1):
+            pattern = text[i : i + k]
+            neighborhood_patterns = neighborhood(pattern, d)
+            generated += len(neighborhood_patterns)
+
+            # For each neighbor, count occurrences of both it and its reverse complement
+            for neighbor in neighborhood_patterns:
+                if neighbor not in patterns:
+                    rc = reverse_complement(neighbor)
+                    count = count_approximate_occurrences(text, neighbor, d)
+                    count_rc = count_approximate_occurrences(text, rc, d)
+                    patterns[neighbor] = count + count_rc
+    instrument.count("bases", n)
+    instrument.count("kmers", max(n - k + 1, 0))
+    instrument.count("neighbors", generated)
+    # neighbors already counted for an earlier k-mer are looked up, not rescanned
+    instrument.count("cache_misses", len(patterns))
+    instrument.count("cache_hits", generated - len(patterns))
 
     # Find the maximum count
     if not patterns:
@@ -115,10 +113,8 @@ def frequent_words_with_mismatches_and_rc(text: str, k: int, d: int) -> list:
 
 
 if __name__ == "__main__":
-    with open("datasets/Salmonella_full_genome.txt", "r") as file:
-        genome = file.readline().strip()
-        k, d = (9, 1)
-        # k, d = map(int, file.readline().split())
-        print(f"k: {k}\nd: {d}")
+    genome = str(Genome("datasets/Salmonella_full_genome.txt"))
+    k, d = (9, 1)
+    print(f"k: {k}\nd: {d}")
     result = frequent_words_with_mismatches_and_rc(genome, k, d)
     print(" ".join(result))
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+
+
+def gc_content(genome: str) -> float:
+    """
+    Compute the fraction of G and C bases in a genome
+
+    Args:
+        genome (str): target DNA sequence
+
+    Returns:
+        float: (G + C) / length, 0.0 for an empty sequence
+    """
+    genome = genome.upper()
+    if not genome:
+        return 0.0
+    return (genome.count("G") + genome.count("C")) / len(genome)
+
+
+if __name__ == "__main__":
+    print(gc_content("ATGGCCATTGTAATGGGCCGCTGAAAGGGTGCCCGATAG"))
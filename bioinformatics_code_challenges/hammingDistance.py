@@ -27,6 +27,26 @@ def hamming_distance(g1: str, g2: str) -> int:
     return ham_dist
 
 
+def hamming_distance_strings(str1: str, str2: str) -> int:
+    """
+    Calculate hamming distance between two strings of equal length
+
+    This is the version shared by the matching, neighborhood and motif
+    modules: it returns -1 instead of an error message on a length mismatch,
+    so callers can compare the result against d directly.
+
+    Args:
+        str1 (str): First string
+        str2 (str): Second string
+
+    Returns:
+        int: Hamming distance between the strings, -1 if their lengths differ
+    """
+    if len(str1) != len(str2):
+        return -1
+    return sum(1 for a, b in zip(str1, str2) if a != b)
+
+
 if __name__ == "__main__":
     # with open(g1, "r") as file1, open(g2, "r") as file2:
     #     g1 = file1.read().strip()
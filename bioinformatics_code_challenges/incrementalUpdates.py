@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+
+"""
+Skew and clump results that are updated as an assembly grows.
+
+compute_skew and DistinctClumpCount start from scratch on every call. The
+classes here keep per-contig state instead, so appending bases to a contig
+costs time proportional to the new bases only, and replacing a contig only
+recomputes that contig:
+
+    skew = IncrementalSkew()
+    skew.append("contig_1", "GAGCCACCGC")
+    skew.append("contig_1", "GATA")          # only the 4 new bases are scanned
+    skew.minimum("contig_1")                 # same as min positions of compute_skew
+
+    clumps = IncrementalClumps(k=9, L=500, t=3)
+    clumps.append("contig_1", sequence)
+    clumps.save("clumps.json")               # checkpoint
+    clumps = IncrementalClumps.load("clumps.json")
+
+Contigs are independent: skew restarts at 0 on every contig and clump
+windows never span two contigs.
+"""
+
+import json
+import os
+from collections import defaultdict
+
+import numpy as np
+
+from bioc import instrument
+
+CHECKPOINT_VERSION = 1
+
+
+def _write_checkpoint(path: str, state: dict) -> None:
+    """Write state as JSON through a temporary file, so a crash never leaves a partial checkpoint"""
+    temporary = path + ".tmp"
+    with open(temporary, "w") as file:
+        json.dump(state, file)
+    os.replace(temporary, path)
+
+
+def _read_checkpoint(path: str, kind: str) -> dict:
+    with open(path, "r") as file:
+        state = json.load(file)
+    if state.get("kind") != kind or state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"{path} is not a version {CHECKPOINT_VERSION} {kind} checkpoint")
+    return state
+
+
+class IncrementalSkew:
+    """
+    Running G - C skew of every contig, with the positions of its minimum and maximum.
+
+    Positions follow compute_skew: position i is the skew after the first i
+    bases of the contig, so position 0 (skew 0) is always included.
+    """
+
+    def __init__(self):
+        # contig -> {"length", "skew", "min", "min_positions", "max", "max_positions"}
+        self.contigs = {}
+
+    def append(self, contig: str, bases: str) -> None:
+        """
+        Extend a contig (creating it if needed) by bases
+
+        Args:
+            contig (str): contig name
+            bases (str): bases added at the end of the contig
+        """
+        state = self.contigs.get(contig)
+        if state is None:
+            state = self.contigs[contig] = {
+                "length": 0,
+                "skew": 0,
+                "min": 0,
+                "min_positions": [0],
+                "max": 0,
+                "max_positions": [0],
+            }
+        if not bases:
+            return
+
+        with instrument.stage("incremental_skew"):
+            codes = np.frombuffer(bases.upper().encode("ascii"), dtype=np.uint8)
+            steps = (codes == ord("G")).astype(np.int64) - (codes == ord("C"))
+            skew = state["skew"] + np.cumsum(steps)
+
+            for extreme, pick in (("min", np.min), ("max", np.max)):
+                value = int(pick(skew))
+                positions = (np.flatnonzero(skew == value) + state["length"] + 1).tolist()
+                if value == state[extreme]:
+                    state[extreme + "_positions"].extend(positions)
+                elif (value < state[extreme]) == (extreme == "min"):
+                    state[extreme] = value
+                    state[extreme + "_positions"] = positions
+
+            state["skew"] = int(skew[-1])
+            state["length"] += len(bases)
+        instrument.count("bases", len(bases))
+
+    def replace(self, contig: str, sequence: str) -> None:
+        """Replace a contig's whole sequence (cost proportional to that contig only)"""
+        self.remove(contig)
+        self.append(contig, sequence)
+
+    def remove(self, contig: str) -> None:
+        self.contigs.pop(contig, None)
+
+    def skew(self, contig: str) -> int:
+        """Skew at the end of a contig"""
+        return self.contigs[contig]["skew"]
+
+    def minimum(self, contig: str) -> list:
+        """Positions where a contig's skew is lowest"""
+        return list(self.contigs[contig]["min_positions"])
+
+    def maximum(self, contig: str) -> list:
+        """Positions where a contig's skew is highest"""
+        return list(self.contigs[contig]["max_positions"])
+
+    def save(self, path: str) -> None:
+        """Write a JSON checkpoint to path"""
+        _write_checkpoint(path, {"kind": "skew", "version": CHECKPOINT_VERSION, "contigs": self.contigs})
+
+    @classmethod
+    def load(cls, path: str) -> "IncrementalSkew":
+        """Resume from a checkpoint written by save()"""
+        skew = cls()
+        skew.contigs = _read_checkpoint(path, "skew")["contigs"]
+        return skew
+
+
+class _ContigClumps:
+    """
+    Sliding-window state at the end of one contig
+
+    The contig is scanned k-mer by k-mer as in ClumpKmers: each new k-mer
+    enters the window and the one L - k + 1 k-mers before it leaves. Only
+    the last L bases and the counts of the current window are kept, which is
+    all the next append needs.
+    """
+
+    def __init__(self, k: int, L: int, t: int):
+        self.k, self.L, self.t = k, L, t
+        self.length = 0
+        self.tail = ""  # last L bases of the contig
+        self.freq = defaultdict(int)  # k-mer counts in the window ending at the contig's end
+        self.clumps = set()
+        # k-mers reaching t before the contig is L bases long; they only count
+        # as clumps once the first full window exists
+        self.pending = set()
+
+    def append(self, bases: str) -> None:
+        k, L, t = self.k, self.L, self.t
+        # tail[0] is contig position `offset`
+        offset = max(self.length - L, 0)
+        text = self.tail + bases.upper()
+        freq = self.freq
+        span = L - k + 1  # k-mers per window
+
+        for j in range(max(self.length - k + 1, 0), self.length + len(bases) - k + 1):
+            # the k-mer leaving the window
+            outgoing = j - span
+            if outgoing >= 0:
+                outgoing_kmer = text[outgoing - offset : outgoing - offset + k]
+                freq[outgoing_kmer] -= 1
+                if freq[outgoing_kmer] == 0:
+                    del freq[outgoing_kmer]
+
+            kmer = text[j - offset : j - offset + k]
+            freq[kmer] += 1
+            if j + k == L:
+                # first full window: clumps seen in the partial windows become real
+                self.clumps |= self.pending
+                self.pending = set()
+            if freq[kmer] >= t:
+                (self.clumps if j + k >= L else self.pending).add(kmer)
+
+        self.length += len(bases)
+        self.tail = text[-L:]
+
+    def state(self) -> dict:
+        return {
+            "length": self.length,
+            "tail": self.tail,
+            "freq": dict(self.freq),
+            "clumps": sorted(self.clumps),
+            "pending": sorted(self.pending),
+        }
+
+    @classmethod
+    def from_state(cls, k: int, L: int, t: int, state: dict) -> "_ContigClumps":
+        contig = cls(k, L, t)
+        contig.length = state["length"]
+        contig.tail = state["tail"]
+        contig.freq = defaultdict(int, state["freq"])
+        contig.clumps = set(state["clumps"])
+        contig.pending = set(state["pending"])
+        return contig
+
+
+class IncrementalClumps:
+    """
+    Distinct k-mers forming (L, t)-clumps in any contig of a growing assembly.
+
+    Args:
+        k (int): Length of k-mers.
+        L (int): Length of the window to search within.
+        t (int): Minimum number of occurrences for a k-mer to form a clump.
+    """
+
+    def __init__(self, k: int, L: int, t: int):
+        if L < k:
+            raise ValueError(f"Window length L={L} is shorter than k={k}")
+        self.k, self.L, self.t = k, L, t
+        self.contigs = {}
+
+    def append(self, contig: str, bases: str) -> None:
+        """
+        Extend a contig (creating it if needed) by bases
+
+        Args:
+            contig (str): contig name
+            bases (str): bases added at the end of the contig
+        """
+        state = self.contigs.get(contig)
+        if state is None:
+            state = self.contigs[contig] = _ContigClumps(self.k, self.L, self.t)
+        with instrument.stage("incremental_clumps"):
+            state.append(bases)
+        instrument.count("bases", len(bases))
+        instrument.count("kmers", len(bases))
+
+    def replace(self, contig: str, sequence: str) -> None:
+        """Replace a contig's whole sequence (cost proportional to that contig only)"""
+        self.remove(contig)
+        self.append(contig, sequence)
+
+    def remove(self, contig: str) -> None:
+        self.contigs.pop(contig, None)
+
+    def clump_kmers(self, contig: str = None) -> set:
+        """
+        Clump-forming k-mers of one contig, or of all contigs
+
+        Args:
+            contig (str): contig name (default: union over all contigs)
+
+        Returns:
+            set: Distinct k-mers forming clumps.
+        """
+        if contig is not None:
+            return set(self.contigs[contig].clumps)
+        return set().union(*(state.clumps for state in self.contigs.values()))
+
+    def count(self) -> int:
+        """Number of distinct clump-forming k-mers over all contigs, as DistinctClumpCount"""
+        return len(self.clump_kmers())
+
+    def save(self, path: str) -> None:
+        """Write a JSON checkpoint to path"""
+        _write_checkpoint(
+            path,
+            {
+                "kind": "clumps",
+                "version": CHECKPOINT_VERSION,
+                "k": self.k,
+                "L": self.L,
+                "t": self.t,
+                "contigs": {name: state.state() for name, state in self.contigs.items()},
+            },
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "IncrementalClumps":
+        """Resume from a checkpoint written by save()"""
+        state = _read_checkpoint(path, "clumps")
+        clumps = cls(state["k"], state["L"], state["t"])
+        clumps.contigs = {
+            name: _ContigClumps.from_state(clumps.k, clumps.L, clumps.t, contig)
+            for name, contig in state["contigs"].items()
+        }
+        return clumps
+
+
+if __name__ == "__main__":
+    # grow Vibrio cholerae 100 kb at a time, resuming from the checkpoint if there is one
+    checkpoint = "vibrio_clumps.json"
+    with open("datasets/Vibrio_cholerae.txt", "r") as file:
+        genome = file.read().strip().upper()
+
+    if os.path.exists(checkpoint):
+        clumps = IncrementalClumps.load(checkpoint)
+    else:
+        clumps = IncrementalClumps(9, 500, 3)
+    done = clumps.contigs["vibrio"].length if "vibrio" in clumps.contigs else 0
+
+    for start in range(done, len(genome), 100_000):
+        clumps.append("vibrio", genome[start : start + 100_000])
+        clumps.save(checkpoint)
+        print(f"{min(start + 100_000, len(genome))} bases: {clumps.count()} clump k-mers")
@@ -1,23 +1,7 @@
 #!/usr/bin/env python3
 
-
-def hamming_distance(g1: str, g2: str) -> int:
-    """
-    Calculate the hamming distance between two sequence strings
-
-    Args:
-        g1 (str): first sequence
-        g2 (str): second sequence
-
-    Returns:
-        int: difference/mismatches between both sequences
-    """
-    count = 0
-
-    if len(g1) != len(g2):
-        return -1
-
-    return sum(1 for i in range(len(g1)) if g1[i] != g2[i])
+from bioc import instrument
+from hammingDistance import hamming_distance_strings as hamming_distance
 
 
 def get_kmers(sequence: str, k: int) -> list:
@@ -98,31 +82,36 @@ def MotifEnumeration(dna: list, k: int, d: int) -> str:
     # get all k-mers from the first DNA string
     first_dna = dna[0]
     first_kmer = get_kmers(first_dna, k)
-
-    # iterate over each kmer in the first dna string
-    for pattern in first_kmer:
-        # generate all mismatch kmers neighbors
-        pattern_neighbors = neighbors(pattern, d)
-        # check if each nieghbor appears in every DNA string with at most "d" mismatches
-        for neighbor in pattern_neighbors:
-            appears_in_all = True  # assume neighbor appears in all DNA string
-            # check each DNA string
-            for dna_string in dna:
-                # get all k-mers in current dna string
-                dna_kmers = get_kmers(dna_string, k)
-                # check if any kmer in DNA string matches 'neighbor' with at most d mismatches
-                found = False
-                for dna_kmer in dna_kmers:
-                    if hamming_distance(neighbor, dna_kmer) <= d:
-                        found = True
+    generated = 0
+
+    with instrument.stage("motif_search"):
+        # iterate over each kmer in the first dna string
+        for pattern in first_kmer:
+            # generate all mismatch kmers neighbors
+            pattern_neighbors = neighbors(pattern, d)
+            generated += len(pattern_neighbors)
+            # check if each nieghbor appears in every DNA string with at most "d" mismatches
+            for neighbor in pattern_neighbors:
+                appears_in_all = True  # assume neighbor appears in all DNA string
+                # check each DNA string
+                for dna_string in dna:
+                    # get all k-mers in current dna string
+                    dna_kmers = get_kmers(dna_string, k)
+                    # check if any kmer in DNA string matches 'neighbor' with at most d mismatches
+                    found = False
+                    for dna_kmer in dna_kmers:
+                        if hamming_distance(neighbor, dna_kmer) <= d:
+                            found = True
+                            break
+                    # if the neighbor does not appear in all DNA strings, not a valid motif
+                    if not found:
+                        appears_in_all = False
                         break
-                # if the neighbor does not appear in all DNA strings, not a valid motif
-                if not found:
-                    appears_in_all = False
-                    break
-            # if neighbor appears in all DNA strings, valid motif
-            if appears_in_all:
-                patterns.add(neighbor)
+                # if neighbor appears in all DNA strings, valid motif
+                if appears_in_all:
+                    patterns.add(neighbor)
+    instrument.count("kmers", len(first_kmer))
+    instrument.count("neighbors", generated)
 
     return patterns
 
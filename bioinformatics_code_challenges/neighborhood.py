@@ -1,24 +1,3 @@
-def hamming_distance_strings(str1: str, str2: str) -> int:
-    """
-    Calculate hamming distance between two strings of equal length
-
-    Args:
-        str1 (str): First string
-        str2 (str): Second string
-
-    Returns:
-        int: Hamming distance between the strings
-    """
-    if len(str1) != len(str2):
-        return -1
-    return sum(1 for i in range(len(str1)) if str1[i] != str2[i])
-
-    # ham_dist = 0
-    # for i in range(len(str1)):
-    #     if str1[i] != str2[i]:
-    #         ham_dist += 1
-    # return ham_dist
-
 # def neighborhood(pattern: str, d: int) -> str:
 #     """
 #     Find all neighbors of a pattern with at most d mismatches
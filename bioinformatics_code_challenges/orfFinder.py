@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+START_CODONS = {"ATG", "GTG", "TTG"}
+STOP_CODONS = {"TAA", "TAG", "TGA"}
+
+
+def find_orfs(genome: str, min_length: int = 0) -> list:
+    """
+    Find open reading frames in the three forward frames of a DNA sequence
+
+    An ORF runs from a start codon up to (not including) the first in-frame
+    stop codon. Every start codon opens its own ORF, so nested ORFs sharing a
+    stop codon are all reported, as in sequence_analyzer's find_orf.
+
+    Args:
+        genome (str): DNA sequence
+        min_length (int): Minimum ORF length in bases
+
+    Returns:
+        list: dicts with sequence, start_position, length and frame (1-3)
+    """
+    genome = genome.upper()
+    orfs = []
+
+    for frame in range(3):
+        # starts seen since the last stop codon in this frame
+        open_starts = []
+        for i in range(frame, len(genome) - 2, 3):
+            codon = genome[i : i + 3]
+            if codon in STOP_CODONS:
+                for start in open_starts:
+                    if i - start >= max(min_length, 3):
+                        orfs.append(
+                            {
+                                "sequence": genome[start:i],
+                                "start_position": start,
+                                "length": i - start,
+                                "frame": frame + 1,
+                            }
+                        )
+                open_starts = []
+            elif codon in START_CODONS:
+                open_starts.append(i)
+
+    return orfs
+
+
+if __name__ == "__main__":
+    print(find_orfs("ATGGCCATTGTAATGGGCCGCTGAAAGGGTGCCCGATAG"))
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+"""
+Sharded approximate pattern matching.
+
+The genome is copied once into a shared memory block and split into chunks
+that overlap by len(pattern) - 1 bases, so no occurrence is lost at a chunk
+border. Each worker attaches to the shared block by name (the sequence itself
+is never pickled), scans its chunk and sends back either its positions or
+just its count.
+"""
+
+import os
+from multiprocessing import Pool, shared_memory
+
+from approxMatching import hamming_distance_strings
+from bioc import instrument
+from bioc.genome import Genome
+
+# shared genome block, attached once per worker process
+_shared_genome = None
+
+
+def _attach_genome(name: str) -> None:
+    """
+    Pool initializer: attach a worker to the shared genome block
+
+    Args:
+        name (str): name of the shared memory block holding the genome
+    """
+    global _shared_genome
+    _shared_genome = shared_memory.SharedMemory(name=name)
+
+
+def _scan_chunk(task: tuple):
+    """
+    Scan one chunk of the shared genome for approximate pattern occurrences
+
+    Args:
+        task (tuple): (pattern, d, start, stop, count_only) where start/stop
+            bound the window start positions owned by this chunk
+
+    Returns:
+        list | int: genome positions of the occurrences, or their count
+    """
+    pattern, d, start, stop, count_only = task
+    k = len(pattern)
+
+    # copy out only this chunk plus the k - 1 overlap into the next one
+    chunk = bytes(_shared_genome.buf[start : stop + k - 1]).decode("ascii")
+
+    if count_only:
+        return sum(
+            1
+            for i in range(stop - start)
+            if hamming_distance_strings(pattern, chunk[i : i + k]) <= d
+        )
+
+    return [
+        start + i
+        for i in range(stop - start)
+        if hamming_distance_strings(pattern, chunk[i : i + k]) <= d
+    ]
+
+
+def _chunk_bounds(n_windows: int, chunk_size: int) -> list:
+    """
+    Split window start positions 0..n_windows-1 into contiguous chunks
+
+    Args:
+        n_windows (int): number of window start positions in the genome
+        chunk_size (int): number of window starts per chunk
+
+    Returns:
+        list: (start, stop) pairs covering every window start exactly once
+    """
+    return [
+        (start, min(start + chunk_size, n_windows))
+        for start in range(0, n_windows, chunk_size)
+    ]
+
+
+def _run_sharded(
+    pattern: str,
+    genome: str,
+    d: int,
+    workers: int,
+    chunk_size: int,
+    count_only: bool,
+) -> list:
+    """
+    Share the genome, fan the chunks out over a process pool and collect the
+    per-chunk results in genome order
+    """
+    k = len(pattern)
+    n_windows = len(genome) - k + 1
+    if k == 0 or n_windows <= 0:
+        return []
+
+    workers = workers or os.cpu_count() or 1
+    # a few chunks per worker keeps the pool busy when chunks finish unevenly
+    chunk_size = chunk_size or max(1, -(-n_windows // (workers * 4)))
+    tasks = [
+        (pattern, d, start, stop, count_only)
+        for start, stop in _chunk_bounds(n_windows, chunk_size)
+    ]
+
+    shm = shared_memory.SharedMemory(create=True, size=len(genome))
+    try:
+        if isinstance(genome, Genome):
+            # copied a chunk at a time, the genome is never held as one str
+            for start, bases in genome.chunks():
+                shm.buf[start : start + len(bases)] = bases.tobytes()
+        else:
+            shm.buf[: len(genome)] = genome.encode("ascii")
+        with instrument.stage("sharded_scan"), Pool(
+            workers, initializer=_attach_genome, initargs=(shm.name,)
+        ) as pool:
+            # imap keeps chunk order, so the merged positions stay sorted
+            results = list(pool.imap(_scan_chunk, tasks))
+        instrument.count("bases", len(genome))
+        instrument.count("windows", n_windows)
+        instrument.count("chunks", len(tasks))
+        return results
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def ShardedApproxPatternMatching(
+    pattern: str,
+    genome: str,
+    d: int,
+    workers: int = None,
+    chunk_size: int = None,
+) -> list:
+    """
+    Find all approximate occurrences of a pattern in a genome with at most d
+    mismatches, scanning genome chunks in parallel
+
+    Args:
+        pattern (str): Pattern to search for
+        genome (str | Genome): Genome sequence to search in
+        d (int): Maximum number of mismatches allowed
+        workers (int): Number of worker processes (default: all cores)
+        chunk_size (int): Window start positions per chunk (default: about
+            four chunks per worker)
+
+    Returns:
+        list: Sorted starting positions where pattern appears with at most d mismatches
+    """
+    positions = []
+    for chunk_positions in _run_sharded(
+        pattern, genome, d, workers, chunk_size, count_only=False
+    ):
+        positions.extend(chunk_positions)
+    return positions
+
+
+def ShardedApproxPatternCount(
+    pattern: str,
+    genome: str,
+    d: int,
+    workers: int = None,
+    chunk_size: int = None,
+) -> int:
+    """
+    Count approximate occurrences of a pattern in a genome with at most d
+    mismatches. Workers only return counts, no position lists are built.
+
+    Args:
+        pattern (str): Pattern to search for
+        genome (str | Genome): Genome sequence to search in
+        d (int): Maximum number of mismatches allowed
+        workers (int): Number of worker processes (default: all cores)
+        chunk_size (int): Window start positions per chunk
+
+    Returns:
+        int: Number of approximate occurrences
+    """
+    return sum(_run_sharded(pattern, genome, d, workers, chunk_size, count_only=True))
+
+
+if __name__ == "__main__":
+    with open("datasets/ApproxMatching_dataset.txt", "r") as file:
+        lines = file.readlines()
+
+    pattern = lines[0].strip()
+    genome = lines[1].strip()
+    d = int(lines[2].strip())
+
+    positions = ShardedApproxPatternMatching(pattern, genome, d)
+    print(" ".join(str(pos) for pos in positions))
+    print(f"Occurrences: {ShardedApproxPatternCount(pattern, genome, d)}")
@@ -0,0 +1,83 @@
+"""
+Benchmark loading bioactivity data from CSV vs the Parquet dataset.
+
+A synthetic export is built by repeating the rows of
+influenza_ha_bioactivity.csv with fresh IDs, values and a mix of
+standard types, then converted with columnar.convert():
+
+    python benchmark_columnar.py --rows 1000000
+
+Reported per method: load time and memory of the resulting DataFrame.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import columnar
+from bioactivity import COLUMNS
+
+STANDARD_TYPES = ['IC50', 'Ki', 'EC50', 'Inhibition', 'Kd']
+
+
+def synthetic_export(template: str, rows: int, path: str, seed: int = 0):
+    """Write a ChEMBL-like CSV of the given size based on the template rows"""
+    rng = np.random.default_rng(seed)
+    base = pd.read_csv(template)
+    frame = base.iloc[np.arange(rows) % len(base)].reset_index(drop=True)
+    frame['activity_id'] = np.arange(rows) + 1
+    frame['record_id'] = np.arange(rows) + 1
+    frame['molecule_chembl_id'] = [f'CHEMBL{i}' for i in rng.integers(1, rows, rows)]
+    frame['parent_molecule_chembl_id'] = frame['molecule_chembl_id']
+    frame['standard_value'] = np.round(10 ** rng.uniform(0, 5, rows), 2)
+    frame['standard_type'] = rng.choice(STANDARD_TYPES, rows, p=[0.5, 0.2, 0.15, 0.1, 0.05])
+    frame.to_csv(path, index=False)
+
+
+def measure(label: str, load):
+    start = time.perf_counter()
+    frame = load()
+    elapsed = time.perf_counter() - start
+    memory = frame.memory_usage(deep=True).sum() / 1e6
+    print(f"{label:45} {elapsed:8.2f}s {memory:10.1f} MB {len(frame):>10,} rows")
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV vs Parquet load benchmark")
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--template', default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                           'influenza_ha_bioactivity.csv'))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = os.path.join(workdir, 'activities.csv')
+        parquet_path = os.path.join(workdir, 'activities_parquet')
+        synthetic_export(args.template, args.rows, csv_path)
+
+        start = time.perf_counter()
+        columnar.convert(csv_path, parquet_path)
+        convert_s = time.perf_counter() - start
+        parquet_bytes = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, files in os.walk(parquet_path) for name in files
+        )
+        print(f"CSV {os.path.getsize(csv_path) / 1e6:.1f} MB -> Parquet {parquet_bytes / 1e6:.1f} MB "
+              f"(converted in {convert_s:.2f}s)")
+        print(f"{'method':45} {'time':>9} {'memory':>13} {'rows':>15}")
+
+        measure("CSV, all columns", lambda: pd.read_csv(csv_path, low_memory=False))
+        measure("CSV, usecols + filter IC50", lambda: (
+            lambda frame: frame[frame['standard_type'] == 'IC50']
+        )(pd.read_csv(csv_path, usecols=COLUMNS + ['standard_type'])))
+        measure("Parquet, all columns", lambda: columnar.open_dataset(parquet_path).to_table().to_pandas())
+        measure("Parquet, 4 columns, standard_type == IC50",
+                lambda: columnar.load(parquet_path, standard_type='IC50'))
+
+
+if __name__ == "__main__":
+    main()
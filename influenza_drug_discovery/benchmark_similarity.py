@@ -0,0 +1,98 @@
+"""
+Benchmark SimilarityIndex against an unpruned vectorized scan.
+
+Fingerprints are synthetic, with bit counts spread like Morgan/ECFP4
+fingerprints of drug-like molecules (roughly 20-90 of 2048 bits set).
+Results of the pruned search are checked against the full scan:
+
+    python benchmark_similarity.py --sizes 100000 1000000
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from similarity import SimilarityIndex, popcount
+
+
+def random_fingerprints(n: int, n_bits: int = 2048, seed: int = 0) -> np.ndarray:
+    """Packed uint8 fingerprints with Morgan-like bit densities"""
+    rng = np.random.default_rng(seed)
+    counts = np.clip(rng.normal(50, 15, n), 10, 120).astype(np.int64)
+    fingerprints = np.zeros((n, n_bits // 8), dtype=np.uint8)
+    # set bits in chunks to keep the boolean matrix small
+    for start in range(0, n, 10000):
+        stop = min(start + 10000, n)
+        bits = rng.random((stop - start, n_bits)) < (counts[start:stop, None] / n_bits)
+        fingerprints[start:stop] = np.packbits(bits, axis=1)
+    return fingerprints
+
+
+def brute_force(words: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Tanimoto of the query against every row, no pruning"""
+    intersection = popcount(words & query)
+    union = popcount(query) + popcount(words) - intersection
+    return np.divide(intersection, union, out=np.zeros(len(words)), where=union > 0)
+
+
+def time_queries(function, queries: list) -> float:
+    """Mean milliseconds per query"""
+    start = time.perf_counter()
+    for query in queries:
+        function(query)
+    return (time.perf_counter() - start) / len(queries) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Tanimoto similarity search")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--threshold', type=float, default=0.7)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        fingerprints = random_fingerprints(n)
+        # queries are perturbed library members, so real neighbours exist
+        rng = np.random.default_rng(1)
+        queries = []
+        for row in rng.choice(n, args.queries, replace=False):
+            bits = np.unpackbits(fingerprints[row])
+            flip = rng.choice(len(bits), 5, replace=False)
+            bits[flip] ^= 1
+            queries.append(np.packbits(bits).view(np.uint64))
+
+        start = time.perf_counter()
+        index = SimilarityIndex(fingerprints)
+        build_s = time.perf_counter() - start
+        words = fingerprints.view(np.uint64)
+
+        # correctness against the full scan
+        for query in queries:
+            scores = brute_force(words, query)
+            _, top_scores = index.top_k(query, args.k)
+            assert np.allclose(np.sort(scores)[::-1][:args.k], top_scores)
+            _, hit_scores = index.threshold(query, args.threshold)
+            assert len(hit_scores) == int((scores >= args.threshold).sum())
+
+        brute_ms = time_queries(lambda query: np.argpartition(-brute_force(words, query), args.k), queries)
+        top_k_ms = time_queries(lambda query: index.top_k(query, args.k), queries)
+        threshold_ms = time_queries(lambda query: index.threshold(query, args.threshold), queries)
+
+        with tempfile.TemporaryDirectory() as path:
+            index.save(path)
+            mapped = SimilarityIndex.load(path)
+            mapped_ms = time_queries(lambda query: mapped.top_k(query, args.k), queries)
+            del mapped
+
+        print(
+            f"n={n:>9,}  {fingerprints.nbytes / 1e6:7.1f} MB  build {build_s:6.2f}s  "
+            f"full scan {brute_ms:8.2f} ms  top-{args.k} {top_k_ms:8.2f} ms  "
+            f"threshold {args.threshold} {threshold_ms:8.2f} ms  top-{args.k} (mmap) {mapped_ms:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Bioactivity preprocessing for the influenza HA dataset.
+
+Packages the data-preparation cells of bioactivity_data.ipynb: drop rows
+without a standard_value, label each compound as active (<= 1000 nM),
+inactive (>= 10000 nM) or intermediate, and keep one row per molecule.
+
+Only the needed columns are read, with compact dtypes, and labelling is a
+single vectorized np.select. Large ChEMBL exports can be processed in
+chunks, deduplicating across chunks:
+
+    python bioactivity.py influenza_ha_bioactivity.csv --out bioactivity_data.csv --chunksize 1000000
+"""
+
+import argparse
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ['molecule_chembl_id', 'canonical_smiles', 'standard_value']
+DTYPES = {
+    'molecule_chembl_id': 'object',
+    'canonical_smiles': 'object',
+    'standard_value': 'float32',
+    'standard_type': 'category',
+}
+
+ACTIVE_NM = 1000
+INACTIVE_NM = 10000
+BIOACTIVITY_CLASSES = pd.CategoricalDtype(['active', 'intermediate', 'inactive'])
+
+
+def label_bioactivity(standard_value: pd.Series) -> pd.Series:
+    """
+    Label standard values (nM) as active, intermediate or inactive.
+
+    Args:
+        standard_value (pd.Series): IC50 values in nM
+
+    Returns:
+        pd.Series: Categorical bioactivity_class
+    """
+    values = standard_value.to_numpy()
+    labels = np.select(
+        [values >= INACTIVE_NM, values <= ACTIVE_NM],
+        ['inactive', 'active'],
+        default='intermediate',
+    )
+    return pd.Series(labels, index=standard_value.index, dtype=BIOACTIVITY_CLASSES)
+
+
+def clean_bioactivity(frame: pd.DataFrame, standard_type: str = None) -> pd.DataFrame:
+    """
+    Drop missing values, label and deduplicate one frame of activity records.
+
+    Args:
+        frame (pd.DataFrame): Activity records with at least COLUMNS
+        standard_type (str): Keep only this activity type (e.g. 'IC50')
+
+    Returns:
+        pd.DataFrame: molecule_chembl_id, canonical_smiles, standard_value,
+            bioactivity_class; one row per molecule (first occurrence kept)
+    """
+    if standard_type is not None:
+        frame = frame[frame['standard_type'] == standard_type]
+    frame = frame.loc[frame['standard_value'].notna(), COLUMNS]
+    frame = frame.drop_duplicates('molecule_chembl_id')
+    return frame.assign(bioactivity_class=label_bioactivity(frame['standard_value']))
+
+
+def iter_bioactivity(path: str, chunksize: int = 1_000_000, standard_type: str = None):
+    """
+    Yield cleaned chunks of a (possibly huge) ChEMBL activity CSV.
+
+    A molecule is only emitted the first time it is seen in any chunk.
+
+    Args:
+        path (str): CSV exported from ChEMBL
+        chunksize (int): Rows read per chunk
+        standard_type (str): Keep only this activity type
+
+    Yields:
+        pd.DataFrame: Cleaned chunk (see clean_bioactivity)
+    """
+    usecols = COLUMNS + (['standard_type'] if standard_type is not None else [])
+    dtypes = {column: DTYPES[column] for column in usecols}
+    seen = set()
+
+    for chunk in pd.read_csv(path, usecols=usecols, dtype=dtypes, chunksize=chunksize):
+        cleaned = clean_bioactivity(chunk, standard_type)
+        cleaned = cleaned[~cleaned['molecule_chembl_id'].isin(seen)]
+        seen.update(cleaned['molecule_chembl_id'])
+        yield cleaned
+
+
+def load_bioactivity(path: str, chunksize: int = None, standard_type: str = None) -> pd.DataFrame:
+    """
+    Read and clean a ChEMBL activity CSV.
+
+    Args:
+        path (str): CSV exported from ChEMBL (e.g. influenza_ha_bioactivity.csv)
+        chunksize (int): Read in chunks of this many rows (None reads at once)
+        standard_type (str): Keep only this activity type
+
+    Returns:
+        pd.DataFrame: molecule_chembl_id, canonical_smiles, standard_value, bioactivity_class
+    """
+    if chunksize is None:
+        usecols = COLUMNS + (['standard_type'] if standard_type is not None else [])
+        frame = pd.read_csv(path, usecols=usecols, dtype={column: DTYPES[column] for column in usecols})
+        return clean_bioactivity(frame, standard_type).reset_index(drop=True)
+
+    chunks = list(iter_bioactivity(path, chunksize, standard_type))
+    return pd.concat(chunks, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Label and deduplicate ChEMBL bioactivity data")
+    parser.add_argument('path', help="ChEMBL activity CSV")
+    parser.add_argument('--out', help="Write the cleaned table to this CSV file")
+    parser.add_argument('--chunksize', type=int, help="Process the CSV in chunks of this many rows")
+    parser.add_argument('--standard-type', help="Keep only this activity type (e.g. IC50)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.out and args.chunksize:
+        # stream chunks straight to the output file
+        total = 0
+        for i, chunk in enumerate(iter_bioactivity(args.path, args.chunksize, args.standard_type)):
+            chunk.to_csv(args.out, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+            total += len(chunk)
+        print(f"{total} molecules written to {args.out}")
+        return
+
+    bioactivity_data = load_bioactivity(args.path, args.chunksize, args.standard_type)
+    print(bioactivity_data['bioactivity_class'].value_counts().to_string())
+    if args.out:
+        bioactivity_data.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Cached ChEMBL bioactivity loader.
+
+Replaces the live chembl_webresource_client queries in bioactivity_data.ipynb.
+Activity records are fetched from the ChEMBL REST API with concurrent page
+requests and stored in a local SQLite file, keyed by target and query.
+Later runs are served from that file and only ask the API for records
+newer than the last activity_id seen (delta fetch):
+
+    python chembl_loader.py CHEMBL4918 --standard-type IC50 --out influenza_ha_bioactivity.csv
+
+Targets are chosen by ChEMBL ID (CHEMBL4918 is Influenza A virus
+Hemagglutinin) rather than by position in a search result.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = 'https://www.ebi.ac.uk/chembl/api/data'
+HA_TARGET = 'CHEMBL4918'
+# largest page the ChEMBL API serves
+MAX_PAGE_SIZE = 1000
+
+
+def query_hash(params: dict) -> str:
+    """Stable hash of a query's filter parameters"""
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+
+def _get(session: requests.Session, url: str, params: dict, retries: int = 3, timeout: float = 60) -> dict:
+    """GET a JSON page, retrying connection errors and 5xx responses with backoff"""
+    for attempt in range(retries):
+        try:
+            response = session.get(url, params=params, timeout=timeout)
+            if response.status_code < 500:
+                response.raise_for_status()
+                return response.json()
+            error = requests.HTTPError(f"{response.status_code} from {url}")
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+        logger.warning(f"Request failed ({error}), attempt {attempt + 1} of {retries}")
+        time.sleep(2 ** attempt)
+    raise error
+
+
+def search_targets(query: str, base_url: str = BASE_URL) -> pd.DataFrame:
+    """
+    Search ChEMBL targets by keyword, e.g. search_targets('influenza').
+
+    Returns:
+        pd.DataFrame: One row per target, with target_chembl_id and pref_name
+    """
+    with requests.Session() as session:
+        page = _get(session, f'{base_url}/target/search.json', {'q': query, 'limit': MAX_PAGE_SIZE})
+    return pd.DataFrame.from_records(page['targets'])
+
+
+class ActivityCache:
+    """
+    SQLite store of ChEMBL activity records.
+
+    Records are kept per query (target plus filters), so different filters
+    on the same target never mix.
+
+    Args:
+        path (str): SQLite file
+    """
+
+    def __init__(self, path: str = 'chembl_cache.sqlite'):
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS queries ("
+            "query_hash TEXT PRIMARY KEY, target TEXT, params TEXT, max_activity_id INTEGER, fetched REAL)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS activities ("
+            "query_hash TEXT, activity_id INTEGER, record TEXT, PRIMARY KEY (query_hash, activity_id))"
+        )
+        self.db.commit()
+
+    def last_activity_id(self, key: str):
+        """Highest activity_id stored for a query, or None if it was never fetched"""
+        row = self.db.execute("SELECT max_activity_id FROM queries WHERE query_hash = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def store(self, key: str, target: str, params: dict, records: list):
+        """Add records for a query and advance its delta marker"""
+        self.db.executemany(
+            "INSERT OR REPLACE INTO activities VALUES (?, ?, ?)",
+            [(key, record['activity_id'], json.dumps(record)) for record in records],
+        )
+        max_id = self.db.execute(
+            "SELECT MAX(activity_id) FROM activities WHERE query_hash = ?", (key,)
+        ).fetchone()[0]
+        self.db.execute(
+            "INSERT OR REPLACE INTO queries VALUES (?, ?, ?, ?, ?)",
+            (key, target, json.dumps(params, sort_keys=True), max_id or 0, time.time()),
+        )
+        self.db.commit()
+
+    def load(self, key: str) -> pd.DataFrame:
+        """All stored records of a query, ordered by activity_id"""
+        rows = self.db.execute(
+            "SELECT record FROM activities WHERE query_hash = ? ORDER BY activity_id", (key,)
+        ).fetchall()
+        return pd.DataFrame.from_records([json.loads(row[0]) for row in rows])
+
+    def clear(self, key: str):
+        self.db.execute("DELETE FROM activities WHERE query_hash = ?", (key,))
+        self.db.execute("DELETE FROM queries WHERE query_hash = ?", (key,))
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+def fetch_pages(params: dict, base_url: str = BASE_URL, page_size: int = MAX_PAGE_SIZE, workers: int = 4) -> list:
+    """
+    Fetch every activity record matching params.
+
+    The first page gives the total count; the remaining pages are then
+    requested concurrently. Results are ordered by activity_id so that
+    offsets stay stable across pages. requests.Session is not thread-safe,
+    so every worker thread uses its own.
+
+    Args:
+        params (dict): ChEMBL filter parameters (e.g. target_chembl_id, standard_type)
+        base_url (str): ChEMBL API root
+        page_size (int): Records per request (at most 1000)
+        workers (int): Concurrent page requests
+
+    Returns:
+        list: Activity records (dicts)
+    """
+    url = f'{base_url}/activity.json'
+    page_size = min(page_size, MAX_PAGE_SIZE)
+    query = {**params, 'order_by': 'activity_id', 'limit': page_size}
+
+    local = threading.local()
+    sessions = []
+
+    def get_page(offset: int) -> dict:
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+            sessions.append(local.session)
+        return _get(local.session, url, {**query, 'offset': offset})
+
+    try:
+        first = get_page(0)
+        records = list(first['activities'])
+        total = first['page_meta']['total_count']
+        offsets = range(page_size, total, page_size)
+        logger.info(f"{total} records, {len(offsets) + 1} pages")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for page in executor.map(get_page, offsets):
+                records.extend(page['activities'])
+    finally:
+        for session in sessions:
+            session.close()
+    return records
+
+
+def load_activities(target_chembl_id: str = HA_TARGET, standard_type: str = 'IC50',
+                    cache_path: str = 'chembl_cache.sqlite', refresh: bool = False, offline: bool = False,
+                    base_url: str = BASE_URL, page_size: int = MAX_PAGE_SIZE, workers: int = 4) -> pd.DataFrame:
+    """
+    Bioactivity records for a target, served from the local cache when possible.
+
+    The first call downloads everything. Later calls only request records
+    with activity_id above the highest one already cached.
+
+    Args:
+        target_chembl_id (str): ChEMBL target ID
+        standard_type (str): Activity type filter (None for all types)
+        cache_path (str): SQLite cache file
+        refresh (bool): Drop the cached records for this query and download again
+        offline (bool): Never touch the network; return whatever is cached
+        base_url (str): ChEMBL API root
+        page_size (int): Records per request
+        workers (int): Concurrent page requests
+
+    Returns:
+        pd.DataFrame: One row per activity record, same columns as the ChEMBL API
+    """
+    params = {'target_chembl_id': target_chembl_id}
+    if standard_type:
+        params['standard_type'] = standard_type
+    key = query_hash(params)
+
+    cache = ActivityCache(cache_path)
+    try:
+        if refresh:
+            cache.clear(key)
+        last_id = cache.last_activity_id(key)
+
+        if offline:
+            if last_id is None:
+                logger.warning(f"No cached records for {params}")
+        else:
+            delta = dict(params)
+            if last_id is not None:
+                delta['activity_id__gt'] = last_id
+            records = fetch_pages(delta, base_url, page_size, workers)
+            cache.store(key, target_chembl_id, params, records)
+            if last_id is not None:
+                logger.info(f"Delta fetch: {len(records)} new records since activity_id {last_id}")
+
+        return cache.load(key)
+    finally:
+        cache.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download and cache ChEMBL bioactivity data")
+    parser.add_argument('target', nargs='?', default=HA_TARGET, help="ChEMBL target ID")
+    parser.add_argument('--standard-type', default='IC50', help="Activity type filter")
+    parser.add_argument('--cache', default='chembl_cache.sqlite', help="SQLite cache file")
+    parser.add_argument('--out', help="Write the records to this CSV file")
+    parser.add_argument('--refresh', action='store_true', help="Ignore the cache and download everything")
+    parser.add_argument('--offline', action='store_true', help="Only use cached records")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent page requests")
+    parser.add_argument('--base-url', default=BASE_URL)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    activities = load_activities(
+        args.target, args.standard_type, args.cache,
+        refresh=args.refresh, offline=args.offline, base_url=args.base_url, workers=args.workers,
+    )
+    print(f"{len(activities)} records for {args.target}")
+    if args.out:
+        activities.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
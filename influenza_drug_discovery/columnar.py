@@ -0,0 +1,190 @@
+"""
+Columnar (Parquet) storage for ChEMBL bioactivity exports.
+
+influenza_ha_bioactivity.csv carries ~45 wide text columns, and reading
+it means parsing all of them to use four. convert() streams a CSV into a
+Parquet dataset partitioned by target and standard_type (hive layout):
+
+- numeric columns get real types (standard_value, pchembl_value, ...)
+- ligand_efficiency strings are parsed into le/lle/bei/sei float columns
+- repetitive strings (assay descriptions, units, organism...) are
+  dictionary-encoded
+
+load() then reads only the requested columns and partitions, e.g. just
+the IC50 rows of four columns:
+
+    python columnar.py convert influenza_ha_bioactivity.csv bioactivity_parquet
+    python columnar.py load bioactivity_parquet --standard-type IC50
+"""
+
+import argparse
+import csv
+import logging
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_COLUMNS = {
+    'activity_id': pa.int64(),
+    'document_year': pa.int16(),
+    'pchembl_value': pa.float32(),
+    'potential_duplicate': pa.int8(),
+    'record_id': pa.int64(),
+    'src_id': pa.int32(),
+    'standard_flag': pa.int8(),
+    'standard_upper_value': pa.float64(),
+    'standard_value': pa.float64(),
+    'target_tax_id': pa.int64(),
+    'upper_value': pa.float64(),
+    'value': pa.float64(),
+}
+# unique per row; dictionary encoding would only add overhead
+PLAIN_STRING_COLUMNS = {'canonical_smiles', 'molecule_chembl_id', 'parent_molecule_chembl_id'}
+LIGAND_EFFICIENCY = ('bei', 'le', 'lle', 'sei')
+PARTITION_COLUMNS = ('target_chembl_id', 'standard_type')
+# what the notebook and bioactivity.py actually use
+ANALYSIS_COLUMNS = ['molecule_chembl_id', 'canonical_smiles', 'standard_value', 'standard_units']
+
+
+def _read_header(path: str) -> list:
+    with open(path, newline='') as file:
+        return next(csv.reader(file))
+
+
+def _convert_batch(batch: pa.RecordBatch) -> pa.RecordBatch:
+    """Parse ligand efficiency and dictionary-encode repetitive strings"""
+    columns, names = [], []
+    for name, column in zip(batch.schema.names, batch.columns):
+        if name == 'ligand_efficiency':
+            # values look like "{'bei': '14.75', 'le': '0.31', 'lle': '2.37', 'sei': '8.37'}"
+            for key in LIGAND_EFFICIENCY:
+                extracted = pc.extract_regex(column, pattern=f"'{key}': '(?P<v>[-0-9.eE]+)'")
+                values = pc.struct_field(extracted, [0])
+                columns.append(pc.cast(values, pa.float32()))
+                names.append(f'ligand_efficiency_{key}')
+            continue
+        if pa.types.is_string(column.type) and name not in PLAIN_STRING_COLUMNS and name not in PARTITION_COLUMNS:
+            column = pc.dictionary_encode(column)
+        columns.append(column)
+        names.append(name)
+    return pa.RecordBatch.from_arrays(columns, names=names)
+
+
+def convert(csv_path: str, out_dir: str, block_size: int = 64 << 20) -> int:
+    """
+    Stream a ChEMBL activity CSV into a partitioned Parquet dataset.
+
+    Args:
+        csv_path (str): CSV export (e.g. influenza_ha_bioactivity.csv)
+        out_dir (str): Output dataset directory
+        block_size (int): Bytes of CSV parsed per batch
+
+    Returns:
+        int: Number of rows written
+    """
+    header = _read_header(csv_path)
+    # every non-numeric column is read as string, so an all-empty first block
+    # can't give a column a different type than later blocks
+    column_types = {name: NUMERIC_COLUMNS.get(name, pa.string()) for name in header}
+    reader = pa_csv.open_csv(
+        csv_path,
+        read_options=pa_csv.ReadOptions(block_size=block_size),
+        convert_options=pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True),
+    )
+
+    try:
+        first = _convert_batch(reader.read_next_batch())
+    except StopIteration:
+        raise ValueError(f"{csv_path} has no data rows")
+    schema = first.schema
+    rows = 0
+
+    def batches():
+        nonlocal rows
+        batch = first
+        while True:
+            rows += batch.num_rows
+            yield batch
+            try:
+                batch = _convert_batch(reader.read_next_batch())
+            except StopIteration:
+                return
+
+    ds.write_dataset(
+        batches(),
+        out_dir,
+        schema=schema,
+        format='parquet',
+        partitioning=ds.partitioning(
+            pa.schema([schema.field(name) for name in PARTITION_COLUMNS]), flavor='hive'
+        ),
+        existing_data_behavior='delete_matching',
+    )
+    logger.info(f"Wrote {rows} rows to {out_dir}")
+    return rows
+
+
+def open_dataset(path: str) -> ds.Dataset:
+    """Open a dataset written by convert()"""
+    return ds.dataset(path, format='parquet', partitioning='hive')
+
+
+def load(path: str, columns: list = None, standard_type: str = None, target_chembl_id: str = None,
+         filter_expression=None):
+    """
+    Read selected columns and rows of a bioactivity Parquet dataset.
+
+    Partition filters (standard_type, target_chembl_id) skip whole
+    directories; other filters are pushed down to Parquet row groups.
+
+    Args:
+        path (str): Dataset directory written by convert()
+        columns (list): Columns to read (default: ANALYSIS_COLUMNS)
+        standard_type (str): Keep only this activity type, e.g. 'IC50'
+        target_chembl_id (str): Keep only this target
+        filter_expression: Extra pyarrow.dataset expression, e.g.
+            ds.field('standard_value') < 1000
+
+    Returns:
+        pd.DataFrame: Dictionary columns come back as pandas categoricals
+    """
+    expression = filter_expression
+    for name, value in (('standard_type', standard_type), ('target_chembl_id', target_chembl_id)):
+        if value is not None:
+            condition = ds.field(name) == value
+            expression = condition if expression is None else expression & condition
+
+    table = open_dataset(path).to_table(columns=columns or ANALYSIS_COLUMNS, filter=expression)
+    return table.to_pandas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar storage for ChEMBL bioactivity data")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    convert_parser = subparsers.add_parser('convert', help="CSV to partitioned Parquet")
+    convert_parser.add_argument('csv', help="ChEMBL activity CSV")
+    convert_parser.add_argument('out', help="Output dataset directory")
+
+    load_parser = subparsers.add_parser('load', help="Read columns/rows from a dataset")
+    load_parser.add_argument('path', help="Dataset directory")
+    load_parser.add_argument('--columns', nargs='+', help="Columns to read")
+    load_parser.add_argument('--standard-type', help="e.g. IC50")
+    load_parser.add_argument('--target', help="ChEMBL target ID")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == 'convert':
+        print(f"{convert(args.csv, args.out)} rows written to {args.out}")
+    else:
+        frame = load(args.path, args.columns, args.standard_type, args.target)
+        print(frame.to_string(max_rows=20))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Molecular descriptors and fingerprints for HA inhibitor candidates.
+
+For each unique canonical SMILES: Lipinski / rule-of-five properties and a
+Morgan fingerprint, stored bit-packed (np.packbits, 8 bits per byte) so
+100k compounds x 2048 bits take 25 MB instead of Python lists. Every SMILES
+is parsed once, chunks of molecules are spread over a process pool, and
+results are cached on disk keyed by SMILES hash so reruns only compute
+new molecules:
+
+    python descriptors.py bioactivity_data.csv --out bioactivity_descriptors.csv
+
+RDKit is optional at import time (pip install rdkit); it is only needed
+to compute molecules that are not cached yet.
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    from rdkit import Chem, RDLogger
+    from rdkit.Chem import Descriptors, Lipinski, rdFingerprintGenerator
+except ImportError:
+    Chem = None
+
+logger = logging.getLogger(__name__)
+
+DESCRIPTOR_COLUMNS = ['MW', 'LogP', 'NumHDonors', 'NumHAcceptors', 'Ro5Violations']
+# bytes in a SHA-1 digest (smiles_key)
+KEY_SIZE = 20
+# IC50 values above this (nM) are capped before the pIC50 conversion
+MAX_STANDARD_VALUE_NM = 1e8
+
+
+def pic50(standard_value: pd.Series) -> pd.Series:
+    """
+    Convert IC50 in nM to pIC50 = -log10(IC50 in M).
+
+    Values are capped at 1e8 nM so extreme entries don't produce negative pIC50.
+    """
+    molar = np.minimum(standard_value.to_numpy(dtype=np.float64), MAX_STANDARD_VALUE_NM) * 1e-9
+    return pd.Series(-np.log10(molar), index=standard_value.index, dtype=np.float32)
+
+
+def smiles_key(smiles: str) -> bytes:
+    """20-byte SHA-1 digest used as the cache key of a SMILES string"""
+    return hashlib.sha1(smiles.encode()).digest()
+
+
+def _compute_chunk(args: tuple) -> tuple:
+    """
+    Descriptors and packed fingerprints for a chunk of SMILES (runs in a worker).
+
+    Returns:
+        tuple: (float32 descriptors (n, 5), uint8 packed fingerprints (n, n_bits / 8))
+            Unparseable SMILES get NaN descriptors and an all-zero fingerprint.
+    """
+    smiles_list, radius, n_bits = args
+    RDLogger.DisableLog('rdApp.*')
+    generator = rdFingerprintGenerator.GetMorganGenerator(radius=radius, fpSize=n_bits)
+
+    descriptors = np.full((len(smiles_list), len(DESCRIPTOR_COLUMNS)), np.nan, dtype=np.float32)
+    fingerprints = np.zeros((len(smiles_list), n_bits // 8), dtype=np.uint8)
+    for i, smiles in enumerate(smiles_list):
+        mol = Chem.MolFromSmiles(smiles) if smiles else None
+        if mol is None:
+            continue
+        mw = Descriptors.MolWt(mol)
+        logp = Descriptors.MolLogP(mol)
+        donors = Lipinski.NumHDonors(mol)
+        acceptors = Lipinski.NumHAcceptors(mol)
+        violations = (mw > 500) + (logp > 5) + (donors > 5) + (acceptors > 10)
+        descriptors[i] = (mw, logp, donors, acceptors, violations)
+        fingerprints[i] = np.packbits(generator.GetFingerprintAsNumPy(mol))
+    return descriptors, fingerprints
+
+
+class DescriptorCache:
+    """
+    On-disk store of descriptors and packed fingerprints, keyed by SMILES hash.
+
+    One .npz file per fingerprint setting (radius, n_bits), rewritten when
+    new molecules are added. Keys are stored as an (n, 20) uint8 array: as
+    dtype 'S20', NumPy would strip digests ending in NUL bytes and they
+    would never match again.
+
+    Args:
+        cache_dir (str): Directory for the cache files
+        radius (int): Morgan radius
+        n_bits (int): Fingerprint length
+    """
+
+    def __init__(self, cache_dir: str, radius: int = 2, n_bits: int = 2048):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, f'descriptors_morgan{radius}_{n_bits}.npz')
+        self.n_bits = n_bits
+        if os.path.isfile(self.path):
+            with np.load(self.path) as data:
+                # caches written with 'S20' keys still hold all 20 bytes in their buffer
+                self.keys = np.ascontiguousarray(data['keys']).view(np.uint8).reshape(-1, KEY_SIZE)
+                self.descriptors = data['descriptors']
+                self.fingerprints = data['fingerprints']
+        else:
+            self.keys = np.zeros((0, KEY_SIZE), dtype=np.uint8)
+            self.descriptors = np.zeros((0, len(DESCRIPTOR_COLUMNS)), dtype=np.float32)
+            self.fingerprints = np.zeros((0, n_bits // 8), dtype=np.uint8)
+        self.index = {key.tobytes(): i for i, key in enumerate(self.keys)}
+
+    def lookup(self, keys: list) -> np.ndarray:
+        """Row of each key in the cache, -1 where missing"""
+        return np.array([self.index.get(key, -1) for key in keys], dtype=np.int64)
+
+    def add(self, keys: list, descriptors: np.ndarray, fingerprints: np.ndarray):
+        """Append new entries and write the cache file"""
+        start = len(self.keys)
+        new_keys = np.frombuffer(b''.join(keys), dtype=np.uint8).reshape(-1, KEY_SIZE)
+        self.keys = np.concatenate([self.keys, new_keys])
+        self.descriptors = np.concatenate([self.descriptors, descriptors])
+        self.fingerprints = np.concatenate([self.fingerprints, fingerprints])
+        self.index.update((key, start + i) for i, key in enumerate(keys))
+        # write to a temporary file first so an interrupted run can't corrupt the cache
+        temp_path = self.path + '.tmp.npz'
+        np.savez(temp_path, keys=self.keys, descriptors=self.descriptors, fingerprints=self.fingerprints)
+        os.replace(temp_path, self.path)
+
+
+def compute_descriptors(smiles, radius: int = 2, n_bits: int = 2048, workers: int = None,
+                        chunk_size: int = 1000, cache_dir: str = '.descriptor_cache') -> tuple:
+    """
+    Descriptors and packed Morgan fingerprints for a list of SMILES.
+
+    Duplicate SMILES are computed once; cached molecules are not computed
+    at all.
+
+    Args:
+        smiles: Sequence of SMILES strings (list or pd.Series)
+        radius (int): Morgan radius (2 is ECFP4-like)
+        n_bits (int): Fingerprint length, a multiple of 64
+        workers (int): Worker processes (None for one per CPU)
+        chunk_size (int): Molecules per worker task
+        cache_dir (str): Cache directory (None to disable caching)
+
+    Returns:
+        tuple: (pd.DataFrame of DESCRIPTOR_COLUMNS, uint8 array (n, n_bits / 8)),
+            both row-aligned with smiles
+    """
+    if n_bits % 64:
+        raise ValueError(f"n_bits must be a multiple of 64, got {n_bits}")
+
+    smiles = pd.Series(smiles, dtype=object).fillna('').reset_index(drop=True)
+    codes, unique = pd.factorize(smiles)
+    keys = [smiles_key(s) for s in unique]
+
+    cache = DescriptorCache(cache_dir, radius, n_bits) if cache_dir else None
+    rows = cache.lookup(keys) if cache is not None else np.full(len(keys), -1, dtype=np.int64)
+    missing = np.flatnonzero(rows < 0)
+
+    descriptors = np.empty((len(unique), len(DESCRIPTOR_COLUMNS)), dtype=np.float32)
+    fingerprints = np.empty((len(unique), n_bits // 8), dtype=np.uint8)
+    hit = rows >= 0
+    if cache is not None:
+        descriptors[hit] = cache.descriptors[rows[hit]]
+        fingerprints[hit] = cache.fingerprints[rows[hit]]
+    logger.info(f"{len(smiles)} SMILES, {len(unique)} unique, {len(missing)} to compute")
+
+    if len(missing):
+        if Chem is None:
+            raise ImportError("RDKit is required to compute descriptors: pip install rdkit")
+        todo = [unique[i] for i in missing]
+        chunks = [(todo[i:i + chunk_size], radius, n_bits) for i in range(0, len(todo), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_compute_chunk, chunks))
+        descriptors[missing] = np.concatenate([result[0] for result in results])
+        fingerprints[missing] = np.concatenate([result[1] for result in results])
+        if cache is not None:
+            cache.add([keys[i] for i in missing], descriptors[missing], fingerprints[missing])
+
+    frame = pd.DataFrame(descriptors[codes], columns=DESCRIPTOR_COLUMNS)
+    return frame, fingerprints[codes]
+
+
+def add_descriptors(bioactivity_data: pd.DataFrame, **kwargs) -> tuple:
+    """
+    Attach descriptors and pIC50 to a cleaned bioactivity table (see bioactivity.py).
+
+    Args:
+        bioactivity_data (pd.DataFrame): Table with canonical_smiles and standard_value
+        **kwargs: Passed to compute_descriptors
+
+    Returns:
+        tuple: (table with DESCRIPTOR_COLUMNS and pIC50 added, packed fingerprints)
+    """
+    frame, fingerprints = compute_descriptors(bioactivity_data['canonical_smiles'], **kwargs)
+    frame.index = bioactivity_data.index
+    combined = pd.concat([bioactivity_data, frame], axis=1)
+    combined['pIC50'] = pic50(bioactivity_data['standard_value'])
+    return combined, fingerprints
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute Lipinski descriptors, pIC50 and Morgan fingerprints")
+    parser.add_argument('path', help="Cleaned bioactivity CSV (see bioactivity.py)")
+    parser.add_argument('--out', help="Write the table with descriptors to this CSV file")
+    parser.add_argument('--fingerprints', help="Save packed fingerprints to this .npy file")
+    parser.add_argument('--radius', type=int, default=2)
+    parser.add_argument('--n-bits', type=int, default=2048)
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--cache-dir', default='.descriptor_cache')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    bioactivity_data = pd.read_csv(args.path)
+    table, fingerprints = add_descriptors(
+        bioactivity_data, radius=args.radius, n_bits=args.n_bits, workers=args.workers, cache_dir=args.cache_dir
+    )
+    print(table.head().to_string())
+    if args.out:
+        table.to_csv(args.out, index=False)
+    if args.fingerprints:
+        np.save(args.fingerprints, fingerprints)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+QSAR model training and batch scoring for influenza HA inhibitors.
+
+Builds on bioactivity.py (labels) and descriptors.py (fingerprints):
+
+    python qsar.py train influenza_ha_bioactivity.csv --models models
+    python qsar.py score models/qsar_<hash>.joblib library.csv --out scores.csv
+
+Features are cached per feature-pipeline hash (input file checksum plus
+fingerprint settings and descriptor list), so retraining on unchanged data
+skips feature computation entirely. The cache keeps the bit-packed
+fingerprints and the descriptors; models are fed a sparse matrix built from
+them, so a compound costs its set bits rather than n_bits float32 columns.
+Cross-validation folds run in parallel with joblib, and trained models are
+stored together with the pipeline hash they were built with; scoring
+refuses a model whose feature pipeline differs. Libraries are scored in
+streaming chunks, so million-compound files never have to fit in memory.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.metrics import accuracy_score, mean_squared_error, r2_score, roc_auc_score
+from sklearn.model_selection import KFold, StratifiedKFold
+
+from bioactivity import load_bioactivity
+from descriptors import DESCRIPTOR_COLUMNS, MAX_STANDARD_VALUE_NM, compute_descriptors, pic50
+
+logger = logging.getLogger(__name__)
+
+# bump when feature construction changes, so old caches and models are not reused
+FEATURE_VERSION = 2
+TASKS = ('classify', 'regress')
+# fingerprint rows unpacked at a time when building the sparse matrix
+UNPACK_ROWS = 10000
+
+
+def file_checksum(path: str) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def pipeline_hash(feature_params: dict) -> str:
+    """
+    Hash identifying how features are built (independent of the data).
+
+    Covers the featurizer settings (radius, n_bits, use_descriptors) and the
+    descriptor columns and pIC50 cap taken from descriptors.py, so changing
+    any of them invalidates cached features and stored models.
+    """
+    payload = json.dumps({
+        'version': FEATURE_VERSION,
+        'fingerprint': 'morgan',
+        'descriptor_columns': DESCRIPTOR_COLUMNS if feature_params.get('use_descriptors') else [],
+        'max_standard_value_nm': MAX_STANDARD_VALUE_NM,
+        **feature_params,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def feature_matrix(fingerprints: np.ndarray, descriptors: np.ndarray = None) -> sparse.csr_matrix:
+    """
+    Sparse model input matrix from packed fingerprints and optional descriptors.
+
+    Fingerprints are unpacked UNPACK_ROWS rows at a time, so the dense 0/1
+    matrix never exists in full; descriptors are appended as the last columns.
+
+    Args:
+        fingerprints (np.ndarray): uint8 packed bits (n, n_bits / 8)
+        descriptors (np.ndarray): float32 (n, len(DESCRIPTOR_COLUMNS)), or None for bits only
+
+    Returns:
+        sparse.csr_matrix: float32, one row per compound
+    """
+    blocks = [sparse.csr_matrix((0, fingerprints.shape[1] * 8), dtype=np.float32)]
+    for start in range(0, len(fingerprints), UNPACK_ROWS):
+        bits = np.unpackbits(fingerprints[start:start + UNPACK_ROWS], axis=1)
+        blocks.append(sparse.csr_matrix(bits, dtype=np.float32))
+    X = sparse.vstack(blocks, format='csr')
+    if descriptors is None:
+        return X
+    return sparse.hstack([X, sparse.csr_matrix(descriptors, dtype=np.float32)], format='csr')
+
+
+def featurize(smiles, radius: int = 2, n_bits: int = 2048, use_descriptors: bool = True,
+              workers: int = None, cache_dir: str = '.descriptor_cache') -> tuple:
+    """
+    Packed fingerprints and descriptors for a list of SMILES.
+
+    Returns:
+        tuple: (uint8 packed fingerprints (n, n_bits / 8), float32 descriptors
+            (n, len(DESCRIPTOR_COLUMNS)) with NaN replaced by 0, or None when
+            use_descriptors is off); feature_matrix() turns them into model input
+    """
+    descriptors, fingerprints = compute_descriptors(
+        smiles, radius=radius, n_bits=n_bits, workers=workers, cache_dir=cache_dir
+    )
+    if not use_descriptors:
+        return fingerprints, None
+    return fingerprints, np.nan_to_num(descriptors.to_numpy(dtype=np.float32))
+
+
+def load_training_data(path: str, task: str, feature_params: dict, cache_dir: str = '.qsar_cache',
+                       workers: int = None) -> tuple:
+    """
+    Features and targets for a bioactivity CSV, cached per data and pipeline hash.
+
+    classify: active (1) vs inactive (0); intermediate compounds are dropped.
+    regress: pIC50 of every compound.
+
+    Only the packed fingerprints and descriptors are cached; X is rebuilt
+    from them as a sparse matrix.
+
+    Returns:
+        tuple: (X as sparse.csr_matrix, y, feature pipeline hash)
+    """
+    feature_hash = pipeline_hash(feature_params)
+    data_hash = file_checksum(path)[:16]
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_path = os.path.join(cache_dir, f'features_{task}_{data_hash}_{feature_hash}.npz')
+
+    if os.path.isfile(cache_path):
+        logger.info(f"Using cached features {cache_path}")
+        with np.load(cache_path) as cached:
+            descriptors = cached['descriptors'] if 'descriptors' in cached else None
+            return feature_matrix(cached['fingerprints'], descriptors), cached['y'], feature_hash
+
+    bioactivity_data = load_bioactivity(path)
+    if task == 'classify':
+        bioactivity_data = bioactivity_data[bioactivity_data['bioactivity_class'] != 'intermediate']
+        y = (bioactivity_data['bioactivity_class'] == 'active').to_numpy(dtype=np.int8)
+    else:
+        y = pic50(bioactivity_data['standard_value']).to_numpy()
+
+    fingerprints, descriptors = featurize(bioactivity_data['canonical_smiles'], workers=workers, **feature_params)
+    arrays = {'fingerprints': fingerprints, 'y': y}
+    if descriptors is not None:
+        arrays['descriptors'] = descriptors
+    np.savez(cache_path, **arrays)
+    return feature_matrix(fingerprints, descriptors), y, feature_hash
+
+
+def _fit_fold(model, X: sparse.csr_matrix, y: np.ndarray, train: np.ndarray, test: np.ndarray, task: str) -> dict:
+    """Fit one CV fold and score it on the held-out part (runs in a joblib worker)"""
+    model = clone(model).fit(X[train], y[train])
+    if task == 'classify':
+        predicted = model.predict(X[test])
+        metrics = {'accuracy': accuracy_score(y[test], predicted)}
+        if len(np.unique(y[test])) == 2:
+            metrics['roc_auc'] = roc_auc_score(y[test], model.predict_proba(X[test])[:, 1])
+        return metrics
+    predicted = model.predict(X[test])
+    return {
+        'rmse': float(np.sqrt(mean_squared_error(y[test], predicted))),
+        'r2': r2_score(y[test], predicted),
+    }
+
+
+def cross_validate(model, X: sparse.csr_matrix, y: np.ndarray, task: str, folds: int = 5, n_jobs: int = -1) -> dict:
+    """
+    K-fold cross-validation with the folds fitted in parallel.
+
+    Returns:
+        dict: Mean and standard deviation of each metric over the folds
+    """
+    if task == 'classify':
+        splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=0)
+    else:
+        splitter = KFold(n_splits=folds, shuffle=True, random_state=0)
+
+    # folds run in separate workers; the arrays behind the sparse X are memory-mapped to them by joblib
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_fold)(model, X, y, train, test, task) for train, test in splitter.split(X, y)
+    )
+    summary = {}
+    for metric in results[0]:
+        values = [result[metric] for result in results if metric in result]
+        summary[metric] = float(np.mean(values))
+        summary[f'{metric}_std'] = float(np.std(values))
+    return summary
+
+
+def make_model(task: str, n_estimators: int = 500):
+    if task == 'classify':
+        return RandomForestClassifier(n_estimators=n_estimators, class_weight='balanced', n_jobs=1, random_state=0)
+    return RandomForestRegressor(n_estimators=n_estimators, n_jobs=1, random_state=0)
+
+
+def train(path: str, task: str = 'classify', models_dir: str = 'models', folds: int = 5, n_jobs: int = -1,
+          feature_params: dict = None, cache_dir: str = '.qsar_cache') -> str:
+    """
+    Cross-validate, fit on all data and store a QSAR model.
+
+    Args:
+        path (str): Bioactivity CSV (raw ChEMBL export or influenza_ha_bioactivity.csv)
+        task (str): 'classify' (active vs inactive) or 'regress' (pIC50)
+        models_dir (str): Where the trained model is written
+        folds (int): Cross-validation folds
+        n_jobs (int): Parallel workers for folds and the final fit (-1 for all CPUs)
+        feature_params (dict): radius, n_bits, use_descriptors
+        cache_dir (str): Feature matrix cache
+
+    Returns:
+        str: Path of the stored model
+    """
+    if task not in TASKS:
+        raise ValueError(f"Unknown task '{task}', expected one of {TASKS}")
+    feature_params = {'radius': 2, 'n_bits': 2048, 'use_descriptors': True, **(feature_params or {})}
+
+    X, y, feature_hash = load_training_data(path, task, feature_params, cache_dir)
+    logger.info(f"{len(y)} compounds, {X.shape[1]} features")
+
+    model = make_model(task)
+    metrics = cross_validate(model, X, y, task, folds, n_jobs)
+    logger.info(f"Cross-validation: {metrics}")
+
+    final = clone(model).set_params(n_jobs=n_jobs).fit(X, y)
+    os.makedirs(models_dir, exist_ok=True)
+    model_path = os.path.join(models_dir, f'qsar_{task}_{feature_hash}.joblib')
+    joblib.dump({
+        'model': final,
+        'task': task,
+        'feature_params': feature_params,
+        'pipeline_hash': feature_hash,
+        'metrics': metrics,
+        'training_data': file_checksum(path),
+    }, model_path)
+    logger.info(f"Model written to {model_path}")
+    return model_path
+
+
+def _read_library(path: str, chunksize: int):
+    """Yield DataFrame chunks with a 'smiles' column from a CSV or .smi library"""
+    if path.endswith(('.smi', '.smiles')):
+        for chunk in pd.read_csv(path, sep=r'\s+', header=None, dtype=str, chunksize=chunksize):
+            chunk = chunk.rename(columns={0: 'smiles', 1: 'id'})
+            yield chunk[[column for column in ('id', 'smiles') if column in chunk]]
+        return
+
+    header = pd.read_csv(path, nrows=0).columns
+    column = 'canonical_smiles' if 'canonical_smiles' in header else 'smiles'
+    id_column = next((c for c in ('molecule_chembl_id', 'id') if c in header), None)
+    usecols = [column] + ([id_column] if id_column else [])
+    for chunk in pd.read_csv(path, usecols=usecols, dtype=str, chunksize=chunksize):
+        yield chunk.rename(columns={column: 'smiles', id_column: 'id'})
+
+
+def score_library(model_path: str, library_path: str, out_path: str, chunksize: int = 100000,
+                  workers: int = None) -> int:
+    """
+    Score a compound library in streaming chunks.
+
+    Each chunk is fingerprinted (over a process pool), predicted and
+    appended to the output CSV before the next one is read.
+
+    Args:
+        model_path (str): Model written by train()
+        library_path (str): CSV with a canonical_smiles/smiles column, or a .smi file
+        out_path (str): Output CSV (id, smiles, score)
+        chunksize (int): Compounds per chunk
+        workers (int): Fingerprinting processes
+
+    Returns:
+        int: Number of compounds scored
+    """
+    stored = joblib.load(model_path)
+    feature_params = stored['feature_params']
+    if pipeline_hash(feature_params) != stored['pipeline_hash']:
+        raise ValueError(f"{model_path} was built with a different feature pipeline; retrain it")
+    model = stored['model']
+
+    total = 0
+    for i, chunk in enumerate(_read_library(library_path, chunksize)):
+        # libraries are scored once, so they don't go into the descriptor cache
+        X = feature_matrix(*featurize(chunk['smiles'].fillna(''), workers=workers, cache_dir=None, **feature_params))
+        if stored['task'] == 'classify':
+            scores = model.predict_proba(X)[:, 1]
+        else:
+            scores = model.predict(X)
+        chunk = chunk.assign(score=np.round(scores, 4))
+        chunk.to_csv(out_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+        total += len(chunk)
+        logger.info(f"Scored {total} compounds")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train and apply QSAR models for HA inhibitors")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = subparsers.add_parser('train', help="Cross-validate and store a model")
+    train_parser.add_argument('path', help="Bioactivity CSV")
+    train_parser.add_argument('--task', choices=TASKS, default='classify')
+    train_parser.add_argument('--models', default='models', help="Output directory")
+    train_parser.add_argument('--folds', type=int, default=5)
+    train_parser.add_argument('--jobs', type=int, default=-1, help="Parallel workers (-1 for all CPUs)")
+    train_parser.add_argument('--radius', type=int, default=2)
+    train_parser.add_argument('--n-bits', type=int, default=2048)
+    train_parser.add_argument('--no-descriptors', action='store_true', help="Fingerprint bits only")
+
+    score_parser = subparsers.add_parser('score', help="Score a compound library in chunks")
+    score_parser.add_argument('model', help="Model file written by train")
+    score_parser.add_argument('library', help="CSV or .smi compound library")
+    score_parser.add_argument('--out', default='scores.csv')
+    score_parser.add_argument('--chunksize', type=int, default=100000)
+    score_parser.add_argument('--workers', type=int, help="Fingerprinting processes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == 'train':
+        feature_params = {'radius': args.radius, 'n_bits': args.n_bits, 'use_descriptors': not args.no_descriptors}
+        print(train(args.path, args.task, args.models, args.folds, args.jobs, feature_params))
+    else:
+        total = score_library(args.model, args.library, args.out, args.chunksize, args.workers)
+        print(f"{total} compounds scored, written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Tanimoto similarity search over packed compound fingerprints.
+
+Fingerprints (see descriptors.py) are held as uint64 words, sorted by
+their bit count. For a query with a bits set, a compound with b bits can
+score at most min(a, b) / max(a, b), so whole ranges of the sorted index
+are skipped without touching them: a threshold query only scans counts
+in [t * a, a / t], and a top-k query scans count groups in order of
+falling bound and stops once the k-th best score beats the next bound.
+Candidates are scored in blocks with vectorized popcount (np.bitwise_count).
+
+An index saved with save() is opened memory-mapped, so only the scanned
+count ranges are read from disk:
+
+    python similarity.py build bioactivity_descriptors.csv fingerprints.npy ha_index --actives-only
+    python similarity.py query ha_index "CC(=O)Nc1ccc(O)cc1" -k 10
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Number of set bits in each row of a uint64 fingerprint matrix"""
+    return np.bitwise_count(words).sum(axis=-1, dtype=np.uint32)
+
+
+def as_words(fingerprints: np.ndarray) -> np.ndarray:
+    """
+    View packed fingerprints as uint64 words.
+
+    Args:
+        fingerprints (np.ndarray): uint8 (np.packbits) or uint64 matrix,
+            n_bits a multiple of 64
+
+    Returns:
+        np.ndarray: C-contiguous uint64 matrix (n, n_bits / 64)
+    """
+    fingerprints = np.ascontiguousarray(np.atleast_2d(fingerprints))
+    if fingerprints.dtype == np.uint64:
+        return fingerprints
+    if fingerprints.dtype != np.uint8 or fingerprints.shape[1] % 8:
+        raise ValueError("Expected uint8 packed fingerprints with a multiple of 64 bits, or uint64 words")
+    return fingerprints.view(np.uint64)
+
+
+class SimilarityIndex:
+    """
+    Fingerprint index for top-k and threshold Tanimoto queries.
+
+    Args:
+        fingerprints (np.ndarray): Packed fingerprints (uint8 or uint64), one row per compound
+        ids: Compound identifiers, row-aligned (defaults to row numbers)
+    """
+
+    def __init__(self, fingerprints: np.ndarray = None, ids=None):
+        if fingerprints is None:
+            return
+        words = as_words(fingerprints)
+        counts = popcount(words)
+        order = np.argsort(counts, kind='stable')
+        self.words = words[order]
+        self.counts = counts[order]
+        ids = np.arange(len(words)) if ids is None else np.asarray(ids)
+        self.ids = ids[order]
+
+    def __len__(self):
+        return len(self.counts)
+
+    def save(self, path: str):
+        """Write the index as .npy files in a directory"""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'words.npy'), self.words)
+        np.save(os.path.join(path, 'counts.npy'), self.counts)
+        np.save(os.path.join(path, 'ids.npy'), self.ids)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'SimilarityIndex':
+        """Open a saved index, memory-mapped by default"""
+        index = cls()
+        mode = 'r' if mmap else None
+        index.words = np.load(os.path.join(path, 'words.npy'), mmap_mode=mode)
+        index.counts = np.load(os.path.join(path, 'counts.npy'))
+        index.ids = np.load(os.path.join(path, 'ids.npy'), allow_pickle=False)
+        return index
+
+    def _scores(self, query: np.ndarray, query_count: int, start: int, stop: int) -> np.ndarray:
+        """Tanimoto of the query against sorted rows start:stop"""
+        intersection = popcount(self.words[start:stop] & query)
+        union = query_count + self.counts[start:stop] - intersection
+        return np.divide(intersection, union, out=np.zeros(len(intersection)), where=union > 0)
+
+    def _prepare(self, query: np.ndarray) -> tuple:
+        query = as_words(query)[0]
+        if len(query) != self.words.shape[1]:
+            raise ValueError(f"Query has {len(query) * 64} bits, index has {self.words.shape[1] * 64}")
+        return query, int(popcount(query))
+
+    def threshold(self, query: np.ndarray, threshold: float = 0.7, block_size: int = 65536) -> tuple:
+        """
+        All compounds with Tanimoto >= threshold.
+
+        Args:
+            query (np.ndarray): Packed fingerprint of the query
+            threshold (float): Minimum similarity, in (0, 1]
+            block_size (int): Rows scored per vectorized step
+
+        Returns:
+            tuple: (ids, scores), most similar first
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        query, query_count = self._prepare(query)
+        # only counts in [t * a, a / t] can reach the threshold
+        start = int(np.searchsorted(self.counts, np.ceil(threshold * query_count - 1e-9), side='left'))
+        stop = int(np.searchsorted(self.counts, np.floor(query_count / threshold + 1e-9), side='right'))
+
+        hits, scores = [], []
+        for block in range(start, stop, block_size):
+            block_stop = min(block + block_size, stop)
+            block_scores = self._scores(query, query_count, block, block_stop)
+            keep = np.flatnonzero(block_scores >= threshold)
+            hits.append(keep + block)
+            scores.append(block_scores[keep])
+
+        hits = np.concatenate(hits) if hits else np.zeros(0, dtype=np.int64)
+        scores = np.concatenate(scores) if scores else np.zeros(0)
+        order = np.argsort(-scores, kind='stable')
+        return self.ids[hits[order]], scores[order]
+
+    def top_k(self, query: np.ndarray, k: int = 10, block_size: int = 16384) -> tuple:
+        """
+        The k most similar compounds.
+
+        Count groups are scanned by decreasing similarity bound and the scan
+        stops once k results score at least the next group's bound.
+
+        Args:
+            query (np.ndarray): Packed fingerprint of the query
+            k (int): Number of neighbours
+            block_size (int): Rows scored per vectorized step
+
+        Returns:
+            tuple: (ids, scores), most similar first
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        query, query_count = self._prepare(query)
+        values, starts = np.unique(self.counts, return_index=True)
+        stops = np.append(starts[1:], len(self.counts))
+        bounds = np.minimum(values, query_count) / np.maximum(np.maximum(values, query_count), 1)
+        groups = np.argsort(-bounds, kind='stable')
+
+        best_rows = np.zeros(0, dtype=np.int64)
+        best_scores = np.zeros(0)
+        i = 0
+        while i < len(groups):
+            # gather whole count groups until the block is full
+            ranges = []
+            size = 0
+            while i < len(groups) and (not ranges or size < block_size):
+                group = groups[i]
+                ranges.append((starts[group], stops[group]))
+                size += stops[group] - starts[group]
+                i += 1
+
+            rows = np.concatenate([np.arange(start, stop) for start, stop in ranges])
+            scores = np.concatenate([self._scores(query, query_count, start, stop) for start, stop in ranges])
+            best_rows = np.concatenate([best_rows, rows])
+            best_scores = np.concatenate([best_scores, scores])
+            if len(best_scores) > k:
+                keep = np.argpartition(-best_scores, k - 1)[:k]
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+
+            if len(best_scores) == k and i < len(groups) and best_scores.min() >= bounds[groups[i]]:
+                break
+
+        order = np.argsort(-best_scores, kind='stable')
+        return self.ids[best_rows[order]], best_scores[order]
+
+
+def query_fingerprint(smiles: str, radius: int = 2, n_bits: int = 2048) -> np.ndarray:
+    """
+    Packed Morgan fingerprint of a query SMILES (needs RDKit).
+    """
+    from descriptors import Chem, _compute_chunk
+
+    if Chem is None:
+        raise ImportError("RDKit is required to fingerprint a query SMILES: pip install rdkit")
+    descriptors, fingerprints = _compute_chunk(([smiles], radius, n_bits))
+    if np.isnan(descriptors[0, 0]):
+        raise ValueError(f"Could not parse SMILES: {smiles}")
+    return fingerprints[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tanimoto similarity search over compound fingerprints")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="Build an index from descriptors.py output")
+    build.add_argument('table', help="CSV with molecule_chembl_id (and bioactivity_class)")
+    build.add_argument('fingerprints', help=".npy packed fingerprints, row-aligned with the table")
+    build.add_argument('index', help="Output index directory")
+    build.add_argument('--actives-only', action='store_true', help="Index only compounds labelled active")
+
+    query = subparsers.add_parser('query', help="Search an index with a SMILES")
+    query.add_argument('index', help="Index directory")
+    query.add_argument('smiles', help="Query SMILES")
+    query.add_argument('-k', type=int, default=10, help="Number of neighbours")
+    query.add_argument('--threshold', type=float, help="Return all compounds above this similarity instead")
+    query.add_argument('--radius', type=int, default=2)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        table = pd.read_csv(args.table, usecols=lambda column: column in ('molecule_chembl_id', 'bioactivity_class'))
+        fingerprints = np.load(args.fingerprints)
+        if args.actives_only:
+            mask = (table['bioactivity_class'] == 'active').to_numpy()
+            table, fingerprints = table[mask], fingerprints[mask]
+        index = SimilarityIndex(fingerprints, table['molecule_chembl_id'].to_numpy(dtype=str))
+        index.save(args.index)
+        print(f"Indexed {len(index)} compounds in {args.index}")
+        return
+
+    index = SimilarityIndex.load(args.index)
+    fingerprint = query_fingerprint(args.smiles, args.radius, index.words.shape[1] * 64)
+    if args.threshold is not None:
+        ids, scores = index.threshold(fingerprint, args.threshold)
+    else:
+        ids, scores = index.top_k(fingerprint, args.k)
+    for compound_id, score in zip(ids, scores):
+        print(f"{compound_id}\t{score:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Shared fixtures for the influenza drug discovery tests.
+
+The modules are imported flat, as the scripts and notebook do. ChEMBL is
+replaced by a local stand-in HTTP server, so no test touches the network.
+"""
+
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeChembl:
+    """
+    Minimal ChEMBL /activity.json stand-in.
+
+    Supports the filters chembl_loader sends (target_chembl_id,
+    standard_type, activity_id__gt, limit, offset; always ordered by
+    activity_id) and records every request's query parameters.
+    """
+
+    def __init__(self):
+        self.activities = []
+        self.requests = []
+        # status codes returned (once each) before serving normally
+        self.failures = []
+        self.lock = threading.Lock()
+
+    def add(self, activity_id: int, target: str = 'CHEMBL4918', standard_type: str = 'IC50'):
+        self.activities.append({
+            'activity_id': activity_id,
+            'target_chembl_id': target,
+            'standard_type': standard_type,
+            'molecule_chembl_id': f'CHEMBL{activity_id + 100000}',
+            'standard_value': str(activity_id * 10),
+        })
+
+    def page(self, query: dict) -> tuple:
+        with self.lock:
+            self.requests.append(query)
+            if self.failures:
+                return self.failures.pop(0), {'error': 'unavailable'}
+        matching = sorted(
+            (
+                record for record in self.activities
+                if record['target_chembl_id'] == query['target_chembl_id']
+                and ('standard_type' not in query or record['standard_type'] == query['standard_type'])
+                and record['activity_id'] > int(query.get('activity_id__gt', -1))
+            ),
+            key=lambda record: record['activity_id'],
+        )
+        offset, limit = int(query.get('offset', 0)), int(query.get('limit', 20))
+        return 200, {
+            'activities': matching[offset:offset + limit],
+            'page_meta': {'total_count': len(matching), 'offset': offset, 'limit': limit},
+        }
+
+
+@pytest.fixture
+def fake_chembl():
+    """(FakeChembl, base URL) of a stand-in server running on a free local port"""
+    chembl = FakeChembl()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != '/activity.json':
+                status, payload = 404, {'error': 'not found'}
+            else:
+                status, payload = chembl.page({name: values[0] for name, values in parse_qs(url.query).items()})
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield chembl, f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
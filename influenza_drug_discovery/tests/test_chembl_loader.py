@@ -0,0 +1,150 @@
+import threading
+
+import pytest
+import requests
+
+import chembl_loader
+from chembl_loader import ActivityCache, fetch_pages, load_activities, query_hash
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(chembl_loader.time, 'sleep', lambda seconds: None)
+
+
+def test_fetch_pages_collects_every_page(fake_chembl):
+    chembl, base_url = fake_chembl
+    for activity_id in range(1, 11):
+        chembl.add(activity_id)
+
+    records = fetch_pages({'target_chembl_id': 'CHEMBL4918'}, base_url, page_size=3, workers=3)
+
+    assert [record['activity_id'] for record in records] == list(range(1, 11))
+    assert sorted(int(query['offset']) for query in chembl.requests) == [0, 3, 6, 9]
+    assert all(query['order_by'] == 'activity_id' for query in chembl.requests)
+
+
+def test_fetch_pages_uses_one_session_per_thread(fake_chembl, monkeypatch):
+    chembl, base_url = fake_chembl
+    for activity_id in range(1, 21):
+        chembl.add(activity_id)
+    used = []
+    real_get = chembl_loader._get
+
+    def recording_get(session, url, params, **kwargs):
+        used.append((threading.get_ident(), session))
+        return real_get(session, url, params, **kwargs)
+
+    monkeypatch.setattr(chembl_loader, '_get', recording_get)
+    fetch_pages({'target_chembl_id': 'CHEMBL4918'}, base_url, page_size=2, workers=4)
+
+    sessions_by_thread = {}
+    for thread, session in used:
+        sessions_by_thread.setdefault(thread, set()).add(id(session))
+    assert all(len(sessions) == 1 for sessions in sessions_by_thread.values())
+    # no session is shared between threads
+    assert len({id(session) for _, session in used}) == len(sessions_by_thread)
+
+
+def test_fetch_pages_retries_server_errors(fake_chembl):
+    chembl, base_url = fake_chembl
+    chembl.add(1)
+    chembl.failures = [503, 502]
+
+    records = fetch_pages({'target_chembl_id': 'CHEMBL4918'}, base_url)
+
+    assert [record['activity_id'] for record in records] == [1]
+    assert len(chembl.requests) == 3
+
+
+def test_fetch_pages_gives_up_after_retries(fake_chembl):
+    chembl, base_url = fake_chembl
+    chembl.failures = [503] * 3
+
+    with pytest.raises(requests.HTTPError):
+        fetch_pages({'target_chembl_id': 'CHEMBL4918'}, base_url)
+
+
+def test_load_activities_caches_then_fetches_only_deltas(fake_chembl, tmp_path):
+    chembl, base_url = fake_chembl
+    cache_path = str(tmp_path / 'chembl.sqlite')
+    for activity_id in range(1, 6):
+        chembl.add(activity_id)
+
+    first = load_activities('CHEMBL4918', cache_path=cache_path, base_url=base_url, page_size=2)
+    assert first['activity_id'].tolist() == [1, 2, 3, 4, 5]
+    assert 'activity_id__gt' not in chembl.requests[0]
+
+    chembl.requests.clear()
+    chembl.add(6)
+    chembl.add(7)
+    second = load_activities('CHEMBL4918', cache_path=cache_path, base_url=base_url, page_size=2)
+
+    assert second['activity_id'].tolist() == list(range(1, 8))
+    # only the new records were requested
+    assert {query['activity_id__gt'] for query in chembl.requests} == {'5'}
+    assert len(chembl.requests) == 1
+
+
+def test_load_activities_offline_uses_cache_only(fake_chembl, tmp_path):
+    chembl, base_url = fake_chembl
+    cache_path = str(tmp_path / 'chembl.sqlite')
+    chembl.add(1)
+    chembl.add(2)
+
+    assert load_activities('CHEMBL4918', cache_path=cache_path, offline=True, base_url=base_url).empty
+    load_activities('CHEMBL4918', cache_path=cache_path, base_url=base_url)
+    chembl.requests.clear()
+
+    offline = load_activities('CHEMBL4918', cache_path=cache_path, offline=True, base_url=base_url)
+    assert offline['activity_id'].tolist() == [1, 2]
+    assert chembl.requests == []
+
+
+def test_load_activities_refresh_downloads_again(fake_chembl, tmp_path):
+    chembl, base_url = fake_chembl
+    cache_path = str(tmp_path / 'chembl.sqlite')
+    chembl.add(1)
+    load_activities('CHEMBL4918', cache_path=cache_path, base_url=base_url)
+    chembl.requests.clear()
+
+    refreshed = load_activities('CHEMBL4918', cache_path=cache_path, refresh=True, base_url=base_url)
+
+    assert refreshed['activity_id'].tolist() == [1]
+    assert 'activity_id__gt' not in chembl.requests[0]
+
+
+def test_queries_are_cached_separately(fake_chembl, tmp_path):
+    chembl, base_url = fake_chembl
+    cache_path = str(tmp_path / 'chembl.sqlite')
+    chembl.add(1, standard_type='IC50')
+    chembl.add(2, standard_type='Ki')
+    chembl.add(3, target='CHEMBL0001')
+
+    ic50 = load_activities('CHEMBL4918', 'IC50', cache_path=cache_path, base_url=base_url)
+    ki = load_activities('CHEMBL4918', 'Ki', cache_path=cache_path, base_url=base_url)
+    other = load_activities('CHEMBL0001', None, cache_path=cache_path, base_url=base_url)
+
+    assert ic50['activity_id'].tolist() == [1]
+    assert ki['activity_id'].tolist() == [2]
+    assert other['activity_id'].tolist() == [3]
+
+
+def test_activity_cache_store_and_marker(tmp_path):
+    cache = ActivityCache(str(tmp_path / 'chembl.sqlite'))
+    key = query_hash({'target_chembl_id': 'CHEMBL4918'})
+    try:
+        assert cache.last_activity_id(key) is None
+        cache.store(key, 'CHEMBL4918', {}, [{'activity_id': 4}, {'activity_id': 2}])
+        # storing the same record again replaces it
+        cache.store(key, 'CHEMBL4918', {}, [{'activity_id': 4, 'note': 'updated'}])
+
+        assert cache.last_activity_id(key) == 4
+        loaded = cache.load(key)
+        assert loaded['activity_id'].tolist() == [2, 4]
+        assert loaded['note'].tolist()[1] == 'updated'
+        # an empty delta keeps the marker
+        cache.store(key, 'CHEMBL4918', {}, [])
+        assert cache.last_activity_id(key) == 4
+    finally:
+        cache.close()
@@ -0,0 +1,192 @@
+"""
+Prediction cache for the poultry disease detector.
+
+Entries are keyed by a hash of the image bytes plus the checksum of the
+model file, so a re-uploaded photo is answered without preprocessing or
+predict, and swapping the model file invalidates every old entry.
+
+Two tiers: an in-memory LRU, and an optional SQLite file shared across
+sessions and restarts with TTL and size-based eviction.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+def file_checksum(path: str) -> str:
+    """
+    SHA-256 of a file, read in chunks. Returns an empty string if the file
+    does not exist (e.g. when predicting through a remote server).
+    """
+    if not os.path.isfile(path):
+        return ''
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """
+    Two-tier (memory LRU + optional SQLite) cache of image predictions.
+
+    Args:
+        model_path (str): Model file whose checksum is part of every key
+        max_entries (int): Size of the in-memory LRU tier
+        db_path (str): SQLite file for the on-disk tier (None to disable)
+        ttl_seconds (float): Age after which on-disk entries expire
+        max_db_entries (int): On-disk entries kept before the oldest are evicted
+    """
+
+    def __init__(self, model_path: str, max_entries: int = 1024, db_path: str = None,
+                 ttl_seconds: float = 7 * 24 * 3600, max_db_entries: int = 100000):
+        self.model_checksum = file_checksum(model_path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_db_entries = max_db_entries
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        self.db = None
+        if db_path:
+            self.db = sqlite3.connect(db_path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "key TEXT PRIMARY KEY, model TEXT, label TEXT, confidence REAL, created REAL)"
+            )
+            # entries made with another model can never be hit again
+            self.db.execute("DELETE FROM predictions WHERE model != ?", (self.model_checksum,))
+            self.db.commit()
+
+    def key(self, image_bytes: bytes, variant: str = '') -> str:
+        """Cache key for an image under the current model and prediction variant (e.g. 'tta')"""
+        return hashlib.sha256(
+            f'{self.model_checksum}:{variant}'.encode() + hashlib.sha256(image_bytes).digest()
+        ).hexdigest()
+
+    def get(self, key: str):
+        """
+        Look up a prediction.
+
+        Returns:
+            tuple: (class name, confidence), or None on a miss
+        """
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return self.memory[key]
+
+            if self.db is not None:
+                row = self.db.execute(
+                    "SELECT label, confidence FROM predictions WHERE key = ? AND created > ?",
+                    (key, time.time() - self.ttl_seconds),
+                ).fetchone()
+                if row is not None:
+                    self.disk_hits += 1
+                    self._remember(key, (row[0], row[1]))
+                    return self.memory[key]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, prediction: tuple):
+        """Store a (class name, confidence) prediction in both tiers"""
+        with self.lock:
+            self._remember(key, prediction)
+            if self.db is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)",
+                    (key, self.model_checksum, prediction[0], prediction[1], time.time()),
+                )
+                self._evict_disk()
+                self.db.commit()
+
+    def _remember(self, key: str, prediction: tuple):
+        self.memory[key] = prediction
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def _evict_disk(self):
+        self.db.execute("DELETE FROM predictions WHERE created <= ?", (time.time() - self.ttl_seconds,))
+        excess = self.db.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] - self.max_db_entries
+        if excess > 0:
+            self.db.execute(
+                "DELETE FROM predictions WHERE key IN "
+                "(SELECT key FROM predictions ORDER BY created LIMIT ?)",
+                (excess,),
+            )
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'memory_hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            'memory_entries': len(self.memory),
+        }
+
+
+def _read_bytes(source) -> bytes:
+    if isinstance(source, Image.Image):
+        # already decoded: key on the pixels, with the mode and size that
+        # give them their meaning
+        return f'{source.mode}:{source.width}x{source.height}:'.encode() + source.tobytes()
+    if isinstance(source, str):
+        with open(source, 'rb') as file:
+            return file.read()
+    source.seek(0)
+    data = source.read()
+    source.seek(0)
+    return data
+
+
+def cached_predict(cache: PredictionCache, predict, sources: list, variant: str = '') -> tuple:
+    """
+    Classify images, only running predict on cache misses.
+
+    Args:
+        cache (PredictionCache): Prediction cache
+        predict: Callable taking a list of sources and returning
+            (list of (class name, confidence), images per second)
+        sources (list): File paths, binary file-like objects (e.g. Streamlit
+            uploads, keyed on their file bytes) or PIL images
+        variant (str): Prediction mode, kept apart in the cache (e.g. 'tta')
+
+    Returns:
+        tuple: (list of (class name, confidence) per image, images per second)
+    """
+    start = time.perf_counter()
+    keys = [cache.key(_read_bytes(source), variant) for source in sources]
+    results = [cache.get(key) for key in keys]
+
+    # predict each distinct missing image once, even if uploaded twice
+    missing = {}
+    for i, result in enumerate(results):
+        if result is None:
+            missing.setdefault(keys[i], i)
+    if missing:
+        predicted, _ = predict([sources[i] for i in missing.values()])
+        fresh = dict(zip(missing, predicted))
+        for key, prediction in fresh.items():
+            cache.put(key, prediction)
+        results = [result or fresh[key] for key, result in zip(keys, results)]
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"{len(sources) - len(missing)} of {len(sources)} predictions served from cache")
+    return results, len(sources) / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,111 @@
+"""
+Compare accuracy and CPU latency of the Keras model and its TFLite exports.
+
+The held-out folder must contain one subfolder per class
+(coccidiosis/, healthy/, newcastle/):
+
+    python compare_models.py data/test pdisease_detector.keras pdisease_detector.int8.tflite
+
+For each model it reports accuracy, agreement with the first model,
+single-image latency percentiles, batched throughput and file size.
+"""
+
+import argparse
+import logging
+import os
+import time
+
+import numpy as np
+
+from inference import CLASS_NAMES, find_images, load_image, predict_batches
+from runtime import load_runtime
+
+logger = logging.getLogger(__name__)
+
+
+def load_labelled_images(folder: str) -> tuple:
+    """
+    Load a held-out set laid out as folder/<class name>/<image>.
+
+    Returns:
+        tuple: (float32 images of shape (n, 224, 224, 3), int labels of shape (n,))
+    """
+    images, labels = [], []
+    for label, class_name in enumerate(CLASS_NAMES):
+        for path in find_images([os.path.join(folder, class_name)]):
+            images.append(load_image(path))
+            labels.append(label)
+    if not images:
+        raise ValueError(f"No images found under {folder}/{{{','.join(CLASS_NAMES)}}}")
+    return np.stack(images), np.array(labels)
+
+
+def evaluate(model, images: np.ndarray, batch_size: int = 32, latency_runs: int = 50) -> dict:
+    """
+    Measure predictions, single-image latency and batched throughput.
+
+    Args:
+        model: Anything with predict_on_batch
+        images (np.ndarray): Preprocessed images
+        batch_size (int): Batch size for the throughput run
+        latency_runs (int): Number of single-image calls timed
+
+    Returns:
+        dict: predictions, latency_p50_ms, latency_p99_ms, images_per_sec
+    """
+    # the first call builds/traces the graph; keep it out of the timings
+    model.predict_on_batch(images[:1])
+
+    latencies = []
+    for i in range(latency_runs):
+        start = time.perf_counter()
+        model.predict_on_batch(images[i % len(images)][None])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    probabilities = predict_batches(model, images, batch_size)
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1000.0
+    return {
+        'predictions': np.argmax(probabilities, axis=1),
+        'latency_p50_ms': float(np.percentile(latencies, 50)),
+        'latency_p99_ms': float(np.percentile(latencies, 99)),
+        'images_per_sec': len(images) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy vs latency of pdetect model variants")
+    parser.add_argument('folder', help="Held-out images, one subfolder per class")
+    parser.add_argument('models', nargs='+', help=".keras and/or .tflite files")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--latency-runs', type=int, default=50)
+    parser.add_argument('--threads', type=int, help="TFLite interpreter threads")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    images, labels = load_labelled_images(args.folder)
+    print(f"{len(images)} held-out images")
+
+    reference = None
+    print(f"{'model':40} {'size MB':>8} {'acc':>7} {'agree':>7} {'p50 ms':>8} {'p99 ms':>8} {'img/s':>8}")
+    for path in args.models:
+        runtime = 'tflite' if path.endswith('.tflite') else 'keras'
+        model = load_runtime(path, runtime, args.threads)
+        result = evaluate(model, images, args.batch_size, args.latency_runs)
+
+        predictions = result['predictions']
+        if reference is None:
+            reference = predictions
+        accuracy = float(np.mean(predictions == labels))
+        agreement = float(np.mean(predictions == reference))
+        print(
+            f"{os.path.basename(path):40} {os.path.getsize(path) / 1e6:8.1f} {accuracy:7.2%} {agreement:7.2%} "
+            f"{result['latency_p50_ms']:8.1f} {result['latency_p99_ms']:8.1f} {result['images_per_sec']:8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
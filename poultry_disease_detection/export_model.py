@@ -0,0 +1,119 @@
+"""
+Export the poultry disease detector to a CPU-optimized TFLite file.
+
+Post-training quantization options:
+    float16  weights stored as float16 (half the size, near-identical accuracy)
+    dynamic  int8 weights, float activations (no calibration data needed)
+    int8     int8 weights and activations, calibrated on sample images
+    float32  plain conversion, no quantization
+
+The file is written next to the .keras model (e.g. pdisease_detector.int8.tflite),
+where runtime.load_runtime() picks it up:
+
+    python export_model.py --model pdisease_detector.keras --quantization int8 --calibration-dir data/train
+"""
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+
+from inference import MODEL_PATH, find_images, load_image
+from runtime import QUANTIZATIONS, tflite_path
+
+logger = logging.getLogger(__name__)
+
+
+def representative_dataset(calibration_dir: str, samples: int = 200):
+    """
+    Build the calibration generator used for full int8 quantization.
+
+    Args:
+        calibration_dir (str): Folder of training-like images (searched recursively)
+        samples (int): Number of images to calibrate on
+
+    Returns:
+        Callable yielding single-image float32 batches
+    """
+    paths = find_images([calibration_dir])
+    if not paths:
+        raise ValueError(f"No images found in {calibration_dir}")
+    random.Random(0).shuffle(paths)
+    paths = paths[:samples]
+
+    def generate():
+        for path in paths:
+            yield [load_image(path)[None]]
+
+    return generate
+
+
+def export_tflite(model_path: str, quantization: str = 'float16', output_path: str = None,
+                  calibration_dir: str = None, samples: int = 200) -> str:
+    """
+    Convert a .keras model to TFLite with post-training quantization.
+
+    Args:
+        model_path (str): Path to the .keras model
+        quantization (str): One of QUANTIZATIONS
+        output_path (str): Destination file (defaults to next to the model)
+        calibration_dir (str): Calibration images, required for int8
+        samples (int): Number of calibration images
+
+    Returns:
+        str: Path of the written .tflite file
+    """
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(f"Unknown quantization '{quantization}', expected one of {QUANTIZATIONS}")
+    if quantization == 'int8' and not calibration_dir:
+        raise ValueError("int8 quantization needs --calibration-dir")
+
+    import keras
+    import tensorflow as tf
+
+    model = keras.models.load_model(model_path)
+    with tempfile.TemporaryDirectory() as saved_model_dir:
+        model.export(saved_model_dir, format='tf_saved_model')
+        converter = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir)
+
+        if quantization != 'float32':
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        if quantization == 'float16':
+            converter.target_spec.supported_types = [tf.float16]
+        elif quantization == 'int8':
+            converter.representative_dataset = representative_dataset(calibration_dir, samples)
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+            # keep float32 input/output so preprocessing stays the same
+            converter.inference_input_type = tf.float32
+            converter.inference_output_type = tf.float32
+
+        tflite_model = converter.convert()
+
+    output_path = output_path or tflite_path(model_path, quantization)
+    with open(output_path, 'wb') as file:
+        file.write(tflite_model)
+
+    logger.info(
+        f"Wrote {output_path} ({os.path.getsize(output_path) / 1e6:.1f} MB, "
+        f"from {os.path.getsize(model_path) / 1e6:.1f} MB)"
+    )
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the poultry disease model to TFLite")
+    parser.add_argument('--model', default=MODEL_PATH, help="Path to the .keras model")
+    parser.add_argument('--quantization', choices=QUANTIZATIONS, default='float16')
+    parser.add_argument('--output', help="Output .tflite path (default: next to the model)")
+    parser.add_argument('--calibration-dir', help="Sample images for int8 calibration")
+    parser.add_argument('--samples', type=int, default=200, help="Number of calibration images")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    path = export_tflite(args.model, args.quantization, args.output, args.calibration_dir, args.samples)
+    print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+"""
+Headless inference for the poultry disease detector.
+
+Each image is decoded once (JPEGs at reduced scale), resized and written
+directly into a preallocated float32 batch buffer by a thread pool, while
+the model runs on the previous batch, one predict call per batch. Nothing here depends on
+Streamlit, so it can run from the command line:
+
+    python inference.py path/to/images --model pdisease_detector.keras --batch-size 32
+"""
+
+import argparse
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from runtime import RUNTIMES, load_runtime
+
+logger = logging.getLogger(__name__)
+
+# PDETECT_MODEL_PATH overrides the model shipped in model_files/ next to this file
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_files', 'pdisease_detector.keras')
+MODEL_PATH = os.environ.get('PDETECT_MODEL_PATH', DEFAULT_MODEL_PATH)
+CLASS_NAMES = ['coccidiosis', 'healthy', 'newcastle']
+IMAGE_SIZE = (224, 224)
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def decode_image(source) -> Image.Image:
+    """
+    Decode an image once, as small as the model input allows.
+
+    For JPEGs, draft mode lets the decoder downscale by 1/2, 1/4 or 1/8
+    while decoding, so a 12 MP phone photo is never expanded to full size.
+    The result is used both for the model input and the display thumbnail.
+
+    Args:
+        source: File path, binary file-like object (e.g. a Streamlit upload)
+            or an already decoded PIL image
+
+    Returns:
+        Image.Image: RGB image no smaller than the model input
+    """
+    if isinstance(source, Image.Image):
+        return source.convert('RGB')
+    img = Image.open(source)
+    img.draft('RGB', IMAGE_SIZE)
+    return img.convert('RGB')
+
+
+def preprocess_into(img: Image.Image, out: np.ndarray):
+    """
+    Resize a decoded image and write it, normalized to [0, 1], into out.
+
+    The uint8 pixels are scaled straight into the float32 buffer, with no
+    intermediate float array.
+
+    Args:
+        img (Image.Image): Decoded RGB image
+        out (np.ndarray): float32 buffer of shape (224, 224, 3), e.g. one
+            slot of a preallocated batch
+    """
+    resized = img.resize(IMAGE_SIZE, Image.NEAREST)
+    np.multiply(np.asarray(resized), np.float32(1 / 255), out=out)
+
+
+def load_image(source) -> np.ndarray:
+    """
+    Decode an image and turn it into a normalized model input.
+
+    Args:
+        source: File path, binary file-like object or PIL image
+
+    Returns:
+        np.ndarray: float32 array of shape (224, 224, 3) in [0, 1]
+    """
+    out = np.empty((*IMAGE_SIZE, 3), dtype=np.float32)
+    preprocess_into(decode_image(source), out)
+    return out
+
+
+def predict_batches(model, images, batch_size: int = 32) -> np.ndarray:
+    """
+    Run the model over a stream of preprocessed images in fixed-size batches.
+
+    The last batch is zero-padded to batch_size so the model always sees the
+    same input shape and is not retraced.
+
+    Args:
+        model: Keras model (anything with predict_on_batch)
+        images: Iterable of (224, 224, 3) float32 arrays
+        batch_size (int): Number of images per predict call
+
+    Returns:
+        np.ndarray: Class probabilities, one row per image
+    """
+    batch = np.zeros((batch_size, *IMAGE_SIZE, 3), dtype=np.float32)
+    outputs = []
+    filled = 0
+
+    for img in images:
+        batch[filled] = img
+        filled += 1
+        if filled == batch_size:
+            outputs.append(np.asarray(model.predict_on_batch(batch)))
+            filled = 0
+
+    if filled:
+        batch[filled:] = 0.0
+        outputs.append(np.asarray(model.predict_on_batch(batch))[:filled])
+
+    if not outputs:
+        return np.zeros((0, len(CLASS_NAMES)), dtype=np.float32)
+    return np.concatenate(outputs)
+
+
+def classify(probabilities: np.ndarray) -> list:
+    """
+    Turn model outputs into (class name, confidence) pairs.
+
+    Args:
+        probabilities (np.ndarray): Class probabilities, one row per image
+
+    Returns:
+        list: (class name, confidence score) for each image
+    """
+    indices = np.argmax(probabilities, axis=1)
+    return [
+        (CLASS_NAMES[index], float(row[index]))
+        for index, row in zip(indices, probabilities)
+    ]
+
+
+def predict_sources(model, sources: list, batch_size: int, executor) -> np.ndarray:
+    """
+    Decode images straight into preallocated batch buffers and classify them.
+
+    Two buffers alternate: the thread pool fills the next batch while the
+    model runs on the current one.
+
+    Args:
+        model: Keras model (anything with predict_on_batch)
+        sources (list): File paths, binary file-like objects or PIL images
+        batch_size (int): Number of images per predict call
+        executor: Thread pool used for decoding
+
+    Returns:
+        np.ndarray: Class probabilities, one row per image
+    """
+    buffers = [np.zeros((batch_size, *IMAGE_SIZE, 3), dtype=np.float32) for _ in range(2)]
+
+    def decode_into(source, out):
+        preprocess_into(decode_image(source), out)
+
+    def fill(batch_index):
+        buffer = buffers[batch_index % 2]
+        chunk = sources[batch_index * batch_size:(batch_index + 1) * batch_size]
+        return len(chunk), [
+            executor.submit(decode_into, source, buffer[i])
+            for i, source in enumerate(chunk)
+        ]
+
+    n_batches = -(-len(sources) // batch_size)
+    outputs = []
+    pending = fill(0) if n_batches else None
+    for batch_index in range(n_batches):
+        filled, futures = pending
+        for future in futures:
+            future.result()
+        # start decoding the next batch before predicting this one
+        if batch_index + 1 < n_batches:
+            pending = fill(batch_index + 1)
+
+        buffer = buffers[batch_index % 2]
+        buffer[filled:] = 0.0
+        outputs.append(np.asarray(model.predict_on_batch(buffer))[:filled])
+
+    if not outputs:
+        return np.zeros((0, len(CLASS_NAMES)), dtype=np.float32)
+    return np.concatenate(outputs)
+
+
+def run_batch(model, sources: list, batch_size: int = 32, workers: int = 8, budget: 'LatencyBudget' = None) -> tuple:
+    """
+    Decode, batch and classify a list of images.
+
+    Decoding runs ahead in a thread pool while earlier batches are predicted.
+
+    Args:
+        model: Keras model
+        sources (list): File paths, binary file-like objects or PIL images
+        batch_size (int): Number of images per predict call; the last batch
+            is padded to it, so every call has the same, warmed-up shape. A
+            single image is predicted as a batch of 1 (also warmed up by the app)
+        workers (int): Number of decoding threads
+        budget (LatencyBudget): Optional latency budget, updated with the
+            cost of this run per row sent to the model (padding included)
+
+    Returns:
+        tuple: (list of (class name, confidence) per image, images per second)
+    """
+    if len(sources) == 1:
+        batch_size = 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        probabilities = predict_sources(model, sources, batch_size, executor)
+    elapsed = time.perf_counter() - start
+
+    if budget is not None:
+        budget.record(-(-len(sources) // batch_size) * batch_size, elapsed)
+    images_per_sec = len(sources) / elapsed if elapsed > 0 else 0.0
+    logger.info(f"Classified {len(sources)} images in {elapsed:.2f}s ({images_per_sec:.1f} images/sec)")
+    return classify(probabilities), images_per_sec
+
+
+# test-time augmentation views, all built into one batch per image
+TTA_VIEWS = ('identity', 'flip_lr', 'flip_ud', 'rotate_+10', 'rotate_-10',
+             'crop_center', 'crop_top_left', 'crop_bottom_right')
+TTA_CROP = 0.85
+
+
+def tta_views_into(img: Image.Image, out: np.ndarray):
+    """
+    Write the TTA_VIEWS of one decoded image into consecutive batch slots.
+
+    Flips are taken from the already normalized identity view; rotations
+    work on the 224x224 resize and crops on the decoded image, so no view
+    decodes the file again.
+
+    Args:
+        img (Image.Image): Decoded RGB image
+        out (np.ndarray): float32 buffer of shape (len(TTA_VIEWS), 224, 224, 3)
+    """
+    preprocess_into(img, out[0])
+    out[1] = out[0, :, ::-1]
+    out[2] = out[0, ::-1]
+
+    resized = img.resize(IMAGE_SIZE, Image.NEAREST)
+    for slot, angle in ((3, 10), (4, -10)):
+        preprocess_into(resized.rotate(angle, resample=Image.BILINEAR), out[slot])
+
+    width, height = img.size
+    crop_w, crop_h = int(width * TTA_CROP), int(height * TTA_CROP)
+    boxes = (
+        ((width - crop_w) // 2, (height - crop_h) // 2),
+        (0, 0),
+        (width - crop_w, height - crop_h),
+    )
+    for slot, (left, top) in enumerate(boxes, start=5):
+        preprocess_into(img.crop((left, top, left + crop_w, top + crop_h)), out[slot])
+
+
+def average_views(probabilities: np.ndarray, n_views: int) -> np.ndarray:
+    """
+    Combine per-view softmax outputs by averaging their log-probabilities.
+
+    Averaging in log space (the logits up to a per-view constant) and
+    renormalizing gives a geometric mean, which is less swayed by a single
+    over-confident view than averaging probabilities.
+
+    Args:
+        probabilities (np.ndarray): Shape (n_images * n_views, classes)
+        n_views (int): Views per image, consecutive rows
+
+    Returns:
+        np.ndarray: Shape (n_images, classes), rows summing to 1
+    """
+    log_probs = np.log(np.clip(probabilities, 1e-7, 1.0)).reshape(-1, n_views, probabilities.shape[1])
+    mean = log_probs.mean(axis=1)
+    mean -= mean.max(axis=1, keepdims=True)
+    combined = np.exp(mean)
+    return combined / combined.sum(axis=1, keepdims=True)
+
+
+class LatencyBudget:
+    """
+    Decide whether test-time augmentation fits a per-request latency budget.
+
+    Keeps a moving average of the model's cost per view, measured per row
+    actually sent to the model (padding rows cost as much as real ones). When the model is shared by busy sessions
+    that cost rises, and TTA is switched off until it falls again.
+
+    Args:
+        budget_ms (float): Largest acceptable predict time per request
+        smoothing (float): Weight of the newest measurement in the average
+    """
+
+    def __init__(self, budget_ms: float = 1000.0, smoothing: float = 0.2):
+        self.budget_ms = budget_ms
+        self.smoothing = smoothing
+        self.seconds_per_view = None
+        self.lock = threading.Lock()
+
+    def allows(self, n_views: int) -> bool:
+        """True if n_views forward passes are expected to fit the budget"""
+        if self.seconds_per_view is None:
+            return True
+        return n_views * self.seconds_per_view * 1000.0 <= self.budget_ms
+
+    def record(self, n_views: int, seconds: float):
+        """Add a measured predict run of n_views forward passes"""
+        if n_views <= 0:
+            return
+        with self.lock:
+            sample = seconds / n_views
+            if self.seconds_per_view is None:
+                self.seconds_per_view = sample
+            else:
+                self.seconds_per_view += self.smoothing * (sample - self.seconds_per_view)
+
+
+def run_tta(model, sources: list, batch_size: int = 32, workers: int = 8, budget: LatencyBudget = None) -> tuple:
+    """
+    Classify images with test-time augmentation.
+
+    Each image is decoded once and expanded into len(TTA_VIEWS) views in
+    the batch; batches hold whole images, so one image costs one predict
+    call of len(TTA_VIEWS) rows. A batch holds at most batch_size //
+    len(TTA_VIEWS) images, fewer when there are fewer sources, and the last
+    call of a longer run is padded to the same shape; every such shape is
+    a multiple of len(TTA_VIEWS) up to batch_size (warmed up by the app).
+    Whether TTA fits
+    the latency budget is decided by the caller (LatencyBudget.allows),
+    once, so the prediction is cached under the variant that actually ran.
+
+    Args:
+        model: Keras model (anything with predict_on_batch)
+        sources (list): File paths, binary file-like objects or PIL images
+        batch_size (int): Largest number of views per predict call
+        workers (int): Number of decoding threads
+        budget (LatencyBudget): Optional latency budget, updated with the cost
+            of this run per row sent to the model (padding included)
+
+    Returns:
+        tuple: (list of (class name, confidence) per image, images per second)
+    """
+    n_views = len(TTA_VIEWS)
+    # whole images per call, no more than there are; the last call is
+    # padded so the shape never changes within a run
+    images_per_call = max(1, min(len(sources), batch_size // n_views))
+
+    batch = np.zeros((images_per_call * n_views, *IMAGE_SIZE, 3), dtype=np.float32)
+
+    def fill(slot, source):
+        tta_views_into(decode_image(source), batch[slot * n_views:(slot + 1) * n_views])
+
+    outputs = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for first in range(0, len(sources), images_per_call):
+            chunk = sources[first:first + images_per_call]
+            list(executor.map(fill, range(len(chunk)), chunk))
+            filled = len(chunk) * n_views
+            batch[filled:] = 0.0
+            outputs.append(np.asarray(model.predict_on_batch(batch))[:filled])
+    elapsed = time.perf_counter() - start
+    probabilities = np.concatenate(outputs) if outputs else np.zeros((0, len(CLASS_NAMES)), dtype=np.float32)
+
+    if budget is not None:
+        budget.record(len(outputs) * len(batch), elapsed)
+    images_per_sec = len(sources) / elapsed if elapsed > 0 else 0.0
+    logger.info(f"Classified {len(sources)} images x {n_views} views in {elapsed:.2f}s")
+    return classify(average_views(probabilities, n_views)), images_per_sec
+
+
+def find_images(paths: list) -> list:
+    """
+    Expand files and folders into a sorted list of image files.
+
+    Args:
+        paths (list): Image files and/or folders containing images
+
+    Returns:
+        list: Image file paths
+    """
+    images = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                images.extend(
+                    os.path.join(root, name)
+                    for name in files
+                    if name.lower().endswith(IMAGE_EXTENSIONS)
+                )
+        else:
+            images.append(path)
+    return sorted(images)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch poultry disease detection")
+    parser.add_argument('paths', nargs='+', help="Image files or folders")
+    parser.add_argument('--model', default=MODEL_PATH, help="Path to the .keras model")
+    parser.add_argument('--runtime', choices=RUNTIMES, default='auto',
+                        help="auto uses an exported TFLite model when present")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--workers', type=int, default=8, help="Image decoding threads")
+    parser.add_argument('--tta', action='store_true', help="Average predictions over augmented views")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    model = load_runtime(args.model, args.runtime)
+    sources = find_images(args.paths)
+    predict = run_tta if args.tta else run_batch
+    results, images_per_sec = predict(model, sources, args.batch_size, args.workers)
+
+    for path, (prediction_result, confidence_score) in zip(sources, results):
+        print(f"{path}\t{prediction_result}\t{confidence_score:.4f}")
+    print(f"{len(sources)} images, {images_per_sec:.1f} images/sec")
+
+
+if __name__ == "__main__":
+    main()
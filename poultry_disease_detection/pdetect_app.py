@@ -1,9 +1,22 @@
+import csv
+import io
+import os
 import streamlit as st
-import keras
-import numpy as np
-from keras.preprocessing import image
 import logging
-from PIL import Image
+import time
+from functools import partial
+
+from cache import PredictionCache, cached_predict
+from inference import MODEL_PATH, TTA_VIEWS, LatencyBudget, decode_image, run_batch, run_tta
+from runtime import BackgroundLoader, resolve_model_file
+from server import predict_remote
+
+# When set, inference goes to a running server.py instead of a model loaded in this session
+SERVER_URL = os.environ.get("PDETECT_SERVER_URL")
+# Optional SQLite file for the on-disk prediction cache tier
+CACHE_DB = os.environ.get("PDETECT_CACHE_DB")
+# auto: use an exported TFLite model (export_model.py) when present, else Keras
+RUNTIME = os.environ.get("PDETECT_RUNTIME", "auto")
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -36,20 +49,27 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Load the model
+# Load and warm up the model in the background as soon as the app starts
 @st.cache_resource
-def load_model():
-    try:
-        model_path = 'D:/coding_projects/poultry_disease_detection/model_files/pdisease_detector.keras'
-        model = keras.models.load_model(model_path)
-        logger.info("Model loaded successfully.")
-        return model
-    except Exception as e:
-        logger.error(f"Error loading model: {e}")
-        return None
+def get_model_loader():
+    logger.info(f"Loading model from {MODEL_PATH} (runtime: {RUNTIME})")
+    # batch 1 for single uploads, 32 for full batches of multi-uploads, and
+    # 1-4 images x len(TTA_VIEWS) views for test-time augmentation
+    tta_batch_sizes = tuple(range(len(TTA_VIEWS), 33, len(TTA_VIEWS)))
+    return BackgroundLoader(MODEL_PATH, RUNTIME, warm_up_batch_sizes=tuple(sorted({1, 32, *tta_batch_sizes})))
+
+# Prediction cache shared by all sessions
+@st.cache_resource
+def get_prediction_cache():
+    # keyed on the file actually served, so switching runtime invalidates entries
+    model_file = MODEL_PATH if SERVER_URL else resolve_model_file(MODEL_PATH, RUNTIME)
+    return PredictionCache(model_file, db_path=CACHE_DB)
 
 # Main interface
 def main():
+    # Start loading before anything else is rendered
+    loader = None if SERVER_URL else get_model_loader()
+
     # Header
     st.title("🐔 Poultry Disease Detector")
     
@@ -78,76 +98,248 @@ def main():
         st.write("- Newcastle Disease")
         st.write("- Healthy Status")
 
+        if loader is not None:
+            st.divider()
+            if not loader.ready():
+                st.caption("Model: loading in the background...")
+            elif loader.model is not None:
+                st.caption(f"Model: ready (started in {loader.timings['total']:.1f}s)")
+
+            st.markdown("### Analysis Options")
+            use_tta = st.checkbox(
+                "Test-time augmentation",
+                help="Average predictions over flipped, rotated and cropped views for steadier confidence"
+            )
+            budget_ms = st.number_input(
+                "Latency budget (ms)", min_value=100, max_value=30000, value=2000, step=100,
+                help="TTA is skipped automatically when it would take longer than this"
+            )
+
     # Main content
     col1, col2 = st.columns([1, 1])
     
     with col1:
         st.markdown("### Upload Image")
         st.info("Remember: This tool provides preliminary analysis only. Always verify results with a veterinarian.", icon="ℹ️")
-        uploaded_file = st.file_uploader(
-            "Choose a poultry image...", 
+        uploaded_files = st.file_uploader(
+            "Choose poultry images...", 
             type=["jpg", "jpeg", "png"],
-            help="Upload a clear image of the poultry matter for accurate detection"
+            accept_multiple_files=True,
+            help="Upload clear images of the poultry matter for accurate detection"
         )
 
-    # Process image and show results
-    if uploaded_file is not None:
-        model = load_model()
-        
-        if model is None:
-            st.error("❌ Model not loaded. Please check the model path and try again.")
+    # Process images and show results
+    if uploaded_files:
+        if SERVER_URL:
+            predict = partial(predict_remote, SERVER_URL)
         else:
-            try:
-                # Display the uploaded image
-                with col1:
-                    image_display = Image.open(uploaded_file)
-                    st.image(image_display, caption="Uploaded Image", use_container_width=True)
-
-                # Process the image
-                img = image.load_img(uploaded_file, target_size=(224, 224))
-                img_array = image.img_to_array(img)
-                img_array = np.expand_dims(img_array, axis=0)
-                img_array /= 255.0
-
-                # Make prediction
-                prediction = model.predict(img_array)
-                predicted_class = np.argmax(prediction[0])
-                confidence_score = float(np.max(prediction[0]))
-                
-                class_names = ['coccidiosis', 'healthy', 'newcastle']
-                prediction_result = class_names[predicted_class]
-
-                # Display results
-                with col2:
-                    st.markdown("### Analysis Results")
-                    
-                    # Status indicator
-                    status_color = "green" if prediction_result == "healthy" else "red"
-                    st.markdown(f"**Status:** <span style='color:{status_color}'>{prediction_result.title()}</span>", 
-                              unsafe_allow_html=True)
-                    
-                    # Confidence score
-                    st.progress(confidence_score)
-                    st.markdown(f"**Confidence Score:** {confidence_score:.2%}")
-                    
-                    # Recommendations
-                    st.markdown("### Recommendations")
-                    if prediction_result == "healthy":
-                        st.success("✅ Your poultry appears to be healthy! Continue with regular care.")
-                    else:
-                        st.warning(f"⚠️ Potential {prediction_result} disease detected!")
-                        st.markdown("""
-                        **Immediate Actions:**
-                        1. Isolate affected birds
-                        2. Contact a veterinarian
-                        3. Monitor other birds for symptoms
-                        """)
-
-                logger.info(f"Prediction made: {prediction_result} with confidence {confidence_score:.2f}")
-
-            except Exception as e:
-                logger.error(f"Error processing image: {e}")
-                st.error("❌ Error processing image. Please try again with a different image.")
+            if not loader.ready():
+                with st.spinner("Loading model..."):
+                    loader.get()
+            model = loader.model
+            if model is None:
+                st.error(f"❌ Model not loaded: {loader.error}. Set PDETECT_MODEL_PATH and restart the app.")
+                return
+            predict = partial(run_batch, model)
+        variant = ''
+        if not SERVER_URL and use_tta:
+            # cost estimate per session; it rises when the shared model is busy.
+            # Decided once here, so results are cached under the mode that actually runs
+            budget = st.session_state.setdefault('latency_budget', LatencyBudget())
+            budget.budget_ms = budget_ms
+            if budget.allows(len(TTA_VIEWS) * len(uploaded_files)):
+                variant = 'tta'
+                predict = partial(run_tta, model, budget=budget)
+            else:
+                st.caption("⏱️ Test-time augmentation skipped: over the latency budget")
+                # single passes still update the estimate, so TTA comes back when load drops
+                predict = partial(run_batch, model, budget=budget)
+        prediction_cache = get_prediction_cache()
+        predict = partial(cached_predict, prediction_cache, predict, variant=variant)
+
+        if len(uploaded_files) == 1:
+            analyze_single(predict, uploaded_files[0], variant, col1, col2)
+        else:
+            analyze_batch(predict, uploaded_files, variant, col2)
+
+        # Cache counters (rendered after the analysis so they include it)
+        with st.sidebar:
+            stats = prediction_cache.stats()
+            st.divider()
+            st.markdown("### Prediction Cache")
+            st.write(f"- Memory hits: {stats['memory_hits']}")
+            st.write(f"- Disk hits: {stats['disk_hits']}")
+            st.write(f"- Misses: {stats['misses']}")
+            st.write(f"- Hit rate: {stats['hit_rate']:.0%}")
+
+    show_history()
+
+
+def session_results() -> dict:
+    """
+    Results computed in this session, keyed by (upload file_id, prediction variant).
+
+    Streamlit reruns the whole script on every widget interaction; uploads
+    found here are only re-rendered, not decoded and predicted again.
+    """
+    if "results" not in st.session_state:
+        st.session_state.results = {}
+        st.session_state.history = []
+    return st.session_state.results
+
+
+def remember_result(uploaded_file, variant, prediction_result, confidence_score, thumbnail=None):
+    """Store a new result for reruns and append it to the session history"""
+    record = {
+        "Time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "Image": uploaded_file.name,
+        "Status": prediction_result,
+        "Confidence": confidence_score,
+        "Mode": "TTA" if variant == "tta" else "Standard",
+        "thumbnail": thumbnail,
+    }
+    session_results()[(uploaded_file.file_id, variant)] = record
+    st.session_state.history.append(record)
+    return record
+
+
+def history_csv(history: list) -> str:
+    """Session history as CSV text (thumbnails left out)"""
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=["Time", "Image", "Status", "Confidence", "Mode"], extrasaction="ignore")
+    writer.writeheader()
+    for record in history:
+        writer.writerow({**record, "Confidence": f"{record['Confidence']:.4f}"})
+    return output.getvalue()
+
+
+def show_history():
+    """Render the analyses made in this session, with a CSV download"""
+    session_results()
+    history = st.session_state.history
+    if not history:
+        return
+
+    st.divider()
+    with st.expander(f"📋 Session History ({len(history)} analyses)"):
+        st.dataframe(
+            [
+                {
+                    "Time": record["Time"],
+                    "Image": record["Image"],
+                    "Status": record["Status"].title(),
+                    "Confidence": f"{record['Confidence']:.2%}",
+                    "Mode": record["Mode"],
+                }
+                for record in reversed(history)
+            ],
+            use_container_width=True,
+        )
+        st.download_button(
+            "Download CSV",
+            data=history_csv(history),
+            file_name="pdetect_history.csv",
+            mime="text/csv",
+        )
+
+
+def show_result(prediction_result, confidence_score):
+    """Render the status, confidence and recommendations for one prediction"""
+    # Status indicator
+    status_color = "green" if prediction_result == "healthy" else "red"
+    st.markdown(f"**Status:** <span style='color:{status_color}'>{prediction_result.title()}</span>", 
+              unsafe_allow_html=True)
+    
+    # Confidence score
+    st.progress(confidence_score)
+    st.markdown(f"**Confidence Score:** {confidence_score:.2%}")
+    
+    # Recommendations
+    st.markdown("### Recommendations")
+    if prediction_result == "healthy":
+        st.success("✅ Your poultry appears to be healthy! Continue with regular care.")
+    else:
+        st.warning(f"⚠️ Potential {prediction_result} disease detected!")
+        st.markdown("""
+        **Immediate Actions:**
+        1. Isolate affected birds
+        2. Contact a veterinarian
+        3. Monitor other birds for symptoms
+        """)
+
+
+def analyze_single(predict, uploaded_file, variant, col1, col2):
+    """Classify one uploaded image and show the detailed result"""
+    try:
+        record = session_results().get((uploaded_file.file_id, variant))
+        if record is None:
+            # The upload itself goes to the cache, keyed on its file bytes as in
+            # analyze_batch; it is only decoded for the model on a cache miss
+            [(prediction_result, confidence_score)], _ = predict([uploaded_file])
+
+            thumbnail = decode_image(uploaded_file)
+            thumbnail.thumbnail((512, 512))
+            record = remember_result(uploaded_file, variant, prediction_result, confidence_score, thumbnail)
+            logger.info(f"Prediction made: {prediction_result} with confidence {confidence_score:.2f}")
+
+        # Display the uploaded image
+        with col1:
+            st.image(record["thumbnail"], caption="Uploaded Image", use_container_width=True)
+
+        # Display results
+        with col2:
+            st.markdown("### Analysis Results")
+            show_result(record["Status"], record["Confidence"])
+
+    except Exception as e:
+        logger.error(f"Error processing image: {e}")
+        st.error("❌ Error processing image. Please try again with a different image.")
+
+
+def analyze_batch(predict, uploaded_files, variant, col2):
+    """Classify several uploaded images in batches and show a summary table"""
+    try:
+        results = session_results()
+        # only uploads not seen in this session go to the model
+        pending = [
+            uploaded_file for uploaded_file in uploaded_files
+            if (uploaded_file.file_id, variant) not in results
+        ]
+        images_per_sec = None
+        if pending:
+            with st.spinner(f"Analyzing {len(pending)} images..."):
+                predictions, images_per_sec = predict(pending)
+            for uploaded_file, (prediction_result, confidence_score) in zip(pending, predictions):
+                remember_result(uploaded_file, variant, prediction_result, confidence_score)
+            logger.info(f"Batch prediction made for {len(pending)} images at {images_per_sec:.1f} images/sec")
+
+        records = [results[(uploaded_file.file_id, variant)] for uploaded_file in uploaded_files]
+
+        with col2:
+            st.markdown("### Analysis Results")
+            if images_per_sec is not None:
+                st.metric("Throughput", f"{images_per_sec:.1f} images/sec")
+            st.dataframe(
+                [
+                    {
+                        "Image": record["Image"],
+                        "Status": record["Status"].title(),
+                        "Confidence": f"{record['Confidence']:.2%}",
+                    }
+                    for record in records
+                ],
+                use_container_width=True,
+            )
+
+            flagged = sum(1 for record in records if record["Status"] != "healthy")
+            if flagged:
+                st.warning(f"⚠️ {flagged} of {len(records)} images show potential disease. Contact a veterinarian.")
+            else:
+                st.success("✅ All analyzed images appear healthy! Continue with regular care.")
+
+    except Exception as e:
+        logger.error(f"Error processing images: {e}")
+        st.error("❌ Error processing images. Please try again with different images.")
 
 if __name__ == "__main__":
     main()
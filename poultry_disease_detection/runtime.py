@@ -0,0 +1,254 @@
+"""
+Model runtimes for the poultry disease detector.
+
+The full-precision .keras model runs in eager Keras. For CPU-only edge
+boxes, export_model.py writes quantized TFLite files next to it
+(pdisease_detector.int8.tflite, pdisease_detector.float16.tflite), and
+load_runtime() picks one of them when present. Both runtimes expose
+predict_on_batch, so inference.py and server.py work with either.
+"""
+
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RUNTIMES = ('auto', 'keras', 'tflite')
+# preferred order when several exported artifacts exist
+QUANTIZATIONS = ('int8', 'float16', 'dynamic', 'float32')
+
+
+def tflite_path(model_path: str, quantization: str) -> str:
+    """
+    Path of the TFLite artifact exported from a .keras model.
+
+    Args:
+        model_path (str): Path to the .keras model
+        quantization (str): One of QUANTIZATIONS
+
+    Returns:
+        str: e.g. model_files/pdisease_detector.int8.tflite
+    """
+    stem, _ = os.path.splitext(model_path)
+    return f'{stem}.{quantization}.tflite'
+
+
+def find_tflite(model_path: str) -> str:
+    """
+    Find an exported TFLite artifact for a .keras model.
+
+    Returns:
+        str: Path of the preferred artifact, or None if none was exported
+    """
+    if model_path.endswith('.tflite'):
+        return model_path if os.path.isfile(model_path) else None
+    for quantization in QUANTIZATIONS:
+        path = tflite_path(model_path, quantization)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+class TFLiteModel:
+    """
+    TFLite interpreter with the Keras predict_on_batch interface.
+
+    Quantized (int8) input and output tensors are converted from and to
+    float32, so callers always pass normalized images and get probabilities.
+
+    Args:
+        path (str): Path to the .tflite file
+        num_threads (int): CPU threads used by the interpreter (None for default)
+    """
+
+    def __init__(self, path: str, num_threads: int = None):
+        import tensorflow as tf
+
+        self.path = path
+        self.interpreter = tf.lite.Interpreter(model_path=path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self.batch_size = int(self.input['shape'][0])
+        # the interpreter is not thread-safe and the app shares one instance
+        self.lock = threading.Lock()
+
+    def _resize(self, batch_size: int):
+        self.interpreter.resize_tensor_input(self.input['index'], [batch_size, *self.input['shape'][1:]])
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self.batch_size = batch_size
+
+    def predict_on_batch(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Run the interpreter on a batch of preprocessed images.
+
+        Args:
+            batch (np.ndarray): float32 array of shape (n, 224, 224, 3)
+
+        Returns:
+            np.ndarray: Class probabilities of shape (n, number of classes)
+        """
+        with self.lock:
+            if len(batch) != self.batch_size:
+                self._resize(len(batch))
+
+            dtype = self.input['dtype']
+            if dtype != np.float32:
+                scale, zero_point = self.input['quantization']
+                batch = np.clip(np.round(batch / scale + zero_point),
+                                np.iinfo(dtype).min, np.iinfo(dtype).max).astype(dtype)
+            self.interpreter.set_tensor(self.input['index'], batch)
+            self.interpreter.invoke()
+            output = self.interpreter.get_tensor(self.output['index'])
+
+            if output.dtype != np.float32:
+                scale, zero_point = self.output['quantization']
+                output = (output.astype(np.float32) - zero_point) * scale
+            return output
+
+
+def resolve_model_file(model_path: str, runtime: str = 'auto') -> str:
+    """
+    Path of the file load_runtime() would load.
+
+    Args:
+        model_path (str): Path to the .keras model (or directly to a .tflite file)
+        runtime (str): One of RUNTIMES
+
+    Returns:
+        str: The .tflite artifact or the .keras model
+
+    Raises:
+        ValueError: If the runtime is unknown
+        FileNotFoundError: If runtime='tflite' and no artifact was exported
+    """
+    if runtime not in RUNTIMES:
+        raise ValueError(f"Unknown runtime '{runtime}', expected one of {RUNTIMES}")
+    if runtime in ('auto', 'tflite'):
+        path = find_tflite(model_path)
+        if path is not None:
+            return path
+        if runtime == 'tflite':
+            raise FileNotFoundError(f"No TFLite export found for {model_path}; run export_model.py first")
+    return model_path
+
+
+def load_runtime(model_path: str, runtime: str = 'auto', num_threads: int = None):
+    """
+    Load the model with the requested runtime.
+
+    'auto' uses an exported TFLite artifact next to the .keras file if one
+    exists (int8 preferred, then float16) and falls back to Keras otherwise.
+
+    Args:
+        model_path (str): Path to the .keras model (or directly to a .tflite file)
+        runtime (str): One of RUNTIMES
+        num_threads (int): CPU threads for the TFLite interpreter
+
+    Returns:
+        Keras model or TFLiteModel
+    """
+    path = resolve_model_file(model_path, runtime)
+    if path.endswith('.tflite'):
+        logger.info(f"Using TFLite runtime: {path}")
+        return TFLiteModel(path, num_threads)
+
+    import keras
+
+    logger.info(f"Using Keras runtime: {path}")
+    return keras.models.load_model(path)
+
+
+def warm_up(model, batch_sizes: tuple = (1,), image_shape: tuple = (224, 224, 3)) -> dict:
+    """
+    Run the model once per batch size on a dummy batch.
+
+    The first predict call traces the graph (Keras) or allocates tensors
+    (TFLite); doing it here keeps that cost away from the first user.
+
+    Args:
+        model: Keras model or TFLiteModel
+        batch_sizes (tuple): Batch sizes that will be used at serving time
+        image_shape (tuple): Shape of one preprocessed image
+
+    Returns:
+        dict: Seconds taken per batch size
+    """
+    timings = {}
+    for batch_size in batch_sizes:
+        start = time.perf_counter()
+        model.predict_on_batch(np.zeros((batch_size, *image_shape), dtype=np.float32))
+        timings[batch_size] = time.perf_counter() - start
+        logger.info(f"Warm-up predict (batch {batch_size}): {timings[batch_size]:.2f}s")
+    return timings
+
+
+class BackgroundLoader:
+    """
+    Load and warm up the model on a background thread.
+
+    Started when the app starts, so deserialization and graph tracing are
+    done (or under way) before the first upload arrives.
+
+    Args:
+        model_path (str): Path to the .keras model
+        runtime (str): One of RUNTIMES
+        warm_up_batch_sizes (tuple): Batch sizes to warm up
+    """
+
+    def __init__(self, model_path: str, runtime: str = 'auto', warm_up_batch_sizes: tuple = (1,)):
+        self.model_path = model_path
+        self.runtime = runtime
+        self.warm_up_batch_sizes = warm_up_batch_sizes
+        self.model = None
+        self.error = None
+        self.timings = {}
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._load, name='model-loader', daemon=True)
+        self._thread.start()
+
+    def _load(self):
+        start = time.perf_counter()
+        try:
+            path = resolve_model_file(self.model_path, self.runtime)
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"Model file not found: {path} (set PDETECT_MODEL_PATH)")
+
+            phase = time.perf_counter()
+            model = load_runtime(path, 'tflite' if path.endswith('.tflite') else 'keras')
+            self.timings['load'] = time.perf_counter() - phase
+            logger.info(f"Model deserialized in {self.timings['load']:.2f}s")
+
+            phase = time.perf_counter()
+            warm_up(model, self.warm_up_batch_sizes)
+            self.timings['warm_up'] = time.perf_counter() - phase
+
+            self.model = model
+        except Exception as e:
+            self.error = e
+            logger.error(f"Error loading model: {e}")
+        finally:
+            self.timings['total'] = time.perf_counter() - start
+            logger.info(f"Model startup finished in {self.timings['total']:.2f}s")
+            self._done.set()
+
+    def ready(self) -> bool:
+        """True once loading has finished, successfully or not"""
+        return self._done.is_set()
+
+    def get(self, timeout: float = None):
+        """
+        Wait for the model.
+
+        Returns:
+            The loaded model, or None if loading failed or timed out
+            (the error is kept in self.error)
+        """
+        self._done.wait(timeout)
+        return self.model
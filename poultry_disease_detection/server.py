@@ -0,0 +1,257 @@
+"""
+Local inference server for the poultry disease detector.
+
+The model is loaded once. Incoming images are queued and grouped into
+micro-batches, flushed when max_batch_size images are waiting or the oldest
+has waited max_wait_ms, so concurrent users share predict calls instead of
+competing for the model. Plain asyncio HTTP, no web framework needed:
+
+    python server.py --model pdisease_detector.keras --port 8500
+
+Endpoints:
+    POST /predict   raw image bytes -> {"class", "confidence", "probabilities"}
+    GET  /metrics   latency percentiles, queue depth and batch counters
+    GET  /health    {"status": "ok"}
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+from PIL import Image
+
+from inference import CLASS_NAMES, MODEL_PATH, load_image, predict_batches
+from runtime import RUNTIMES, load_runtime, warm_up
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Queue single-image requests and run them through the model in batches.
+
+    Args:
+        model: Keras model (anything with predict_on_batch)
+        max_batch_size (int): Largest batch sent to the model
+        max_wait_ms (float): Longest time the first queued image waits for
+            others before its batch is flushed
+    """
+
+    def __init__(self, model, max_batch_size: int = 32, max_wait_ms: float = 10.0):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue()
+        # the model runs on one thread so the event loop stays responsive
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.latencies = deque(maxlen=10000)
+        self.requests = 0
+        self.batches = 0
+        self._worker = None
+
+    def start(self):
+        self._worker = asyncio.create_task(self._run())
+
+    async def predict(self, img: np.ndarray) -> np.ndarray:
+        """
+        Queue one preprocessed image and wait for its class probabilities.
+        """
+        future = asyncio.get_running_loop().create_future()
+        start = time.perf_counter()
+        await self.queue.put((img, future))
+        probabilities = await future
+        self.latencies.append(time.perf_counter() - start)
+        self.requests += 1
+        return probabilities
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(items) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            images = [img for img, _ in items]
+            try:
+                probabilities = await loop.run_in_executor(
+                    self.executor, predict_batches, self.model, images, self.max_batch_size
+                )
+            except Exception as e:
+                logger.error(f"Batch prediction failed: {e}")
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            for (_, future), row in zip(items, probabilities):
+                if not future.done():
+                    future.set_result(row)
+
+    def metrics(self) -> dict:
+        latencies = np.array(self.latencies) * 1000.0
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+            'queue_depth': self.queue.qsize(),
+            'latency_p50_ms': float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+            'latency_p99_ms': float(np.percentile(latencies, 99)) if len(latencies) else 0.0,
+        }
+
+
+async def _send(writer, status: str, payload: dict, keep_alive: bool):
+    body = json.dumps(payload).encode()
+    headers = (
+        f"HTTP/1.1 {status}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(headers.encode() + body)
+    await writer.drain()
+
+
+def make_handler(batcher: MicroBatcher):
+    """
+    Build the asyncio connection handler serving /predict, /metrics and /health.
+    """
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                keep_alive = headers.get('connection', '').lower() != 'close'
+
+                if method == 'POST' and path == '/predict':
+                    try:
+                        img = await asyncio.to_thread(load_image, io.BytesIO(body))
+                    except Exception as e:
+                        await _send(writer, '400 Bad Request', {'error': f"Invalid image: {e}"}, keep_alive)
+                    else:
+                        probabilities = await batcher.predict(img)
+                        index = int(np.argmax(probabilities))
+                        await _send(writer, '200 OK', {
+                            'class': CLASS_NAMES[index],
+                            'confidence': float(probabilities[index]),
+                            'probabilities': [float(p) for p in probabilities],
+                        }, keep_alive)
+                elif method == 'GET' and path == '/metrics':
+                    await _send(writer, '200 OK', batcher.metrics(), keep_alive)
+                elif method == 'GET' and path == '/health':
+                    await _send(writer, '200 OK', {'status': 'ok'}, keep_alive)
+                else:
+                    await _send(writer, '404 Not Found', {'error': f"No route for {method} {path}"}, keep_alive)
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+            logger.warning(f"Dropping connection: {e}")
+        except Exception as e:
+            logger.error(f"Error handling request: {e}")
+            await _send(writer, '500 Internal Server Error', {'error': str(e)}, False)
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(model, host: str = '127.0.0.1', port: int = 8500,
+                max_batch_size: int = 32, max_wait_ms: float = 10.0):
+    """
+    Run the inference server until cancelled.
+    """
+    batcher = MicroBatcher(model, max_batch_size, max_wait_ms)
+    batcher.start()
+    server = await asyncio.start_server(make_handler(batcher), host, port)
+    logger.info(f"Serving on http://{host}:{port} (batch <= {max_batch_size}, wait <= {max_wait_ms} ms)")
+    async with server:
+        await server.serve_forever()
+
+
+def predict_remote(server_url: str, sources: list, workers: int = 8) -> tuple:
+    """
+    Classify images through a running inference server.
+
+    Requests are sent concurrently so the server can batch them together.
+
+    Args:
+        server_url (str): Base URL of the server, e.g. http://127.0.0.1:8500
+        sources (list): File paths, binary file-like objects or PIL images
+        workers (int): Number of concurrent requests
+
+    Returns:
+        tuple: (list of (class name, confidence) per image, images per second)
+    """
+    def post(source):
+        if isinstance(source, Image.Image):
+            buffer = io.BytesIO()
+            source.save(buffer, format='PNG')
+            data = buffer.getvalue()
+        elif isinstance(source, str):
+            with open(source, 'rb') as file:
+                data = file.read()
+        else:
+            source.seek(0)
+            data = source.read()
+        response = requests.post(f"{server_url}/predict", data=data, timeout=60)
+        response.raise_for_status()
+        result = response.json()
+        return result['class'], result['confidence']
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(post, sources))
+    elapsed = time.perf_counter() - start
+    return results, len(sources) / elapsed if elapsed > 0 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poultry disease inference server")
+    parser.add_argument('--model', default=MODEL_PATH, help="Path to the .keras model")
+    parser.add_argument('--runtime', choices=RUNTIMES, default='auto',
+                        help="auto uses an exported TFLite model when present")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8500)
+    parser.add_argument('--max-batch-size', type=int, default=32)
+    parser.add_argument('--max-wait-ms', type=float, default=10.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    start = time.perf_counter()
+    model = load_runtime(args.model, args.runtime)
+    logger.info(f"Model loaded in {time.perf_counter() - start:.2f}s")
+    # the batcher always predicts full max_batch_size batches
+    warm_up(model, (args.max_batch_size,))
+    asyncio.run(serve(model, args.host, args.port, args.max_batch_size, args.max_wait_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Shared fixtures for the pdetect tests.
+
+The modules are imported flat (as the app and scripts do), and a stub model
+stands in for the .keras file, so no tests need TensorFlow.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# solid colour per class: the stub model predicts the strongest channel
+COLOURS = {'coccidiosis': (255, 0, 0), 'healthy': (0, 255, 0), 'newcastle': (0, 0, 255)}
+
+
+class StubModel:
+    """
+    predict_on_batch stand-in recording every batch it is given.
+
+    Each image is classified by its strongest colour channel (red, green,
+    blue -> CLASS_NAMES order) with confidence 0.8.
+
+    Args:
+        error (Exception): Raised by every predict call when set
+    """
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.batches = []
+
+    def predict_on_batch(self, batch: np.ndarray) -> np.ndarray:
+        self.batches.append(batch.copy())
+        if self.error is not None:
+            raise self.error
+        probabilities = np.full((len(batch), 3), 0.1, dtype=np.float32)
+        probabilities[np.arange(len(batch)), batch.mean(axis=(1, 2)).argmax(axis=1)] = 0.8
+        return probabilities
+
+
+@pytest.fixture
+def stub_model():
+    return StubModel()
+
+
+@pytest.fixture
+def make_image():
+    """Solid-colour image of a class, at a size other than the model input"""
+
+    def make(label: str, size: tuple = (300, 200)) -> Image.Image:
+        return Image.new('RGB', size, COLOURS[label])
+
+    return make
@@ -0,0 +1,50 @@
+import io
+
+from PIL import Image
+
+from cache import PredictionCache, _read_bytes, cached_predict
+
+
+def image_file(image) -> io.BytesIO:
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    buffer.seek(0)
+    return buffer
+
+
+def test_upload_and_path_share_a_key(make_image, tmp_path):
+    cache = PredictionCache(str(tmp_path / 'missing.keras'))
+    upload = image_file(make_image('healthy'))
+    path = tmp_path / 'photo.png'
+    path.write_bytes(upload.getvalue())
+
+    assert cache.key(_read_bytes(upload)) == cache.key(_read_bytes(str(path)))
+    # reading the key leaves the upload ready to be decoded
+    assert upload.tell() == 0
+
+
+def test_pixel_keys_include_size_and_mode():
+    wide = Image.frombytes('L', (4, 2), bytes(range(8)))
+    tall = Image.frombytes('L', (2, 4), bytes(range(8)))
+    palette = Image.frombytes('P', (4, 2), bytes(range(8)))
+
+    assert len({_read_bytes(wide), _read_bytes(tall), _read_bytes(palette)}) == 3
+
+
+def test_cached_upload_is_not_predicted_again(make_image, tmp_path):
+    cache = PredictionCache(str(tmp_path / 'missing.keras'))
+    calls = []
+
+    def predict(sources):
+        calls.append(len(sources))
+        return [('healthy', 0.8)] * len(sources), 1.0
+
+    photo = make_image('healthy')
+    first, _ = cached_predict(cache, predict, [image_file(photo)])
+    # the same photo uploaded again, on its own and in a batch
+    second, _ = cached_predict(cache, predict, [image_file(photo)])
+    third, _ = cached_predict(cache, predict, [image_file(photo), image_file(make_image('newcastle'))])
+
+    assert first == second == third[:1] == [('healthy', 0.8)]
+    assert calls == [1, 1]
+    assert cache.stats()['memory_hits'] == 2
@@ -0,0 +1,135 @@
+import io
+
+import numpy as np
+import pytest
+from conftest import StubModel
+from PIL import Image
+
+from inference import IMAGE_SIZE, TTA_VIEWS, LatencyBudget, predict_batches, run_batch, run_tta
+
+LABELS = ['coccidiosis', 'healthy', 'newcastle']
+
+
+def test_run_batch_pads_last_batch_to_configured_size(stub_model, make_image):
+    labels = [LABELS[i % 3] for i in range(9)]
+    results, images_per_sec = run_batch(stub_model, [make_image(label) for label in labels], batch_size=4)
+
+    assert [label for label, _ in results] == labels
+    assert all(confidence == pytest.approx(0.8) for _, confidence in results)
+    assert images_per_sec > 0
+    # 4 + 4 + 1 images, every call at the configured shape
+    assert [batch.shape for batch in stub_model.batches] == [(4, *IMAGE_SIZE, 3)] * 3
+
+
+def test_run_batch_zeroes_padding_of_reused_buffer(stub_model, make_image):
+    # the third batch reuses the first (full) buffer: stale images must not leak into the padding
+    run_batch(stub_model, [make_image('healthy') for _ in range(9)], batch_size=4)
+
+    last = stub_model.batches[-1]
+    assert last[0].max() == pytest.approx(1.0)
+    assert not last[1:].any()
+
+
+def test_run_batch_few_images_keep_batch_shape(stub_model, make_image):
+    run_batch(stub_model, [make_image('newcastle'), make_image('healthy')], batch_size=32)
+
+    assert [batch.shape[0] for batch in stub_model.batches] == [32]
+
+
+def test_run_batch_single_image_uses_batch_of_one(stub_model, make_image):
+    [(label, _)], _ = run_batch(stub_model, [make_image('coccidiosis')], batch_size=32)
+
+    assert label == 'coccidiosis'
+    assert [batch.shape[0] for batch in stub_model.batches] == [1]
+
+
+def test_run_batch_accepts_paths_and_uploads(stub_model, make_image, tmp_path):
+    path = tmp_path / 'healthy.jpg'
+    make_image('healthy').save(path)
+    upload = io.BytesIO()
+    make_image('newcastle').save(upload, format='PNG')
+
+    results, _ = run_batch(stub_model, [str(path), upload], batch_size=2)
+
+    assert [label for label, _ in results] == ['healthy', 'newcastle']
+
+
+def test_run_batch_empty(stub_model):
+    results, _ = run_batch(stub_model, [], batch_size=4)
+
+    assert results == []
+    assert stub_model.batches == []
+
+
+def test_run_batch_invalid_image_raises(stub_model, make_image):
+    with pytest.raises(Image.UnidentifiedImageError):
+        run_batch(stub_model, [make_image('healthy'), io.BytesIO(b'not an image')], batch_size=2)
+
+
+def test_run_batch_model_error_propagates(make_image):
+    model = StubModel(error=RuntimeError('model failed'))
+
+    with pytest.raises(RuntimeError, match='model failed'):
+        run_batch(model, [make_image('healthy'), make_image('newcastle')], batch_size=2)
+
+
+def test_predict_batches_pads_and_trims(stub_model):
+    images = [np.full((*IMAGE_SIZE, 3), 0.5, dtype=np.float32) for _ in range(5)]
+
+    probabilities = predict_batches(stub_model, images, batch_size=4)
+
+    assert probabilities.shape == (5, 3)
+    assert [batch.shape[0] for batch in stub_model.batches] == [4, 4]
+    assert not stub_model.batches[-1][1:].any()
+
+
+def test_run_tta_keeps_batch_shape_and_averages_views(stub_model, make_image):
+    labels = ['newcastle', 'healthy', 'coccidiosis', 'healthy', 'newcastle']
+    budget = LatencyBudget(budget_ms=1e9)
+
+    results, _ = run_tta(stub_model, [make_image(label) for label in labels], batch_size=32, budget=budget)
+
+    assert [label for label, _ in results] == labels
+    # 4 images x 8 views per call, the second call padded to the same shape
+    assert [batch.shape for batch in stub_model.batches] == [(32, *IMAGE_SIZE, 3)] * 2
+    assert not stub_model.batches[-1][len(TTA_VIEWS):].any()
+    assert budget.seconds_per_view is not None
+
+
+def test_run_tta_never_falls_back_on_its_own(stub_model, make_image):
+    # the caller decides the variant; an exhausted budget is only updated
+    budget = LatencyBudget(budget_ms=0.0)
+    budget.seconds_per_view = 1.0
+
+    run_tta(stub_model, [make_image('healthy')], batch_size=32, budget=budget)
+
+    assert budget.seconds_per_view < 1.0
+
+
+def test_run_tta_sizes_batch_to_the_images(stub_model, make_image):
+    # one image is one call of its views, not a batch padded to batch_size
+    run_tta(stub_model, [make_image('healthy')], batch_size=32)
+    run_tta(stub_model, [make_image('healthy')] * 3, batch_size=32)
+
+    assert [batch.shape[0] for batch in stub_model.batches] == [len(TTA_VIEWS), 3 * len(TTA_VIEWS)]
+
+
+def test_budget_records_rows_sent(stub_model, make_image, monkeypatch):
+    clock = iter([0.0, 0.8, 10.0, 10.8])
+    monkeypatch.setattr('inference.time.perf_counter', lambda: next(clock))
+
+    budget = LatencyBudget(smoothing=1.0)
+    run_tta(stub_model, [make_image('healthy')], batch_size=32, budget=budget)
+    assert budget.seconds_per_view == pytest.approx(0.8 / len(TTA_VIEWS))
+
+    # 2 images padded to a batch of 4 rows
+    run_batch(stub_model, [make_image('healthy'), make_image('newcastle')], batch_size=4, budget=budget)
+    assert budget.seconds_per_view == pytest.approx(0.8 / 4)
+
+
+def test_run_batch_records_budget(stub_model, make_image):
+    budget = LatencyBudget()
+
+    run_batch(stub_model, [make_image('healthy'), make_image('newcastle')], batch_size=4, budget=budget)
+
+    assert budget.seconds_per_view is not None
@@ -0,0 +1,90 @@
+import asyncio
+import io
+import json
+
+import numpy as np
+import pytest
+from conftest import StubModel
+
+from inference import IMAGE_SIZE, load_image
+from server import MicroBatcher, make_handler
+
+
+def image_bytes(image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def test_micro_batcher_groups_concurrent_requests(stub_model, make_image):
+    images = [load_image(make_image(label)) for label in ['healthy', 'newcastle'] * 3]
+
+    async def run():
+        batcher = MicroBatcher(stub_model, max_batch_size=4, max_wait_ms=50)
+        batcher.start()
+        results = await asyncio.gather(*(batcher.predict(img) for img in images))
+        return batcher, results
+
+    batcher, results = asyncio.run(run())
+
+    assert [int(np.argmax(row)) for row in results] == [1, 2] * 3
+    # 6 requests in two calls, both padded to the batch size
+    assert batcher.batches == 2
+    assert [batch.shape for batch in stub_model.batches] == [(4, *IMAGE_SIZE, 3)] * 2
+    metrics = batcher.metrics()
+    assert metrics['requests'] == 6
+    assert metrics['mean_batch_size'] == 3
+    assert metrics['queue_depth'] == 0
+
+
+def test_micro_batcher_model_error_fails_batch_and_keeps_serving(make_image):
+    img = load_image(make_image('healthy'))
+    model = StubModel(error=RuntimeError('model failed'))
+
+    async def run():
+        batcher = MicroBatcher(model, max_batch_size=2, max_wait_ms=1)
+        batcher.start()
+        with pytest.raises(RuntimeError, match='model failed'):
+            await batcher.predict(img)
+        model.error = None
+        return await batcher.predict(img)
+
+    assert int(np.argmax(asyncio.run(run()))) == 1
+
+
+async def _request(port: int, method: str, path: str, body: bytes = b'') -> tuple:
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(payload)
+
+
+def test_http_endpoints(stub_model, make_image):
+    async def run():
+        batcher = MicroBatcher(stub_model, max_batch_size=4, max_wait_ms=1)
+        batcher.start()
+        server = await asyncio.start_server(make_handler(batcher), '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return (
+                await _request(port, 'POST', '/predict', image_bytes(make_image('newcastle'))),
+                await _request(port, 'POST', '/predict', b'not an image'),
+                await _request(port, 'GET', '/metrics'),
+                await _request(port, 'GET', '/health'),
+                await _request(port, 'GET', '/missing'),
+            )
+
+    predicted, invalid, metrics, health, missing = asyncio.run(run())
+
+    assert predicted[0] == 200
+    assert predicted[1]['class'] == 'newcastle'
+    assert predicted[1]['confidence'] == pytest.approx(0.8)
+    assert invalid[0] == 400 and 'Invalid image' in invalid[1]['error']
+    assert metrics[0] == 200 and metrics[1]['requests'] == 1
+    assert health == (200, {'status': 'ok'})
+    assert missing[0] == 404
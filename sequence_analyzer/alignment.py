@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+
+"""
+Pairwise sequence alignment (global Needleman-Wunsch, local Smith-Waterman)
+with affine gap scores, in linear memory.
+
+A gap of length L scores gap_open + (L - 1) * gap_extend, as in Biopython's
+PairwiseAligner. Internally this is written g + h * L with g = gap_open - gap_extend
+and h = gap_extend.
+
+Scores are computed one DP row at a time with NumPy. Within a row, the
+horizontal gap state is a running maximum (np.maximum.accumulate) over the
+row, so no Python loop runs over columns and only O(min(m, n)) values are
+kept. Full alignments use the Myers-Miller (affine Hirschberg)
+divide-and-conquer traceback, which also stays in linear memory.
+"""
+
+import sys
+
+import numpy as np
+
+from timing import count, stage
+
+# recursion depth grows with log2(len(seq)), plus a small constant per level
+sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+
+NEG_INF = -np.inf
+
+
+class Scoring:
+    """
+    Alignment scores. Gap scores are negative; gap_open is the score of the
+    first gap position and must not be higher than gap_extend.
+    """
+
+    def __init__(
+        self,
+        match: float = 2,
+        mismatch: float = -1,
+        gap_open: float = -5,
+        gap_extend: float = -1,
+    ):
+        if gap_open > gap_extend:
+            raise ValueError("gap_open must not score higher than gap_extend")
+        self.match = match
+        self.mismatch = mismatch
+        self.gap_open = gap_open
+        self.gap_extend = gap_extend
+        # gap of length L scores g + h * L
+        self.g = gap_open - gap_extend
+        self.h = gap_extend
+
+    def gap(self, length: int) -> float:
+        """Score of a single gap of the given length (0 for no gap)"""
+        return self.g + self.h * length if length > 0 else 0
+
+
+def _encode(seq: str) -> np.ndarray:
+    with stage("encode"):
+        codes = np.frombuffer(seq.upper().encode("ascii"), dtype=np.uint8)
+    count("bases", len(codes))
+    return codes
+
+
+def _last_row(a: np.ndarray, b: np.ndarray, tb: float, scoring: Scoring) -> tuple:
+    """
+    Global affine DP of a (rows) against b (columns), keeping one row
+
+    Args:
+        a (np.ndarray): Row sequence codes
+        b (np.ndarray): Column sequence codes
+        tb (float): Open score for a vertical gap starting at the top-left
+            corner (g normally, 0 when it continues an earlier gap)
+        scoring (Scoring): Alignment scores
+
+    Returns:
+        tuple: (H, F) for the last row; H is the best score ending at each
+            column, F the best score ending in a vertical gap
+    """
+    g, h = scoring.g, scoring.h
+    n = len(b)
+    cols = np.arange(n + 1)
+
+    H = g + h * cols.astype(np.float64)
+    H[0] = 0.0
+    F = np.full(n + 1, NEG_INF)
+    ramp = h * cols  # used to turn the horizontal gap recurrence into a scan
+
+    for i in range(1, len(a) + 1):
+        F = np.maximum(F + h, H + (g + h))
+        subst = np.where(b == a[i - 1], scoring.match, scoring.mismatch)
+
+        H0 = np.empty(n + 1)
+        H0[0] = F[0] = tb + h * i
+        H0[1:] = np.maximum(H[:-1] + subst, F[1:])
+
+        # E[j] = max over k < j of H0[k] + g + h * (j - k)
+        best = np.maximum.accumulate(H0 - ramp)
+        E = np.full(n + 1, NEG_INF)
+        E[1:] = best[:-1] + g + ramp[1:]
+
+        H = np.maximum(H0, E)
+    return H, F
+
+
+def _local_best(
+    a: np.ndarray, b: np.ndarray, scoring: Scoring, anchored: bool = False
+) -> tuple:
+    """
+    Local affine DP keeping one row, tracking the best cell
+
+    Args:
+        a (np.ndarray): Row sequence codes
+        b (np.ndarray): Column sequence codes
+        scoring (Scoring): Alignment scores
+        anchored (bool): Only allow alignments starting at the top-left
+            corner (used to find where a known local alignment starts)
+
+    Returns:
+        tuple: (best score, row end, column end) of the best alignment
+    """
+    g, h = scoring.g, scoring.h
+    n = len(b)
+    cols = np.arange(n + 1)
+    ramp = h * cols
+    floor = NEG_INF if anchored else 0.0
+
+    if anchored:
+        H = g + h * cols.astype(np.float64)
+        H[0] = 0.0
+    else:
+        H = np.zeros(n + 1)
+    F = np.full(n + 1, NEG_INF)
+    best_score, best_i, best_j = 0.0, 0, 0
+
+    for i in range(1, len(a) + 1):
+        F = np.maximum(F + h, H + (g + h))
+        subst = np.where(b == a[i - 1], scoring.match, scoring.mismatch)
+
+        H0 = np.empty(n + 1)
+        H0[0] = g + h * i if anchored else 0.0
+        H0[1:] = np.maximum(np.maximum(H[:-1] + subst, F[1:]), floor)
+
+        best = np.maximum.accumulate(H0 - ramp)
+        E = np.full(n + 1, NEG_INF)
+        E[1:] = best[:-1] + g + ramp[1:]
+
+        H = np.maximum(H0, E)
+        j = int(np.argmax(H))
+        if H[j] > best_score:
+            best_score, best_i, best_j = float(H[j]), i, j
+    return best_score, best_i, best_j
+
+
+def align_score(
+    seq1: str, seq2: str, mode: str = "global", scoring: Scoring = None
+) -> float:
+    """
+    Score the optimal alignment of two sequences without building it
+
+    Memory is O(min(len(seq1), len(seq2))): the shorter sequence is used as
+    the DP row.
+
+    Args:
+        seq1 (str): First sequence
+        seq2 (str): Second sequence
+        mode (str): "global" (Needleman-Wunsch) or "local" (Smith-Waterman)
+        scoring (Scoring): Alignment scores (defaults to Scoring())
+
+    Returns:
+        float: Optimal alignment score
+    """
+    scoring = scoring or Scoring()
+    a, b = _encode(seq1), _encode(seq2)
+    if len(b) > len(a):
+        a, b = b, a
+
+    if mode == "global":
+        if len(a) == 0:
+            return float(scoring.gap(len(b)))
+        with stage("align_score"):
+            H, _ = _last_row(a, b, scoring.g, scoring)
+        return float(H[-1])
+    if mode == "local":
+        with stage("align_score"):
+            return _local_best(a, b, scoring)[0]
+    raise ValueError(f"Invalid alignment mode: {mode}. Must be 'global' or 'local'")
+
+
+def _myers_miller(
+    a: np.ndarray,
+    b: np.ndarray,
+    tb: float,
+    te: float,
+    scoring: Scoring,
+    out1: list,
+    out2: list,
+    a_str: str,
+    b_str: str,
+    a_off: int,
+    b_off: int,
+) -> None:
+    """
+    Append the optimal global alignment of a and b to out1/out2
+
+    tb / te are the open scores of a vertical gap touching the start / end
+    of this sub-problem (0 when it joins a gap opened by the caller).
+    a_str / b_str with a_off / b_off give the original letters for output.
+    """
+    m, n = len(a), len(b)
+    g, h = scoring.g, scoring.h
+
+    if n == 0:
+        out1.append(a_str[a_off : a_off + m])
+        out2.append("-" * m)
+        return
+    if m == 0:
+        out1.append("-" * n)
+        out2.append(b_str[b_off : b_off + n])
+        return
+
+    if m == 1:
+        # either delete a[0] (joining the cheaper boundary gap) and insert b,
+        # or align a[0] against one b[j] with insertions either side
+        open_score = max(tb, te)
+        cols = np.arange(n)
+        scores = (
+            np.where(cols > 0, g + h * cols, 0)
+            + np.where(b == a[0], scoring.match, scoring.mismatch)
+            + np.where(cols < n - 1, g + h * (n - 1 - cols), 0)
+        )
+        best_j = int(np.argmax(scores))
+        if scores[best_j] < open_score + h + scoring.gap(n):
+            best_j = -1
+
+        letter = a_str[a_off]
+        if best_j < 0:
+            if tb >= te:
+                out1.append(letter + "-" * n)
+                out2.append("-" + b_str[b_off : b_off + n])
+            else:
+                out1.append("-" * n + letter)
+                out2.append(b_str[b_off : b_off + n] + "-")
+        else:
+            out1.append("-" * best_j + letter + "-" * (n - best_j - 1))
+            out2.append(b_str[b_off : b_off + n])
+        return
+
+    mid = m // 2
+    CC, DD = _last_row(a[:mid], b, tb, scoring)
+    RR, SS = _last_row(a[mid:][::-1], b[::-1], te, scoring)
+    RR, SS = RR[::-1], SS[::-1]
+
+    # type 1: the path crosses row mid at column j
+    # type 2: a vertical gap runs through rows mid and mid + 1 at column j
+    joined = CC + RR
+    gapped = DD + SS - g
+    j1 = int(np.argmax(joined))
+    j2 = int(np.argmax(gapped))
+
+    if joined[j1] >= gapped[j2]:
+        _myers_miller(
+            a[:mid], b[:j1], tb, g, scoring, out1, out2, a_str, b_str, a_off, b_off
+        )
+        _myers_miller(
+            a[mid:], b[j1:], g, te, scoring, out1, out2,
+            a_str, b_str, a_off + mid, b_off + j1,
+        )
+    else:
+        _myers_miller(
+            a[: mid - 1], b[:j2], tb, 0, scoring, out1, out2,
+            a_str, b_str, a_off, b_off,
+        )
+        out1.append(a_str[a_off + mid - 1 : a_off + mid + 1])
+        out2.append("--")
+        _myers_miller(
+            a[mid + 1 :], b[j2:], 0, te, scoring, out1, out2,
+            a_str, b_str, a_off + mid + 1, b_off + j2,
+        )
+
+
+def score_alignment(aligned1: str, aligned2: str, scoring: Scoring) -> float:
+    """
+    Score a gapped pairwise alignment
+
+    Args:
+        aligned1 (str): First aligned sequence (gaps as "-")
+        aligned2 (str): Second aligned sequence (gaps as "-")
+        scoring (Scoring): Alignment scores
+
+    Returns:
+        float: Alignment score
+    """
+    score = 0
+    gap_in = None  # which sequence the current gap is in
+    for x, y in zip(aligned1, aligned2):
+        if x == "-" or y == "-":
+            side = 1 if x == "-" else 2
+            score += scoring.gap_extend if gap_in == side else scoring.gap_open
+            gap_in = side
+        else:
+            score += scoring.match if x.upper() == y.upper() else scoring.mismatch
+            gap_in = None
+    return float(score)
+
+
+def align(
+    seq1: str, seq2: str, mode: str = "global", scoring: Scoring = None
+) -> dict:
+    """
+    Optimal pairwise alignment in linear memory
+
+    Args:
+        seq1 (str): First sequence
+        seq2 (str): Second sequence
+        mode (str): "global" (Needleman-Wunsch) or "local" (Smith-Waterman)
+        scoring (Scoring): Alignment scores (defaults to Scoring())
+
+    Returns:
+        dict: score, aligned_seq1, aligned_seq2 and the aligned ranges
+            seq1_range / seq2_range as (start, end)
+    """
+    scoring = scoring or Scoring()
+    start1, end1, start2, end2 = 0, len(seq1), 0, len(seq2)
+
+    if mode == "local":
+        a, b = _encode(seq1), _encode(seq2)
+        with stage("align_local_end"):
+            score, end1, end2 = _local_best(a, b, scoring)
+        if score <= 0:
+            return {
+                "score": 0.0,
+                "aligned_seq1": "",
+                "aligned_seq2": "",
+                "seq1_range": (0, 0),
+                "seq2_range": (0, 0),
+            }
+        # the best local alignment ending at (end1, end2) starts where an
+        # alignment anchored at that end, run backwards, reaches the same score
+        with stage("align_local_start"):
+            _, rev1, rev2 = _local_best(
+                a[:end1][::-1], b[:end2][::-1], scoring, anchored=True
+            )
+        start1, start2 = end1 - rev1, end2 - rev2
+    elif mode != "global":
+        raise ValueError(f"Invalid alignment mode: {mode}. Must be 'global' or 'local'")
+
+    sub1, sub2 = seq1[start1:end1], seq2[start2:end2]
+    out1, out2 = [], []
+    codes1, codes2 = _encode(sub1), _encode(sub2)
+    with stage("align_traceback"):
+        _myers_miller(
+            codes1, codes2, scoring.g, scoring.g, scoring,
+            out1, out2, sub1, sub2, 0, 0,
+        )
+    aligned1, aligned2 = "".join(out1), "".join(out2)
+
+    return {
+        "score": score_alignment(aligned1, aligned2, scoring),
+        "aligned_seq1": aligned1,
+        "aligned_seq2": aligned2,
+        "seq1_range": (start1, end1),
+        "seq2_range": (start2, end2),
+    }
+
+
+def format_alignment(result: dict, width: int = 60) -> str:
+    """
+    Format an alignment as blocks of three lines (seq1, match line, seq2)
+
+    Args:
+        result (dict): Output of align()
+        width (int): Columns per block
+
+    Returns:
+        str: Printable alignment
+    """
+    aligned1, aligned2 = result["aligned_seq1"], result["aligned_seq2"]
+    marks = "".join(
+        "|" if x == y and x != "-" else (" " if "-" in (x, y) else ".")
+        for x, y in zip(aligned1, aligned2)
+    )
+    blocks = [
+        f"{aligned1[i : i + width]}\n{marks[i : i + width]}\n{aligned2[i : i + width]}"
+        for i in range(0, len(aligned1), width)
+    ]
+    return f"\nScore: {result['score']:g}\n" + "\n\n".join(blocks)
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+
+"""
+HTTP API for the sequence analyzer (FastAPI).
+
+    uvicorn api:app --workers 1 --port 8000
+
+Operations: validate, gc, orf, transcribe, translate, length.
+
+Single sequence, JSON in and out:
+
+    curl -X POST localhost:8000/gc -H 'content-type: application/json' -d '{"sequence": "ATGCGC"}'
+
+Bulk: POST an NDJSON body (one {"id": ..., "sequence": ...} object per
+line) or a FASTA body to /{operation}/bulk. Records are parsed as the body
+arrives and results are streamed back as NDJSON lines as soon as each one
+is computed, so they may come back out of input order (match them by id).
+
+Long sequences are computed in a process pool so the event loop keeps
+serving other requests; short ones are cheaper to run inline. Results are
+cached by (operation, translation table, SHA-256 of the sequence), and
+identical requests arriving while one is being computed share its result.
+"""
+
+import asyncio
+import codecs
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+from Bio.Seq import Seq
+from Bio.SeqUtils import gc_fraction
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from functions import find_orfs, translate_rna
+from input_validator import seq_validator
+
+# sequence types each operation accepts (None: any valid sequence)
+REQUIRED_TYPES = {
+    "validate": None,
+    "length": None,
+    "gc": ("DNA", "RNA"),
+    "orf": ("DNA",),
+    "transcribe": ("DNA",),
+    "translate": ("DNA", "RNA"),
+}
+# sequences shorter than this are computed on the event loop thread
+OFFLOAD_MIN_LENGTH = int(os.environ.get("SEQ_API_OFFLOAD_MIN", "10000"))
+CACHE_SIZE = int(os.environ.get("SEQ_API_CACHE_SIZE", "10000"))
+WORKERS = int(os.environ.get("SEQ_API_WORKERS", os.cpu_count() or 1))
+# bulk records being computed at once per request
+MAX_IN_FLIGHT = 4 * WORKERS
+
+
+def run_operation(operation: str, seq: str, table: int = 1) -> dict:
+    """
+    Compute one operation on one sequence (runs in a worker process for long sequences)
+
+    Args:
+        operation (str): One of REQUIRED_TYPES
+        seq (str): Upper-cased sequence without whitespace
+        table (int): NCBI genetic code table for translate
+
+    Returns:
+        dict: Operation result
+
+    Raises:
+        ValueError: If the sequence is invalid or of the wrong type for the operation
+    """
+    if operation == "validate":
+        try:
+            _, seq_type = seq_validator(seq)
+        except ValueError as e:
+            return {"valid": False, "error": str(e)}
+        return {"valid": True, "type": seq_type}
+
+    _, seq_type = seq_validator(seq)
+    allowed = REQUIRED_TYPES[operation]
+    if allowed and seq_type not in allowed:
+        raise ValueError(f"{operation} needs a {' or '.join(allowed)} sequence, got {seq_type}")
+
+    if operation == "length":
+        return {"length": len(seq), "type": seq_type}
+    if operation == "gc":
+        fraction = gc_fraction(Seq(seq))
+        return {"gc_fraction": fraction, "gc_percent": round(fraction * 100, 3)}
+    if operation == "orf":
+        return {"orfs": find_orfs(seq)}
+    if operation == "transcribe":
+        coding = Seq(seq)
+        return {"template": str(coding.reverse_complement()), "mrna": str(coding.transcribe())}
+    if operation == "translate":
+        return {"protein": translate_rna(seq, table=table)}
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+class ResultCache:
+    """
+    LRU cache of operation results keyed by (operation, table, sequence hash).
+
+    Requests for a key that is still being computed wait on the same task
+    instead of computing it again. The computation runs as its own task and
+    every request awaits it through asyncio.shield, so a cancelled request
+    (e.g. a client disconnecting) never cancels it for the others.
+    """
+
+    def __init__(self, size: int = CACHE_SIZE):
+        self.size = size
+        self.results = OrderedDict()
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(operation: str, seq: str, table: int) -> tuple:
+        return operation, table, hashlib.sha256(seq.encode("ascii", "replace")).hexdigest()
+
+    async def get(self, key: tuple, compute) -> dict:
+        """
+        Cached result for key, calling the coroutine function compute() on a miss
+        """
+        if key in self.results:
+            self.hits += 1
+            self.results.move_to_end(key)
+            return self.results[key]
+        task = self.pending.get(key)
+        if task is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            task = self.pending[key] = asyncio.ensure_future(compute())
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: tuple, task: asyncio.Task) -> None:
+        """Store a finished computation; errors are left for its waiters, not cached"""
+        del self.pending[key]
+        # exception() also marks an error nobody waits for any more as retrieved
+        if task.cancelled() or task.exception() is not None:
+            return
+        self.results[key] = task.result()
+        if len(self.results) > self.size:
+            self.results.popitem(last=False)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.executor = ProcessPoolExecutor(max_workers=WORKERS)
+    app.state.cache = ResultCache()
+    yield
+    app.state.executor.shutdown(cancel_futures=True)
+
+
+app = FastAPI(title="BioSequence Analyzer API", lifespan=lifespan)
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for generators that still read the request body.
+
+    The stock class listens for a client disconnect by calling receive()
+    while streaming, which swallows body chunks the generator hasn't read
+    yet. Here receive() is left to the body reader until the generator sets
+    body_read (request.stream() raises ClientDisconnect itself if the client
+    goes away mid-upload); after that the stock listener takes over, so a
+    disconnect cancels the generator.
+    """
+
+    def __init__(self, content, body_read: asyncio.Event, **kwargs):
+        super().__init__(content, **kwargs)
+        self.body_read = body_read
+
+    async def listen_for_disconnect(self, receive) -> None:
+        await self.body_read.wait()
+        await super().listen_for_disconnect(receive)
+
+
+class SequenceRequest(BaseModel):
+    sequence: str
+    table: int = 1
+
+
+def normalize(seq: str) -> str:
+    """Upper-case a sequence and drop whitespace and line breaks"""
+    return "".join(seq.split()).upper()
+
+
+async def analyze(operation: str, seq: str, table: int = 1) -> dict:
+    """
+    Cached result of an operation, computed inline or in the process pool
+    """
+    if operation not in REQUIRED_TYPES:
+        raise HTTPException(status_code=404, detail=f"Unknown operation: {operation}")
+    seq = normalize(seq)
+    cache = app.state.cache
+
+    async def compute():
+        if len(seq) < OFFLOAD_MIN_LENGTH:
+            return run_operation(operation, seq, table)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(app.state.executor, run_operation, operation, seq, table)
+
+    return await cache.get(ResultCache.key(operation, seq, table), compute)
+
+
+async def _lines(request: Request):
+    """Yield the request body line by line as it arrives"""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    # pieces of the current, unfinished line (long FASTA lines span many chunks)
+    partial = []
+    async for chunk in request.stream():
+        *lines, rest = decoder.decode(chunk).split("\n")
+        if lines:
+            partial.append(lines[0])
+            yield "".join(partial)
+            for line in lines[1:]:
+                yield line
+            partial = []
+        partial.append(rest)
+    partial.append(decoder.decode(b"", final=True))
+    if any(partial):
+        yield "".join(partial)
+
+
+async def _records(request: Request):
+    """
+    Yield (id, sequence) records from an NDJSON or FASTA body
+
+    FASTA is detected by the content type or a leading ">", otherwise every
+    non-empty line is a JSON object with "sequence" (and optionally "id").
+    """
+    fasta = "fasta" in request.headers.get("content-type", "")
+    name, parts, count = None, [], 0
+    async for line in _lines(request):
+        line = line.strip()
+        if not line:
+            continue
+        if count == 0 and name is None and line.startswith(">"):
+            fasta = True
+        if fasta:
+            if line.startswith(">"):
+                if name is not None:
+                    yield name, "".join(parts)
+                    count += 1
+                header = line[1:].split()
+                name, parts = (header[0] if header else f"seq{count + 1}"), []
+            else:
+                parts.append(line)
+            continue
+
+        try:
+            record = json.loads(line)
+            seq = record["sequence"]
+            record_id = record.get("id", count + 1)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            seq, record_id = None, count + 1
+        yield record_id, seq if isinstance(seq, str) else None
+        count += 1
+    if fasta and name is not None:
+        yield name, "".join(parts)
+
+
+@app.get("/health")
+async def health():
+    cache = app.state.cache
+    return {
+        "status": "ok",
+        "workers": WORKERS,
+        "cache": {"size": len(cache.results), "hits": cache.hits, "misses": cache.misses},
+    }
+
+
+@app.post("/{operation}")
+async def single(operation: str, body: SequenceRequest):
+    """Run an operation on one sequence"""
+    try:
+        return await analyze(operation, body.sequence, body.table)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@app.post("/{operation}/bulk")
+async def bulk(operation: str, request: Request, table: int = 1):
+    """
+    Run an operation on every record of an NDJSON or FASTA body, streaming NDJSON results
+    """
+    if operation not in REQUIRED_TYPES:
+        raise HTTPException(status_code=404, detail=f"Unknown operation: {operation}")
+
+    async def one(record_id, seq) -> str:
+        if seq is None:
+            return json.dumps({"id": record_id, "error": "Invalid record, expected JSON with a sequence"})
+        try:
+            result = await analyze(operation, seq, table)
+        except ValueError as e:
+            return json.dumps({"id": record_id, "error": str(e)})
+        return json.dumps({"id": record_id, **result})
+
+    body_read = asyncio.Event()
+
+    async def stream():
+        # keep at most MAX_IN_FLIGHT records computing, send each result when it is ready
+        in_flight = set()
+        try:
+            async for record_id, seq in _records(request):
+                in_flight.add(asyncio.create_task(one(record_id, seq)))
+                if len(in_flight) >= MAX_IN_FLIGHT:
+                    done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result() + "\n"
+            body_read.set()
+            while in_flight:
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result() + "\n"
+        finally:
+            # the client went away (or streaming failed): stop the remaining records
+            for task in in_flight:
+                task.cancel()
+
+    return BodyStreamingResponse(stream(), body_read, media_type="application/x-ndjson")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="127.0.0.1", port=int(os.environ.get("PORT", "8000")))
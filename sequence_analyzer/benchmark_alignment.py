@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the linear-memory aligner against Bio.Align.PairwiseAligner.
+
+Random sequence pairs (the second a mutated copy of the first) are scored
+with both implementations; scores must agree, and wall time is reported.
+
+Usage: python benchmark_alignment.py [--lengths 1000 5000 20000] [--mode global]
+"""
+
+import argparse
+import random
+import time
+
+from Bio.Align import PairwiseAligner
+
+from alignment import Scoring, align, align_score
+
+
+def mutate(seq: str, rate: float, rng: random.Random) -> str:
+    """
+    Copy a sequence with random substitutions, insertions and deletions
+
+    Args:
+        seq (str): Sequence to mutate
+        rate (float): Per-base mutation probability
+        rng (random.Random): Random number generator
+
+    Returns:
+        str: Mutated sequence
+    """
+    out = []
+    for base in seq:
+        roll = rng.random()
+        if roll < rate / 3:
+            out.append(rng.choice("ACGT"))
+        elif roll < 2 * rate / 3:
+            out.append(base + rng.choice("ACGT"))
+        elif roll >= rate:
+            out.append(base)
+    return "".join(out)
+
+
+def timed(func, *args, **kwargs) -> tuple:
+    """Run func once and return (result, seconds)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alignment benchmark")
+    parser.add_argument(
+        "--lengths", type=int, nargs="+", default=[1000, 5000, 20000]
+    )
+    parser.add_argument("--mode", choices=["global", "local"], default="global")
+    parser.add_argument("--rate", type=float, default=0.05, help="Mutation rate")
+    parser.add_argument(
+        "--traceback", action="store_true", help="Also time full alignments"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    scoring = Scoring()
+    aligner = PairwiseAligner(
+        mode=args.mode,
+        match_score=scoring.match,
+        mismatch_score=scoring.mismatch,
+        open_gap_score=scoring.gap_open,
+        extend_gap_score=scoring.gap_extend,
+    )
+
+    print(f"{'length':>8} {'biopython (s)':>14} {'score-only (s)':>15} {'traceback (s)':>14}  scores")
+    for length in args.lengths:
+        seq1 = "".join(rng.choice("ACGT") for _ in range(length))
+        seq2 = mutate(seq1, args.rate, rng)
+
+        reference, bio_time = timed(aligner.score, seq1, seq2)
+        score, score_time = timed(align_score, seq1, seq2, args.mode, scoring)
+        trace_time = float("nan")
+        if args.traceback:
+            result, trace_time = timed(align, seq1, seq2, args.mode, scoring)
+            assert result["score"] == reference, "traceback score mismatch"
+
+        status = "ok" if score == reference else f"MISMATCH {score} != {reference}"
+        print(f"{length:>8} {bio_time:>14.3f} {score_time:>15.3f} {trace_time:>14.3f}  {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 
+import os
+import numpy as np
 from Bio.Seq import Seq
 from Bio.SeqUtils import gc_fraction
+from timing import count, stage
+from translation import translate, six_frame_translation
 
 
 def seq_length(seq: str) -> int:
@@ -30,14 +34,159 @@ def calc_gc_content(seq: str) -> str:
     """
     seq = Seq(seq.upper().strip())
     try:
-        gc_decimal = gc_fraction(seq)
+        with stage("gc_content"):
+            gc_decimal = gc_fraction(seq)
         gc_percent = gc_decimal * 100
         return f"\nGC content (dec): {gc_decimal}\nGC content (%): {gc_percent:.3f}"
     except (ValueError, TypeError, NameError):
         return "Invalid sequence"
 
 
-def find_orf(seq: str) -> list:
+def _sequence_bytes(source: str) -> np.ndarray:
+    """
+    Get the raw bytes of a sequence as a uint8 array without copying it
+
+    Args:
+        source (str): Sequence string, or path to a plain or single-record FASTA
+            file which is memory-mapped instead of read
+
+    Returns:
+        np.ndarray: uint8 view of the sequence bytes (FASTA header skipped)
+    """
+    if os.path.isfile(source):
+        if os.path.getsize(source) == 0:
+            return np.zeros(0, dtype=np.uint8)
+        data = np.memmap(source, dtype=np.uint8, mode="r")
+    else:
+        data = np.frombuffer(source.encode("ascii"), dtype=np.uint8)
+
+    # skip a FASTA header line
+    if len(data) and data[0] == ord(">"):
+        newline = np.flatnonzero(data[: 1 << 20] == ord("\n"))
+        data = data[newline[0] + 1 :] if len(newline) else data[:0]
+    return data
+
+
+def _base_chunks(data: np.ndarray, chunk_size: int):
+    """
+    Yield upper-cased sequence letters chunk by chunk, dropping line breaks
+    and other non-letter bytes so positions are in sequence coordinates
+
+    Raises:
+        ValueError: If a further FASTA header follows the first record; its
+            letters and the next record would otherwise be counted as part
+            of one continuous sequence
+    """
+    for i in range(0, len(data), chunk_size):
+        chunk = np.asarray(data[i : i + chunk_size])
+        if (chunk == ord(">")).any():
+            raise ValueError(
+                "Multi-record FASTA input: only single-record sequences can be profiled, "
+                "extract one record first (e.g. samtools faidx file.fa name)"
+            )
+        folded = chunk & 0xDF  # clear the lower-case bit
+        yield folded[(folded >= ord("A")) & (folded <= ord("Z"))]
+
+
+def gc_skew_profile(
+    source: str, window: int = 1000, step: int = None, chunk_size: int = 1 << 22
+) -> tuple:
+    """
+    Calculate sliding-window GC content and GC skew along a sequence
+
+    Window counts are read off running G and C totals (prefix sums), so the
+    cost is O(n) whatever the window size. The sequence is streamed in chunks
+    and only the prefix sums at window boundaries are kept, which lets it run
+    over memory-mapped chromosome files.
+
+    Args:
+        source (str): Sequence, or path to a plain or single-record FASTA file
+            (a file with several records raises ValueError)
+        window (int): Window length in bases
+        step (int): Distance between window starts (defaults to window)
+        chunk_size (int): Number of bytes processed at a time
+
+    Returns:
+        tuple: (starts, gc_percent, gc_skew) NumPy arrays, one entry per window.
+            GC skew is (G - C) / (G + C), 0 for windows without G or C.
+    """
+    step = step or window
+    if window <= 0 or step <= 0:
+        raise ValueError("Window and step must be positive")
+
+    # the first pass over a mapped file is what reads it from disk
+    with stage("read"):
+        data = _sequence_bytes(source)
+        seq_len = sum(len(bases) for bases in _base_chunks(data, chunk_size))
+
+    starts = np.arange(0, seq_len - window + 1, step, dtype=np.int64)
+    ends = starts + window
+    boundaries = np.union1d(starts, ends)
+
+    # running G and C totals at each boundary, i.e. counts in seq[:boundary]
+    g_totals = np.zeros(len(boundaries), dtype=np.int64)
+    c_totals = np.zeros(len(boundaries), dtype=np.int64)
+    g_carry = c_carry = 0
+    offset = 0
+    with stage("gc_prefix_sums"):
+        for bases in _base_chunks(data, chunk_size):
+            g_sums = np.cumsum(bases == ord("G"), dtype=np.int64) + g_carry
+            c_sums = np.cumsum(bases == ord("C"), dtype=np.int64) + c_carry
+
+            # boundaries falling inside this chunk
+            lo = np.searchsorted(boundaries, offset, side="right")
+            hi = np.searchsorted(boundaries, offset + len(bases), side="right")
+            idx = boundaries[lo:hi] - offset - 1
+            g_totals[lo:hi] = g_sums[idx]
+            c_totals[lo:hi] = c_sums[idx]
+
+            if len(bases):
+                g_carry, c_carry = g_sums[-1], c_sums[-1]
+            offset += len(bases)
+
+    with stage("gc_windows"):
+        start_idx = np.searchsorted(boundaries, starts)
+        end_idx = np.searchsorted(boundaries, ends)
+        g = g_totals[end_idx] - g_totals[start_idx]
+        c = c_totals[end_idx] - c_totals[start_idx]
+
+        gc_percent = 100.0 * (g + c) / window
+        gc_skew = np.divide(
+            g - c, g + c, out=np.zeros(len(starts)), where=(g + c) > 0
+        )
+    count("bases", seq_len)
+    count("windows", len(starts))
+    return starts, gc_percent, gc_skew
+
+
+def profile_to_bedgraph(
+    starts: np.ndarray, values: np.ndarray, window: int, step: int, chrom: str = "seq"
+) -> str:
+    """
+    Format a windowed profile as bedGraph lines
+
+    bedGraph intervals may not overlap, so when windows overlap (step < window)
+    each value is reported over the step-sized bin at the start of its window.
+
+    Args:
+        starts (np.ndarray): Window start positions
+        values (np.ndarray): One value per window
+        window (int): Window length
+        step (int): Distance between window starts
+        chrom (str): Chromosome name for the first column
+
+    Returns:
+        str: bedGraph text
+    """
+    span = min(window, step or window)
+    with stage("bedgraph"):
+        return "\n".join(
+            f"{chrom}\t{start}\t{start + span}\t{value:.4f}"
+            for start, value in zip(starts.tolist(), values.tolist())
+        )
+
+
+def find_orfs(seq: str) -> list:
     """Find open reading frames (ORFs) in a given DNA sequence
 
     An open reading frame (ORF) is a sequence of codons that starts with a start codon
@@ -52,44 +201,60 @@ def find_orf(seq: str) -> list:
     seq = seq.upper()  # Convert to uppercase to ensure consistency
     orfs = []
 
-    # Check all three possible reading frames
-    for frame in range(3):
-        i = frame
-        while i < len(seq) - 2:  # Need at least 3 nucleotides for a codon
-            codon = seq[i : i + 3]
-
-            # If we find a start codon
-            if codon in ["ATG", "GTG", "TTG"]:
-                start_pos = i
-                orf = []
-                j = i
-
-                # Keep reading codons until we hit a stop codon or end of sequence
-                while j < len(seq) - 2:
-                    current_codon = seq[j : j + 3]
-
-                    # If we hit a stop codon, we've found an ORF
-                    if current_codon in ["TAG", "TAA", "TGA"]:
-                        if (
-                            len(orf) > 0
-                        ):  # Only add if we have codons between start and stop
-                            orf_seq = "".join(orf)
-                            orfs.append(
-                                {
-                                    "sequence": orf_seq,
-                                    "start_position": start_pos,
-                                    "length": len(orf_seq),
-                                    "frame": frame + 1,
-                                }
-                            )
-                        break
-
-                    orf.append(current_codon)
-                    j += 3
-
-            i += 3
-
-    return f"\n{orfs}" if orfs else "No ORFs found"  # return list of orfs
+    with stage("orf_scan"):
+        # Check all three possible reading frames
+        for frame in range(3):
+            i = frame
+            while i < len(seq) - 2:  # Need at least 3 nucleotides for a codon
+                codon = seq[i : i + 3]
+
+                # If we find a start codon
+                if codon in ["ATG", "GTG", "TTG"]:
+                    start_pos = i
+                    orf = []
+                    j = i
+
+                    # Keep reading codons until we hit a stop codon or end of sequence
+                    while j < len(seq) - 2:
+                        current_codon = seq[j : j + 3]
+
+                        # If we hit a stop codon, we've found an ORF
+                        if current_codon in ["TAG", "TAA", "TGA"]:
+                            if (
+                                len(orf) > 0
+                            ):  # Only add if we have codons between start and stop
+                                orf_seq = "".join(orf)
+                                orfs.append(
+                                    {
+                                        "sequence": orf_seq,
+                                        "start_position": start_pos,
+                                        "length": len(orf_seq),
+                                        "frame": frame + 1,
+                                    }
+                                )
+                            break
+
+                        orf.append(current_codon)
+                        j += 3
+
+                i += 3
+
+    count("bases", len(seq))
+    return orfs
+
+
+def find_orf(seq: str) -> str:
+    """
+    Find open reading frames (ORFs) in a given DNA sequence, formatted for display
+
+    Args:
+        seq (str): DNA sequence
+
+    Returns:
+        str: ORFs found by find_orfs, or "No ORFs found"
+    """
+    orfs = find_orfs(seq)
+    return f"\n{orfs}" if orfs else "No ORFs found"
 
 
 def transcribe_dna(seq: str) -> str:
@@ -103,10 +268,11 @@ def transcribe_dna(seq: str) -> str:
     """
     # Process sequence if DNA
     coding_seq = Seq(seq.upper().strip())
-    # retrieve the template strand from coding strand (put in the 3' to 5' direction)
-    temp_strand = coding_seq.reverse_complement()
-    # get mrna from temp strand (put in the 5' to 3' direction)
-    mrna = temp_strand.reverse_complement().transcribe()
+    with stage("transcribe"):
+        # retrieve the template strand from coding strand (put in the 3' to 5' direction)
+        temp_strand = coding_seq.reverse_complement()
+        # get mrna from temp strand (put in the 5' to 3' direction)
+        mrna = temp_strand.reverse_complement().transcribe()
     return f"Template strand (3' to 5'): {temp_strand}\nTranscribed sequence (5' to 3'): {mrna}"
 
 
@@ -121,15 +287,37 @@ def back_transcribe_rna(seq: str) -> str:
         str: DNA template obtained from reverse transcription
     """
     seq = Seq(seq.upper().strip())
-    return f"{seq.back_transcribe()}"
+    with stage("back_transcribe"):
+        return f"{seq.back_transcribe()}"
 
 
-def translate_rna(seq: str) -> str:
-    # obtain mrna
-    coding_seq = Seq(seq.upper().strip())
-    # translate mrna
-    protein = coding_seq.transcribe().translate(table=1)
-    return f"{protein}"
+def translate_rna(seq: str, table: int = 1) -> str:
+    """
+    Translate an mRNA (or coding DNA) sequence to protein
+
+    Args:
+        seq (str): RNA sequence to translate
+        table (int): NCBI genetic code table ID
+
+    Returns:
+        str: Protein sequence
+    """
+    return translate(seq.upper().strip(), table=table)
+
+
+def translate_six_frames(seq: str, table: int = 1) -> str:
+    """
+    Translate all six reading frames of a DNA or RNA sequence
+
+    Args:
+        seq (str): Sequence to translate
+        table (int): NCBI genetic code table ID
+
+    Returns:
+        str: Protein sequence of each frame, one per line
+    """
+    frames = six_frame_translation(seq.upper().strip(), table=table)
+    return "".join(f"\nFrame {frame}: {protein}" for frame, protein in frames.items())
 
 
 # print(calc_gc_content("ATCAGTGTTAGCGAGAATACTCAACAAATCGCATTTTTTACGACAGTCAGACGTATTGAAATTAAAAAGC"))
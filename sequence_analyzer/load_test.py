@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+"""
+Load test for the sequence analyzer API (api.py).
+
+Start the server, then run e.g.
+
+    uvicorn api:app --port 8000
+    python load_test.py --requests 2000 --concurrency 50 --length 5000
+
+Single-sequence requests are spread over the operations; a fraction of them
+repeat earlier sequences so the result cache is exercised. With --bulk the
+same sequences are also sent as one streamed NDJSON request per operation.
+Reports requests/s and latency percentiles per operation.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+import numpy as np
+
+OPERATIONS = ["validate", "gc", "orf", "transcribe", "translate", "length"]
+
+
+def random_sequences(n: int, length: int, repeat_fraction: float, seed: int = 0) -> list:
+    """DNA sequences where about repeat_fraction of them repeat an earlier one"""
+    rng = random.Random(seed)
+    sequences = []
+    for _ in range(n):
+        if sequences and rng.random() < repeat_fraction:
+            sequences.append(rng.choice(sequences))
+        else:
+            sequences.append("".join(rng.choices("ACGT", k=length)))
+    return sequences
+
+
+async def run_single(client: httpx.AsyncClient, jobs: list, concurrency: int) -> tuple:
+    """
+    Send (operation, sequence) jobs with at most `concurrency` requests open
+
+    Returns:
+        tuple: (wall seconds, {operation: [latency seconds]}, error count)
+    """
+    latencies = {operation: [] for operation in OPERATIONS}
+    errors = 0
+    queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            operation, seq = queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                response = await client.post(f"/{operation}", json={"sequence": seq})
+                response.raise_for_status()
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies[operation].append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies, errors
+
+
+async def run_bulk(client: httpx.AsyncClient, operation: str, sequences: list) -> tuple:
+    """
+    Stream all sequences as one NDJSON request
+
+    Returns:
+        tuple: (seconds to the first result line, total seconds, result lines)
+    """
+    body = "".join(json.dumps({"id": i, "sequence": seq}) + "\n" for i, seq in enumerate(sequences))
+    start = time.perf_counter()
+    first = None
+    lines = 0
+    async with client.stream(
+        "POST", f"/{operation}/bulk", content=body, headers={"content-type": "application/x-ndjson"}
+    ) as response:
+        async for line in response.aiter_lines():
+            if line:
+                first = first or time.perf_counter() - start
+                lines += 1
+    return first or 0.0, time.perf_counter() - start, lines
+
+
+def percentiles(values: list) -> str:
+    if not values:
+        return "no successful requests"
+    p50, p95, p99 = np.percentile(np.array(values) * 1000, [50, 95, 99])
+    return f"p50 {p50:8.2f} ms  p95 {p95:8.2f} ms  p99 {p99:8.2f} ms"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load test the sequence analyzer API")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--length", type=int, default=2000, help="Sequence length in bases")
+    parser.add_argument("--repeat", type=float, default=0.3, help="Fraction of repeated sequences")
+    parser.add_argument("--bulk", action="store_true", help="Also time streamed NDJSON bulk requests")
+    args = parser.parse_args()
+
+    sequences = random_sequences(args.requests, args.length, args.repeat)
+    jobs = [(OPERATIONS[i % len(OPERATIONS)], seq) for i, seq in enumerate(sequences)]
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, timeout=120, limits=limits) as client:
+        (await client.get("/health")).raise_for_status()
+
+        seconds, latencies, errors = await run_single(client, jobs, args.concurrency)
+        done = sum(len(values) for values in latencies.values())
+        print(f"{done} requests in {seconds:.2f}s: {done / seconds:.1f} req/s, {errors} errors")
+        print(f"{'all':<11} {percentiles([v for values in latencies.values() for v in values])}")
+        for operation in OPERATIONS:
+            print(f"{operation:<11} {percentiles(latencies[operation])}")
+
+        if args.bulk:
+            for operation in OPERATIONS:
+                first, total, lines = await run_bulk(client, operation, sequences)
+                print(
+                    f"bulk {operation:<11} {lines} results in {total:.2f}s "
+                    f"({lines / total:.1f} seq/s), first result after {first * 1000:.1f} ms"
+                )
+
+        print(f"server: {(await client.get('/health')).json()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,16 +1,24 @@
 #!/usr/bin/env python3
 
+import os
 import sys
 import argparse
+import numpy as np
 from input_validator import seq_validator
 from functions import (
     seq_length,
     calc_gc_content,
     transcribe_dna,
     translate_rna,
+    translate_six_frames,
     find_orf,
     back_transcribe_rna,
+    gc_skew_profile,
+    profile_to_bedgraph,
 )
+from alignment import Scoring, align, align_score, format_alignment
+# stage timers and profiling (bioc.instrument, see timing.py); enable with BIOC_INSTRUMENT=1
+from timing import stage
 
 
 def validate_args(args):
@@ -27,6 +35,9 @@ def validate_args(args):
             args.orf,
             args.length,
             args.protein,
+            args.gc_profile,
+            args.six_frame,
+            bool(args.align),
         ]
     )
 
@@ -35,6 +46,10 @@ def validate_args(args):
     if operations > 1:
         raise ValueError("Please specify only one operation at a time")
 
+    # Sequence files are streamed by the profile operation, not validated up front
+    if args.gc_profile and os.path.isfile(args.sequence):
+        return "DNA"
+
     # Validate sequence based on operation
     try:
         if args.sequence:
@@ -48,7 +63,7 @@ def validate_args(args):
             elif args.back_transcribe:
                 if detected_type != "RNA":
                     raise ValueError("Invalid sequence type for back transcription")
-            elif args.gc_content:
+            elif args.gc_content or args.gc_profile:
                 if detected_type not in ["DNA", "RNA"]:
                     raise ValueError("Invalid sequence type for GC content")
             elif args.orf:
@@ -59,6 +74,13 @@ def validate_args(args):
             elif args.protein:
                 if detected_type != "RNA":
                     raise ValueError("Invalid sequence type for protein translation")
+            elif args.align:
+                is_valid, second_type = seq_validator(args.align)
+                if second_type != detected_type:
+                    raise ValueError("Sequences to align must be of the same type")
+            elif args.six_frame:
+                if detected_type not in ["DNA", "RNA"]:
+                    raise ValueError("Invalid sequence type for six-frame translation")
             else:
                 raise ValueError("Invalid operation specified")
 
@@ -76,7 +98,9 @@ def process_sequence(args, detected_type):
     if args.transcribe:
         return (transcribe_dna(args.sequence), "DNA to be transcribed to RNA")
     elif args.protein:
-        return (translate_rna(args.sequence), "Translated Protein")
+        return (translate_rna(args.sequence, args.table), "Translated Protein")
+    elif args.six_frame:
+        return (translate_six_frames(args.sequence, args.table), "Six-frame translation")
     elif args.back_transcribe:
         return (back_transcribe_rna(args.sequence), "Reversed-transcribed DNA")
     elif args.gc_content:
@@ -85,10 +109,55 @@ def process_sequence(args, detected_type):
         return (find_orf(args.sequence), "Open reading frames (ORFs) found")
     elif args.length:
         return (seq_length(args.sequence), "Sequence length")
+    elif args.align:
+        return (pairwise_alignment(args), f"{args.mode.title()} alignment")
+    elif args.gc_profile:
+        track = "content" if args.track == "gc" else "skew"
+        return (gc_profile(args), f"GC {track} profile")
     else:
         raise ValueError("No valid operation specified")
 
 
+def gc_profile(args) -> str:
+    """
+    Compute the sliding-window GC profile and write it as bedGraph or a
+    NumPy array (.npy output path), or return the bedGraph text.
+    """
+    starts, gc_percent, gc_skew = gc_skew_profile(
+        args.sequence, window=args.window, step=args.step
+    )
+    values = gc_percent if args.track == "gc" else gc_skew
+
+    if args.profile_out and args.profile_out.endswith(".npy"):
+        # columns: window start, GC %, GC skew
+        with stage("write"):
+            np.save(args.profile_out, np.column_stack([starts, gc_percent, gc_skew]))
+        return f"{len(starts)} windows written to {args.profile_out}"
+
+    bedgraph = profile_to_bedgraph(starts, values, args.window, args.step, args.chrom)
+    if args.profile_out:
+        with stage("write"), open(args.profile_out, "w") as file:
+            file.write(bedgraph + "\n")
+        return f"{len(starts)} windows written to {args.profile_out}"
+    return f"\n{bedgraph}"
+
+
+def pairwise_alignment(args) -> str:
+    """
+    Align the input sequence against the --align sequence and return the
+    formatted alignment, or just its score with --score-only.
+    """
+    scoring = Scoring(
+        match=args.match,
+        mismatch=args.mismatch,
+        gap_open=args.gap_open,
+        gap_extend=args.gap_extend,
+    )
+    if args.score_only:
+        return f"{align_score(args.sequence, args.align, args.mode, scoring):g}"
+    return format_alignment(align(args.sequence, args.align, args.mode, scoring))
+
+
 def main():
     """
     Main function for the BioSequence Analyzer tool.
@@ -97,7 +166,11 @@ def main():
         prog="BioSequence Analyzer",
         description="A tool for analyzing biological sequences such as DNA and RNA.",
     )
-    parser.add_argument("sequence", type=str, help="Input sequence to analyze")
+    parser.add_argument(
+        "sequence",
+        type=str,
+        help="Input sequence to analyze (or a sequence/FASTA file for --gc-profile)",
+    )
     parser.add_argument(
         "-t", "--transcribe", action="store_true", help="Transcribe DNA sequence to RNA"
     )
@@ -125,12 +198,75 @@ def main():
     parser.add_argument(
         "-p", "--protein", action="store_true", help="Translate RNA sequence to protein"
     )
+    parser.add_argument(
+        "-f",
+        "--six-frame",
+        action="store_true",
+        help="Translate all six reading frames of sequence",
+    )
+    parser.add_argument(
+        "--table",
+        type=int,
+        default=1,
+        help="NCBI genetic code table for translation (default: 1)",
+    )
+    parser.add_argument(
+        "-a",
+        "--align",
+        metavar="SEQUENCE",
+        help="Align the input sequence against this sequence",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["global", "local"],
+        default="global",
+        help="Alignment mode: global (Needleman-Wunsch) or local (Smith-Waterman)",
+    )
+    parser.add_argument(
+        "--score-only", action="store_true", help="Only report the alignment score"
+    )
+    parser.add_argument("--match", type=float, default=2, help="Match score")
+    parser.add_argument("--mismatch", type=float, default=-1, help="Mismatch score")
+    parser.add_argument(
+        "--gap-open", type=float, default=-5, help="Score of the first gap position"
+    )
+    parser.add_argument(
+        "--gap-extend", type=float, default=-1, help="Score of each further gap position"
+    )
+    parser.add_argument(
+        "-w",
+        "--gc-profile",
+        action="store_true",
+        help="Sliding-window GC content / GC skew profile of sequence",
+    )
+    parser.add_argument(
+        "--window", type=int, default=1000, help="Profile window length (default: 1000)"
+    )
+    parser.add_argument(
+        "--step", type=int, help="Profile step between windows (default: window)"
+    )
+    parser.add_argument(
+        "--track",
+        choices=["gc", "skew"],
+        default="gc",
+        help="Profile track reported as bedGraph (default: gc)",
+    )
+    parser.add_argument(
+        "--chrom", default="seq", help="Chromosome name used in bedGraph output"
+    )
+    parser.add_argument(
+        "--profile-out",
+        help="Write the GC profile to a file (.npy for a NumPy array, otherwise bedGraph); "
+        "for a cProfile dump set BIOC_PROFILE=path instead",
+    )
 
     try:
         args = parser.parse_args()
         # check for valid arguments and valid sequence
-        detected_type = validate_args(args)
-        result, description = process_sequence(args, detected_type)
+        with stage("validate"):
+            detected_type = validate_args(args)
+        with stage("process"):
+            result, description = process_sequence(args, detected_type)
         print(f"{description}: {result}")
     except ValueError as e:
         print(f"Error: {str(e)}", file=sys.stderr)
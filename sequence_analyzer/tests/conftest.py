@@ -0,0 +1,9 @@
+"""
+Shared setup for the sequence analyzer tests: modules are imported flat,
+as seq_analyze.py and `uvicorn api:app` do.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
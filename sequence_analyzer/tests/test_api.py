@@ -0,0 +1,226 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import api  # noqa: E402
+from api import ResultCache, app  # noqa: E402
+
+
+def counting_compute(result: dict, delay: float = 0.05):
+    """compute() coroutine function returning result after delay, with a call counter"""
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return result
+
+    return compute, calls
+
+
+def test_cache_coalesces_concurrent_requests():
+    async def run():
+        cache = ResultCache()
+        compute, calls = counting_compute({"value": 1})
+        results = await asyncio.gather(*(cache.get("key", compute) for _ in range(5)))
+        return cache, results, calls
+
+    cache, results, calls = asyncio.run(run())
+
+    assert results == [{"value": 1}] * 5
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (4, 1)
+
+
+def test_cancelled_first_request_does_not_cancel_waiters():
+    async def run():
+        cache = ResultCache()
+        compute, calls = counting_compute({"value": 2})
+        first = asyncio.create_task(cache.get("key", compute))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get("key", compute))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        result = await second
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return cache, result, calls
+
+    cache, result, calls = asyncio.run(run())
+
+    assert result == {"value": 2}
+    assert len(calls) == 1
+    assert cache.results["key"] == {"value": 2}
+    assert cache.pending == {}
+
+
+def test_cache_errors_reach_every_waiter_and_are_not_cached():
+    async def run():
+        cache = ResultCache()
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("bad sequence")
+
+        results = await asyncio.gather(*(cache.get("key", failing) for _ in range(3)), return_exceptions=True)
+        again = await asyncio.gather(cache.get("key", failing), return_exceptions=True)
+        return cache, results + again, calls
+
+    cache, results, calls = asyncio.run(run())
+
+    assert all(isinstance(result, ValueError) for result in results)
+    # the three concurrent requests shared one computation, the later one recomputed
+    assert len(calls) == 2
+    assert "key" not in cache.results
+
+
+def test_cache_evicts_least_recently_used():
+    async def run():
+        cache = ResultCache(size=2)
+        for key in ("a", "b", "a", "c"):
+            compute, _ = counting_compute({"key": key}, delay=0)
+            await cache.get(key, compute)
+        return cache
+
+    assert list(asyncio.run(run()).results) == ["a", "c"]
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def test_health(client):
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+
+
+def test_single_operations(client):
+    gc = client.post("/gc", json={"sequence": "atgc gc\n"})
+    assert gc.status_code == 200
+    assert gc.json()["gc_percent"] == pytest.approx(66.667)
+
+    assert client.post("/length", json={"sequence": "ATGC"}).json() == {"length": 4, "type": "DNA"}
+    assert client.post("/transcribe", json={"sequence": "ATGC"}).json()["mrna"] == "AUGC"
+    assert client.post("/validate", json={"sequence": "ATG1"}).json()["valid"] is False
+
+
+def test_single_errors(client):
+    assert client.post("/gc", json={"sequence": "ATG1"}).status_code == 422
+    assert client.post("/orf", json={"sequence": "AUGC"}).status_code == 422
+    assert client.post("/unknown", json={"sequence": "ATGC"}).status_code == 404
+
+
+def test_repeated_request_is_cached(client):
+    client.post("/length", json={"sequence": "GATTACA"})
+    before = client.get("/health").json()["cache"]["hits"]
+    client.post("/length", json={"sequence": "gattaca"})
+
+    assert client.get("/health").json()["cache"]["hits"] == before + 1
+
+
+def test_long_sequence_is_offloaded(client, monkeypatch):
+    monkeypatch.setattr(api, "OFFLOAD_MIN_LENGTH", 10)
+
+    response = client.post("/length", json={"sequence": "ACGT" * 10})
+
+    assert response.json() == {"length": 40, "type": "DNA"}
+
+
+def bulk_results(response) -> dict:
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    return {line["id"]: line for line in lines}
+
+
+def test_bulk_ndjson(client):
+    body = "\n".join([
+        json.dumps({"id": "a", "sequence": "ATGC"}),
+        json.dumps({"id": "b", "sequence": "ATG1"}),
+        "not json",
+        json.dumps({"id": "c", "sequence": 42}),
+        "",
+        json.dumps({"sequence": "GG"}),
+    ])
+
+    results = bulk_results(client.post("/length/bulk", content=body, headers={"content-type": "application/x-ndjson"}))
+
+    assert results["a"]["length"] == 4
+    assert "error" in results["b"]
+    assert "error" in results[3]
+    assert "error" in results["c"]
+    assert results[5]["length"] == 2
+
+
+def test_bulk_fasta(client):
+    body = ">one first\nATG\nCGC\n>two\nAT\n"
+
+    results = bulk_results(client.post("/gc/bulk", content=body))
+
+    assert set(results) == {"one", "two"}
+    assert results["one"]["gc_percent"] == pytest.approx(66.667)
+    assert results["two"]["gc_percent"] == 0
+
+
+def test_bulk_disconnect_cancels_remaining_records(monkeypatch):
+    cancelled = []
+
+    async def analyze(operation, seq, table=1):
+        if seq != "FAST":
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(seq)
+                raise
+        return {"length": len(seq)}
+
+    monkeypatch.setattr(api, "analyze", analyze)
+    body = "\n".join(json.dumps({"id": seq, "sequence": seq}) for seq in ["FAST", "SLOW1", "SLOW2"])
+
+    async def run():
+        first_line = asyncio.Event()
+        sent = []
+        messages = [{"type": "http.request", "body": body.encode(), "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            # the client hangs up once it has the first result
+            await first_line.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if message.get("body"):
+                first_line.set()
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0", "spec_version": "2.3"}, "http_version": "1.1",
+            "method": "POST", "path": "/length/bulk", "raw_path": b"/length/bulk", "root_path": "",
+            "scheme": "http", "query_string": b"", "headers": [(b"content-type", b"application/x-ndjson")],
+            "client": ("test", 1), "server": ("test", 80),
+        }
+        await asyncio.wait_for(app(scope, receive, send), timeout=5)
+        await asyncio.sleep(0)
+        return sent
+
+    sent = asyncio.run(run())
+
+    bodies = [message["body"] for message in sent if message.get("body")]
+    assert [json.loads(body)["id"] for body in bodies] == ["FAST"]
+    assert sorted(cancelled) == ["SLOW1", "SLOW2"]
+
+
+def test_bulk_unknown_operation(client):
+    assert client.post("/unknown/bulk", content="").status_code == 404
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from functions import gc_skew_profile
+
+
+def test_gc_profile_skips_header_and_line_breaks(tmp_path):
+    path = tmp_path / "one.fa"
+    path.write_text(">chr1 description\nGGGG\ncccc\nAATT\n")
+
+    starts, gc_percent, gc_skew = gc_skew_profile(str(path), window=4)
+
+    assert starts.tolist() == [0, 4, 8]
+    assert gc_percent.tolist() == [100.0, 100.0, 0.0]
+    assert gc_skew.tolist() == [1.0, -1.0, 0.0]
+
+
+def test_gc_profile_matches_string_input(tmp_path):
+    rng = np.random.default_rng(0)
+    seq = "".join(rng.choice(list("ACGT"), 5000))
+    path = tmp_path / "seq.fa"
+    path.write_text(">seq\n" + "\n".join(seq[i : i + 60] for i in range(0, len(seq), 60)) + "\n")
+
+    from_file = gc_skew_profile(str(path), window=500, step=250, chunk_size=777)
+    from_string = gc_skew_profile(seq, window=500, step=250)
+
+    for file_values, string_values in zip(from_file, from_string):
+        np.testing.assert_allclose(file_values, string_values)
+
+
+@pytest.mark.parametrize("chunk_size", [3, 1 << 22])
+def test_gc_profile_rejects_multi_record_fasta(tmp_path, chunk_size):
+    path = tmp_path / "two.fa"
+    path.write_text(">a\nGGGG\n>bGCGC\nAAAA\n")
+
+    with pytest.raises(ValueError, match="Multi-record FASTA"):
+        gc_skew_profile(str(path), window=4, chunk_size=chunk_size)
+    with pytest.raises(ValueError, match="Multi-record FASTA"):
+        gc_skew_profile(">a\nGGGG\n>b\nAAAA", window=4)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from Bio.Data.CodonTable import TranslationError
+from Bio.Seq import Seq
+from Bio.Seq import translate as bio_translate
+
+from functions import translate_rna
+from translation import six_frame_translation, translate, translate_batch
+
+IUPAC = "ACGTUMRWSYKVHDBXN"
+
+
+def expected_translation(seq: str, table: int = 1) -> str:
+    """Biopython's translation, codon by codon, with X where it refuses a codon (e.g. TAN)"""
+    protein = []
+    for i in range(0, len(seq) - len(seq) % 3, 3):
+        try:
+            protein.append(bio_translate(seq[i : i + 3], table=table))
+        except TranslationError:
+            protein.append("X")
+    return "".join(protein)
+
+
+@pytest.mark.parametrize("table", [1, 2, 11])
+def test_every_ambiguous_codon_matches_biopython(table):
+    codons = "".join(a + b + c for a in IUPAC for b in IUPAC for c in IUPAC)
+
+    assert translate(codons, table=table) == expected_translation(codons, table)
+
+
+def test_ambiguous_examples():
+    assert translate("GCN") == "A"
+    assert translate("RAT") == "B"
+    assert translate("TAR") == "*"
+    assert translate("NNN") == "X"
+    assert translate_rna("gcnuuy") == "AF"
+
+
+def test_six_frames_match_biopython_on_ambiguous_input():
+    rng = np.random.default_rng(1)
+    seq = "".join(rng.choice(list("ACGTMRWSYKVHDBN"), 301))
+    reverse = str(Seq(seq).reverse_complement())
+
+    frames = six_frame_translation(seq)
+
+    for offset in range(3):
+        assert frames[f"+{offset + 1}"] == expected_translation(seq[offset:])
+        assert frames[f"-{offset + 1}"] == expected_translation(reverse[offset:])
+
+
+def test_batch_and_invalid_bases():
+    assert translate_batch(["ATGGCN", {"sequence": "RATTA"}]) == ["MA", "B"]
+    # bases outside IUPAC are never guessed
+    assert translate("GC1ATG") == "XM"
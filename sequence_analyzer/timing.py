@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+"""
+Stage timers, counters and profiling for the analyzer, from bioc.instrument.
+
+bioc is the installable package of the bioinformatics_code_challenges
+project and is optional here:
+
+    pip install -e ../bioinformatics_code_challenges
+
+Without it, stage() and count() do nothing, and asking for timings prints
+a warning rather than silently reporting nothing. With it, switch them on
+through the environment:
+
+    BIOC_INSTRUMENT=1 python seq_analyze.py ATGC... --orf      summary on stderr at exit
+    BIOC_TRACE=run.trace.json python seq_analyze.py ...        also a Chrome trace
+    BIOC_PROFILE=run.pstats python seq_analyze.py ...          cProfile data (pstats) at exit
+"""
+
+import os
+import sys
+from contextlib import nullcontext
+
+try:
+    from bioc import instrument
+except ImportError:
+    instrument = None
+    if any(os.environ.get(name, "0") not in ("", "0") for name in ("BIOC_INSTRUMENT", "BIOC_TRACE", "BIOC_PROFILE")):
+        print(
+            "Warning: timings and profiles need the bioc package "
+            "(pip install -e ../bioinformatics_code_challenges); nothing will be recorded",
+            file=sys.stderr,
+        )
+
+
+def stage(name: str):
+    """Time a block as a named stage (a no-op without bioc or while disabled)"""
+    return instrument.stage(name) if instrument else nullcontext()
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add n to a named counter (a no-op without bioc or while disabled)"""
+    if instrument:
+        instrument.count(name, n)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+from functools import lru_cache
+
+import numpy as np
+from Bio.Data import CodonTable, IUPACData
+from Bio.Data.CodonTable import TranslationError
+from Bio.Seq import translate as bio_translate
+
+from timing import count, stage
+
+# nucleotide codes: A=0, C=1, G=2, T/U=3, then the IUPAC ambiguity codes in
+# _BASES order; anything else is _INVALID_BASE
+_BASES = "ACGTMRWSYKVHDBXN"
+_INVALID_BASE = len(_BASES)
+_N_CODES = len(_BASES) + 1
+_NUCLEOTIDE_CODES = np.full(256, _INVALID_BASE, dtype=np.uint8)
+for _code, _base in enumerate(_BASES):
+    _NUCLEOTIDE_CODES[ord(_base)] = _NUCLEOTIDE_CODES[ord(_base.lower())] = _code
+_NUCLEOTIDE_CODES[ord("U")] = _NUCLEOTIDE_CODES[ord("u")] = _BASES.index("T")
+
+# complement of each code, for the reverse strand (R <-> Y, B <-> V, N -> N, ...)
+_COMPLEMENT_CODES = np.full(_N_CODES, _INVALID_BASE, dtype=np.uint8)
+for _code, _base in enumerate(_BASES):
+    _COMPLEMENT_CODES[_code] = _BASES.index(IUPACData.ambiguous_dna_complement[_base])
+
+
+@lru_cache(maxsize=None)
+def codon_lookup(table: int = 1) -> np.ndarray:
+    """
+    Build the amino acid lookup for an NCBI genetic code table
+
+    Entries are indexed by (first * _N_CODES + second) * _N_CODES + third
+    base code. Codons with IUPAC ambiguity codes are resolved as Biopython
+    does: the amino acid every expansion agrees on (or B, Z, J for the
+    ambiguous pairs N/D, Q/E, I/L), "*" if every expansion is a stop, and
+    "X" otherwise. Codons with an invalid base also give "X".
+
+    Args:
+        table (int): NCBI genetic code table ID
+
+    Returns:
+        np.ndarray: uint8 array of amino acid letters
+
+    Raises:
+        ValueError: If the table ID is not an NCBI genetic code
+    """
+    if table not in CodonTable.unambiguous_dna_by_id:
+        raise ValueError(f"Unknown NCBI genetic code table: {table}")
+
+    lookup = np.full(_N_CODES**3, ord("X"), dtype=np.uint8)
+    for i, first in enumerate(_BASES):
+        for j, second in enumerate(_BASES):
+            for k, third in enumerate(_BASES):
+                try:
+                    amino_acid = bio_translate(first + second + third, table=table)
+                except TranslationError:
+                    # e.g. TAN: a stop or an amino acid depending on N
+                    continue
+                lookup[(i * _N_CODES + j) * _N_CODES + k] = ord(amino_acid)
+    return lookup
+
+
+def _encode(seq: str) -> np.ndarray:
+    """
+    Convert a nucleotide string to its codes (see _NUCLEOTIDE_CODES)
+    """
+    with stage("encode"):
+        codes = _NUCLEOTIDE_CODES[np.frombuffer(seq.encode("ascii"), dtype=np.uint8)]
+    count("bases", len(codes))
+    return codes
+
+
+def _codon_indices(codes: np.ndarray) -> np.ndarray:
+    """
+    Turn a code array (length a multiple of 3) into codon lookup indices
+    """
+    codons = codes.reshape(-1, 3).astype(np.intp)
+    return (codons[:, 0] * _N_CODES + codons[:, 1]) * _N_CODES + codons[:, 2]
+
+
+def _translate_codes(codes: np.ndarray, table: int) -> str:
+    """
+    Translate nucleotide codes in frame 0, ignoring a trailing partial codon
+    """
+    codes = codes[: len(codes) - len(codes) % 3]
+    with stage("translate"):
+        return codon_lookup(table)[_codon_indices(codes)].tobytes().decode("ascii")
+
+
+def translate(seq: str, table: int = 1) -> str:
+    """
+    Translate a DNA or RNA sequence to protein in the first reading frame
+
+    Args:
+        seq (str): DNA or RNA sequence
+        table (int): NCBI genetic code table ID
+
+    Returns:
+        str: Protein sequence, stop codons as "*" (a trailing partial codon is dropped)
+    """
+    return _translate_codes(_encode(seq.strip()), table)
+
+
+def six_frame_translation(seq: str, table: int = 1) -> dict:
+    """
+    Translate all six reading frames of a sequence
+
+    The sequence is encoded once; the reverse strand is derived from the same
+    codes through _COMPLEMENT_CODES.
+
+    Args:
+        seq (str): DNA or RNA sequence
+        table (int): NCBI genetic code table ID
+
+    Returns:
+        dict: Protein sequences keyed by frame ("+1", "+2", "+3", "-1", "-2", "-3")
+    """
+    forward = _encode(seq.strip())
+    reverse = _COMPLEMENT_CODES[forward][::-1]
+
+    frames = {}
+    for offset in range(3):
+        frames[f"+{offset + 1}"] = _translate_codes(forward[offset:], table)
+    for offset in range(3):
+        frames[f"-{offset + 1}"] = _translate_codes(reverse[offset:], table)
+    return frames
+
+
+def translate_batch(seqs: list, table: int = 1) -> list:
+    """
+    Translate many sequences (e.g. ORFs) in a single vectorized pass
+
+    All sequences are trimmed to whole codons, joined, encoded and looked up
+    together, then the protein string is cut back into one entry per input.
+
+    Args:
+        seqs (list): DNA/RNA strings, or ORF dictionaries with a "sequence" key
+        table (int): NCBI genetic code table ID
+
+    Returns:
+        list: Protein sequence for each input, in order
+    """
+    trimmed = []
+    for seq in seqs:
+        if isinstance(seq, dict):
+            seq = seq["sequence"]
+        seq = seq.strip()
+        trimmed.append(seq[: len(seq) - len(seq) % 3])
+
+    proteins = _translate_codes(_encode("".join(trimmed)), table)
+
+    # split the joined protein back at each input's codon count
+    results = []
+    start = 0
+    for seq in trimmed:
+        end = start + len(seq) // 3
+        results.append(proteins[start:end])
+        start = end
+    return results